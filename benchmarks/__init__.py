@@ -0,0 +1,7 @@
+'''
+Benchmarks del compilador goxLang.
+
+Se ejecutan desde la raíz del repositorio como módulos, por ejemplo:
+
+    python -m benchmarks.bench_lexer
+'''
@@ -0,0 +1,87 @@
+'''
+Benchmark de la verificación en paralelo del TypeChecker.
+
+Mide el tiempo de TypeChecker.check con distintos números de hilos sobre un
+corpus con muchas funciones y reporta la ganancia respecto a jobs=1. Fuerza
+el pool de hilos aunque el intérprete tenga GIL, para medir lo que costaría
+activarlo: en ese caso la ganancia es a lo sumo 1x. Antes de que los
+comandos usen `TypeChecker(jobs=N)`, este benchmark debe mostrar una ganancia
+real en el intérprete en el que se van a ejecutar.
+
+Uso:
+    python -m benchmarks.bench_checker [--shape functions] [--size 2000000]
+    python -m benchmarks.bench_checker --jobs 1 --jobs 4
+'''
+import argparse
+import sys
+import time
+
+import check
+from check import TypeChecker
+from lexer import Lexer
+from parser import Parser
+from benchmarks.corpus import SHAPES, generate
+from benchmarks.common import gc_paused
+
+
+def parse(source):
+    lexer = Lexer(engine='dispatch')
+    tokens, _ = lexer.tokenize(source)
+    return Parser(tokens, string_table=lexer.string_table).parse()
+
+
+def bench_jobs(source, jobs, repeat=3):
+    """
+    Mide la verificación de `source` con `jobs` hilos. Cada repetición
+    verifica un AST recién construido (el checker lo anota).
+
+    Returns:
+        dict: Mejor tiempo, hilos usados y diagnósticos de la última repetición
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        program = parse(source)
+        checker = TypeChecker(jobs=jobs)
+        with gc_paused():
+            start = time.perf_counter()
+            checker.check(program)
+            best = min(best, time.perf_counter() - start)
+    return {
+        'seconds': best,
+        'workers': checker._parallel_workers(program),
+        'diagnostics': checker.error_manager.diagnostics(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del checker en paralelo de goxLang")
+    parser.add_argument('--shape', choices=SHAPES, default='functions', help="Forma del corpus")
+    parser.add_argument('--size', type=int, default=2_000_000, help="Tamaño del corpus en caracteres")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por caso (se toma la mejor)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, action='append',
+                        help="Hilos del checker (puede repetirse; por defecto 1, 2 y 4)")
+    args = parser.parse_args(argv)
+
+    source = generate(args.shape, args.size, args.seed)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Corpus {args.shape}: {len(source) / 1e6:.2f} MB, intérprete "
+          f"{'con' if gil else 'sin'} GIL")
+    free_threaded, check.FREE_THREADED = check.FREE_THREADED, True
+    try:
+        reference = None
+        for jobs in sorted(set([1] + (args.jobs or [2, 4]))):
+            result = bench_jobs(source, jobs, args.repeat)
+            if reference is None:
+                reference = result
+            elif result['diagnostics'] != reference['diagnostics']:
+                raise RuntimeError(f"jobs={jobs} produjo diagnósticos distintos a jobs=1")
+            print(f"jobs={jobs:<3} hilos {result['workers']:<3} {result['seconds']:8.3f} s "
+                  f"x{reference['seconds'] / result['seconds']:.2f}")
+    finally:
+        check.FREE_THREADED = free_threaded
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
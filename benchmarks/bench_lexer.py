@@ -0,0 +1,111 @@
+'''
+Benchmark de rendimiento del lexer (Lexer.tokenize).
+
+Mide tokens/s, MB/s y pico de memoria sobre corpus sintéticos y compara
+contra la línea base guardada en benchmarks/baselines/lexer.json.
+
+Uso:
+    python -m benchmarks.bench_lexer [--shape mixed] [--size 1000000]
+    python -m benchmarks.bench_lexer --engine regex --engine dispatch
+    python -m benchmarks.bench_lexer --save-baseline
+'''
+import argparse
+import os
+import sys
+
+from lexer import Lexer, ENGINES
+from benchmarks.corpus import SHAPES, generate
+from benchmarks.common import (BASELINE_DIR, best_time, peak_memory,
+                               load_baseline, save_baseline, compare)
+
+BASELINE_PATH = os.path.join(BASELINE_DIR, 'lexer.json')
+
+# Métrica -> True si un valor mayor es mejor
+METRICS = {
+    'tokens_per_sec': True,
+    'mb_per_sec': True,
+    'peak_kb': False,
+}
+
+
+def bench_shape(shape, size, repeat=5, seed=0, jobs=1, engine='regex'):
+    """
+    Mide el lexer sobre un corpus de la forma indicada.
+
+    Returns:
+        dict: Resultados del caso (bytes, tokens, segundos y métricas)
+    """
+    source = generate(shape, size, seed)
+    nbytes = len(source.encode('utf-8'))
+
+    def run():
+        return Lexer(jobs=jobs, engine=engine).tokenize(source)
+
+    seconds, (tokens, errors) = best_time(run, repeat)
+    if errors:
+        raise RuntimeError(f"El corpus '{shape}' produjo errores léxicos: {errors[:3]}")
+    peak, _ = peak_memory(run)
+    return {
+        'bytes': nbytes,
+        'tokens': len(tokens),
+        'seconds': seconds,
+        'tokens_per_sec': len(tokens) / seconds,
+        'mb_per_sec': nbytes / seconds / 1e6,
+        'peak_kb': peak / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del lexer de goxLang")
+    parser.add_argument('--shape', action='append', choices=SHAPES,
+                        help="Forma del corpus (puede repetirse; por defecto todas)")
+    parser.add_argument('--size', type=int, default=500_000, help="Tamaño del corpus en caracteres")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por caso (se toma la mejor)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', action='append', choices=ENGINES,
+                        help="Motor del lexer (puede repetirse para compararlos; por defecto regex)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Procesos del lexer paralelo (solo aplica a corpus de varios MB)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Archivo de línea base")
+    parser.add_argument('--save-baseline', action='store_true', help="Guardar resultados como línea base")
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help="Fallar si alguna métrica empeora más que esta fracción (p. ej. 0.1)")
+    args = parser.parse_args(argv)
+
+    engines = args.engine or ['regex']
+    results = {}
+    for shape in args.shape or SHAPES:
+        reference = None
+        for engine in engines:
+            result = bench_shape(shape, args.size, args.repeat, args.seed, args.jobs, engine)
+            # La línea base corresponde al motor regex; los demás se guardan aparte
+            case = shape if engine == 'regex' else f"{shape}/{engine}"
+            results[case] = result
+            speedup = ''
+            if reference is None:
+                reference = result
+            else:
+                speedup = f" x{result['tokens_per_sec'] / reference['tokens_per_sec']:.2f}"
+            print(f"{case:<20} {result['bytes'] / 1e6:7.2f} MB {result['tokens']:>9} tokens "
+                  f"{result['tokens_per_sec']:>12,.0f} tok/s {result['mb_per_sec']:7.2f} MB/s "
+                  f"pico {result['peak_kb']:>10,.0f} KB{speedup}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo hay línea base en {args.baseline} (use --save-baseline)")
+        return 0
+
+    print("\nComparación con la línea base:")
+    lines, regressions = compare(results, baseline, METRICS, args.max_regression)
+    for line in lines:
+        print(line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+'''
+Benchmark de extremo a extremo del pipeline de check.py:
+Lexer -> Parser -> TypeChecker.
+
+Para cada programa de un corpus fijo (fact.gox más corpus sintéticos con
+semilla fija) reporta, por fase, el tiempo de pared, el pico de memoria y
+los bloques asignados (tracemalloc) y el rendimiento en tokens/s o nodos/s.
+Escribe los resultados en JSON y falla si alguna fase empeora más que el
+umbral respecto a benchmarks/baselines/pipeline.json.
+
+Uso:
+    python -m benchmarks.bench_pipeline [--output resultados.json]
+    python -m benchmarks.bench_pipeline --save-baseline
+'''
+import argparse
+import json
+import os
+import sys
+import time
+
+from lexer import Lexer
+from parser import Parser
+from check import TypeChecker
+from goxLang_AST_nodes import walk
+from benchmarks.corpus import generate
+from benchmarks.common import (BASELINE_DIR, gc_paused, peak_memory,
+                               load_baseline, save_baseline, compare)
+
+BASELINE_PATH = os.path.join(BASELINE_DIR, 'pipeline.json')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ('lex', 'parse', 'check')
+
+# Corpus fijo: (nombre, forma, tamaño, semilla)
+CORPUS = [
+    ('identifiers', 'identifiers', 200_000, 1),
+    ('expressions', 'expressions', 200_000, 2),
+    ('functions', 'functions', 200_000, 3),
+    ('mixed', 'mixed', 400_000, 4),
+]
+
+# Métrica -> True si un valor mayor es mejor
+METRICS = {f'{phase}_seconds': False for phase in PHASES}
+METRICS.update({f'{phase}_peak_kb': False for phase in PHASES})
+
+# Por debajo de estos valores de la línea base la medición es puro ruido
+FLOORS = {f'{phase}_seconds': 0.001 for phase in PHASES}
+FLOORS.update({f'{phase}_peak_kb': 64 for phase in PHASES})
+
+
+def load_corpus():
+    """Devuelve la lista de (nombre, código fuente) del corpus fijo"""
+    programs = []
+    with open(os.path.join(ROOT, 'fact.gox')) as f:
+        programs.append(('fact', f.read()))
+    for name, shape, size, seed in CORPUS:
+        programs.append((name, generate(shape, size, seed)))
+    return programs
+
+
+def _lex(source):
+    tokens, errors = Lexer().tokenize(source)
+    if errors:
+        raise RuntimeError(f"Errores léxicos: {errors[:3]}")
+    return tokens
+
+
+def _parse(tokens):
+    parser = Parser(tokens)
+    ast = parser.parse()
+    if ast is None or parser.error_manager.has_errors():
+        raise RuntimeError(f"Errores de sintaxis: {parser.error_manager.get_errors()[:3]}")
+    return ast
+
+
+def _check(ast):
+    checker = TypeChecker()
+    if not checker.check(ast):
+        raise RuntimeError(f"Errores semánticos: {checker.error_manager.get_errors()[:3]}")
+    return checker
+
+
+def bench_program(source, repeat=3):
+    """
+    Mide cada fase del pipeline sobre un programa.
+
+    Cada repetición de la fase de chequeo usa un AST recién construido,
+    porque el TypeChecker modifica el árbol (inserta conversiones).
+
+    Returns:
+        dict: Métricas por fase
+    """
+    timings = {phase: float('inf') for phase in PHASES}
+    for _ in range(repeat):
+        with gc_paused():
+            start = time.perf_counter()
+            tokens = _lex(source)
+            timings['lex'] = min(timings['lex'], time.perf_counter() - start)
+
+            start = time.perf_counter()
+            ast = _parse(tokens)
+            timings['parse'] = min(timings['parse'], time.perf_counter() - start)
+
+            start = time.perf_counter()
+            _check(ast)
+            timings['check'] = min(timings['check'], time.perf_counter() - start)
+
+    nodes = sum(1 for _ in walk(ast))
+    result = {'bytes': len(source.encode('utf-8')), 'tokens': len(tokens), 'nodes': nodes}
+    for phase, func in (('lex', lambda: _lex(source)),
+                        ('parse', lambda: _parse(tokens)),
+                        ('check', lambda: _check(_parse(tokens)))):
+        peak, allocations = peak_memory(func)
+        result[f'{phase}_seconds'] = timings[phase]
+        result[f'{phase}_peak_kb'] = peak / 1024
+        result[f'{phase}_allocations'] = allocations
+    # La medición de 'check' incluye construir el AST; se descuenta el parse
+    result['check_allocations'] = max(0, result['check_allocations'] - result['parse_allocations'])
+    result['tokens_per_sec'] = len(tokens) / timings['lex']
+    result['parse_nodes_per_sec'] = nodes / timings['parse']
+    result['check_nodes_per_sec'] = nodes / timings['check']
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline completo de goxLang")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por programa (se toma la mejor)")
+    parser.add_argument('--output', help="Archivo JSON donde escribir los resultados")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Archivo de línea base")
+    parser.add_argument('--save-baseline', action='store_true', help="Guardar resultados como línea base")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Fracción de empeoramiento tolerada por fase (por defecto 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, source in load_corpus():
+        result = bench_program(source, args.repeat)
+        results[name] = result
+        phases = '  '.join(f"{phase} {result[f'{phase}_seconds'] * 1000:8.1f} ms" for phase in PHASES)
+        print(f"{name:<12} {result['tokens']:>8} tokens {result['nodes']:>8} nodos  {phases}  "
+              f"{result['check_nodes_per_sec']:>10,.0f} nodos/s (check)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+        print(f"\nResultados escritos en {args.output}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo hay línea base en {args.baseline} (use --save-baseline)")
+        return 0
+
+    print("\nComparación con la línea base:")
+    lines, regressions = compare(results, baseline, METRICS, args.max_regression, FLOORS)
+    for line in lines:
+        print(line)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regresión(es) superan el umbral de {args.max_regression:.0%}")
+        return 1
+    print(f"\n✓ Sin regresiones por encima del {args.max_regression:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
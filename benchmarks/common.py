@@ -0,0 +1,104 @@
+'''
+Utilidades compartidas por los benchmarks: medición y comparación contra
+una línea base guardada en JSON.
+'''
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+
+def best_time(func, repeat):
+    """
+    Ejecuta `func` `repeat` veces y devuelve (mejor tiempo, último resultado).
+    El mejor tiempo es el menos afectado por ruido del sistema.
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        with gc_paused():
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class gc_paused:
+    """Contexto que desactiva el recolector de basura para reducir el ruido"""
+    def __enter__(self):
+        gc.collect()
+        self.enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            gc.enable()
+
+
+def peak_memory(func):
+    """Devuelve (pico de memoria en bytes, número de bloques asignados) de una ejecución"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        allocations = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    return peak, allocations
+
+
+def load_baseline(path):
+    """Carga una línea base o devuelve None si no existe"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    """Guarda los resultados como nueva línea base"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline, metrics, max_regression=None, floors=None):
+    """
+    Compara resultados contra la línea base.
+
+    Args:
+        results (dict): {caso: {métrica: valor}}
+        baseline (dict): Misma estructura que `results`
+        metrics (dict): {métrica: True si mayor es mejor, False si menor es mejor}
+        max_regression (float, optional): Fracción de empeoramiento tolerada
+        floors (dict, optional): {métrica: valor mínimo de la línea base para
+            aplicar el umbral}. Evita falsos positivos en casos diminutos
+            dominados por ruido.
+
+    Returns:
+        (lineas, regresiones): texto del reporte y lista de regresiones que
+        superan `max_regression`
+    """
+    lines = []
+    regressions = []
+    for case, values in results.items():
+        base = (baseline or {}).get(case)
+        if not base:
+            lines.append(f"  {case}: sin línea base")
+            continue
+        for metric, higher_is_better in metrics.items():
+            if metric not in values or not base.get(metric):
+                continue
+            change = values[metric] / base[metric] - 1
+            worse = -change if higher_is_better else change
+            flag = ''
+            gated = base[metric] >= (floors or {}).get(metric, 0)
+            if max_regression is not None and gated and worse > max_regression:
+                flag = '  <-- REGRESIÓN'
+                regressions.append((case, metric, change))
+            lines.append(f"  {case:<24} {metric:<18} {base[metric]:>14.4g} -> {values[metric]:>14.4g} ({change:+.1%}){flag}")
+    return lines, regressions
@@ -0,0 +1,114 @@
+'''
+Generador de corpus sintéticos de goxLang para benchmarks.
+
+Cada "forma" (shape) estresa una parte distinta del compilador:
+- identifiers: muchas declaraciones y referencias a identificadores
+- comments: comentarios de línea y de bloque entre sentencias cortas
+- expressions: expresiones profundamente anidadas
+- functions: muchas funciones pequeñas y llamadas entre ellas
+- mixed: todas las anteriores intercaladas
+
+Los programas generados son válidos (declaran todo lo que usan), de modo
+que sirven tanto para el lexer como para el pipeline completo.
+'''
+import random
+
+SHAPES = ('identifiers', 'comments', 'expressions', 'functions', 'mixed')
+
+
+class _Generator:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.vars = []
+        self.funcs = []
+        self.count = 0
+
+    def _new_name(self, prefix):
+        self.count += 1
+        return f"{prefix}_{self.count}"
+
+    def _operand(self):
+        if self.vars and self.rng.random() < 0.7:
+            return self.rng.choice(self.vars)
+        return str(self.rng.randint(0, 1000))
+
+    def _declare(self, expr):
+        name = self._new_name('value')
+        self.vars.append(name)
+        return f"var {name} int = {expr};\n"
+
+    def identifiers(self):
+        operands = [self._operand() for _ in range(4)]
+        stmt = self._declare(f"{operands[0]} + {operands[1]} * {operands[2]} - {operands[3]}")
+        if len(self.vars) > 1:
+            stmt += f"{self.vars[-2]} = {self.vars[-1]};\n"
+        return stmt
+
+    def comments(self):
+        text = ' '.join(self.rng.choice(('lorem', 'ipsum', 'dolor', 'sit', 'amet'))
+                        for _ in range(self.rng.randint(4, 12)))
+        return (f"// {text}\n"
+                f"/* {text}\n   {text} */\n"
+                + self._declare(self._operand()))
+
+    def _expression(self, depth):
+        if depth == 0:
+            return self._operand()
+        op = self.rng.choice(('+', '-', '*'))
+        return f"({self._expression(depth - 1)} {op} {self._expression(depth - 1)})"
+
+    def expressions(self):
+        return self._declare(self._expression(self.rng.randint(3, 6)))
+
+    def functions(self):
+        name = self._new_name('func')
+        body = (f"func {name}(a int, b int) int {{\n"
+                f"    var t int = a * b + {self.rng.randint(0, 100)};\n"
+                f"    while t > 100 {{\n"
+                f"        t = t - 100;\n"
+                f"    }}\n"
+                f"    return t;\n"
+                f"}}\n")
+        if self.funcs:
+            body += f"{self.rng.choice(self.funcs)}({self._operand()}, 2);\n"
+        self.funcs.append(name)
+        return body
+
+    def mixed(self):
+        shape = self.rng.choice(SHAPES[:-1])
+        chunk = getattr(self, shape)()
+        if self.rng.random() < 0.2:
+            chunk += f"print '{self.rng.choice('abcxyz')}';\n"
+            chunk += f'print "{self.rng.choice(("hola", "mundo"))}";\n'
+            chunk += f"var {self._new_name('ratio')} float = {self.rng.random():.4f};\n"
+        return chunk
+
+
+def generate(shape='mixed', size=100_000, seed=0):
+    """
+    Genera un programa goxLang sintético.
+
+    Args:
+        shape (str): Forma del corpus (ver SHAPES)
+        size (int): Tamaño aproximado en caracteres
+        seed (int): Semilla para que el corpus sea reproducible
+
+    Returns:
+        str: Código fuente generado
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Forma de corpus desconocida: {shape}")
+    gen = _Generator(seed)
+    make_chunk = getattr(gen, shape)
+    chunks = []
+    total = 0
+    while total < size:
+        chunk = make_chunk()
+        chunks.append(chunk)
+        total += len(chunk)
+    return ''.join(chunks)
+
+
+if __name__ == "__main__":
+    import sys
+    print(generate(sys.argv[1] if len(sys.argv) > 1 else 'mixed', 2_000))
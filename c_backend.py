@@ -0,0 +1,402 @@
+'''
+Backend C de goxLang.
+
+Traduce un Program verificado por el TypeChecker (con `dtype` en cada
+expresión) a código C99 que compila el toolchain del sistema:
+
+    program = compile_source(texto).ast
+    c_source = generate_c(program)
+    build_executable(c_source, "programa")
+
+Los tipos se mapean a tipos nativos de C de acuerdo con el tamaño y el
+signo de typesys.BASIC_TYPES (int -> int32_t, float -> double,
+char -> uint8_t, bool -> bool).
+
+- Las sentencias de nivel superior forman el cuerpo de main() en orden;
+  los globales se declaran fuera y se inicializan allí. Si el programa
+  define `func main()` sin parámetros, main() la llama al final y devuelve
+  su resultado.
+- Las funciones importadas (`import func`) se declaran `extern` con su
+  nombre original, así se enlazan con funciones del entorno (p. ej. de la
+  biblioteca de C); los demás nombres llevan el prefijo `gox_`.
+- Las sumas, restas y productos de int se hacen en aritmética sin signo
+  para que el desbordamiento dé la vuelta en lugar de ser comportamiento
+  indefinido.
+'''
+import argparse
+import math
+import os
+import subprocess
+import sys
+
+from goxLang_AST_nodes import *
+from typesys import BASIC_TYPES, INT, FLOAT, CHAR, BOOL, STRING, VOID
+
+PREFIX = 'gox_'
+
+# Operadores del AST (nombres de token) a operadores de C
+C_OPERATORS = {
+    'PLUS': '+', 'MINUS': '-', 'TIMES': '*', 'DIVIDE': '/', 'MOD': '%',
+    'LT': '<', 'GT': '>', 'LE': '<=', 'GE': '>=', 'EQ': '==', 'NE': '!=',
+    'AND': '&&', 'OR': '||',
+}
+
+# Operaciones de int que se calculan sin signo (desbordamiento definido)
+WRAPPING_OPERATORS = ('PLUS', 'MINUS', 'TIMES')
+
+# Nodos de expresión que pueden aparecer como sentencia
+EXPRESSIONS = (IntLiteral, FloatLiteral, BoolLiteral, CharLiteral, StringLiteral,
+               Identifier, TypeCast, BinaryOp, FuncCall, MemoryAccess)
+
+
+class CBackendError(Exception):
+    """Se lanza si el programa usa algo que el backend no sabe traducir"""
+
+
+def c_type(gox_type):
+    """
+    Tipo de C para un tipo de goxLang, según su tamaño y signo en
+    BASIC_TYPES.
+    """
+    name = str(gox_type)
+    if name == 'void':
+        return 'void'
+    if name == 'string':
+        return 'const char *'
+    if name == 'bool':
+        return 'bool'
+    info = BASIC_TYPES.get(name)
+    if info is None:
+        raise CBackendError(f"Type '{name}' is not supported by the C backend")
+    bits = info['size'] * 8
+    if name == 'float':
+        return {32: 'float', 64: 'double'}[bits]
+    return f"{'int' if info['signed'] else 'uint'}{bits}_t"
+
+
+def c_string(value):
+    """Literal de cadena de C con los escapes necesarios"""
+    out = []
+    for char in value:
+        code = ord(char)
+        if char in '"\\':
+            out.append('\\' + char)
+        elif char == '\n':
+            out.append('\\n')
+        elif char == '\t':
+            out.append('\\t')
+        elif 32 <= code < 127:
+            out.append(char)
+        else:
+            # Bytes UTF-8 en octal (un escape hexadecimal se "comería" los
+            # dígitos siguientes)
+            out.extend(f'\\{byte:03o}' for byte in char.encode('utf-8'))
+    return '"' + ''.join(out) + '"'
+
+
+class CGenerator:
+    '''
+    Visitante que genera C. Las expresiones devuelven su texto en C y las
+    sentencias agregan líneas a `self.lines`; en las sentencias `env` es el
+    nivel de sangría.
+    '''
+    def __init__(self):
+        self.lines = []
+        self.imported = set()   # Funciones externas (sin prefijo)
+        self.function_return = None
+
+    def generate(self, program):
+        """
+        Genera el archivo C de un Program verificado.
+
+        Returns:
+            str: Código fuente C
+
+        Raises:
+            CBackendError: Si el programa tiene errores o construcciones no
+                soportadas
+        """
+        functions = []
+        top_level = []
+        globals_ = []
+        main = None
+        for stmt in program.statements:
+            if isinstance(stmt, ImportFunctionDecl):
+                self.imported.add(stmt.name)
+            elif isinstance(stmt, FuncDecl):
+                functions.append(stmt)
+                if stmt.name == 'main' and not stmt.params:
+                    main = stmt
+            else:
+                if isinstance(stmt, (VarDecl, ConstDecl)):
+                    globals_.append(stmt)
+                top_level.append(stmt)
+
+        emit = self.lines.append
+        emit('#include <stdint.h>')
+        emit('#include <stdbool.h>')
+        emit('#include <stdio.h>')
+        emit('#include <math.h>')
+        emit('')
+        for stmt in program.statements:
+            if isinstance(stmt, ImportFunctionDecl):
+                emit(f"extern {self._prototype(stmt)};")
+        for func in functions:
+            emit(f"static {self._prototype(func)};")
+        for decl in globals_:
+            emit(f"static {c_type(self._decl_type(decl))} {self.name(decl.name)};")
+        emit('')
+        for func in functions:
+            func.accept(self, 0)
+            emit('')
+
+        emit('int main(void) {')
+        for stmt in top_level:
+            if isinstance(stmt, (VarDecl, ConstDecl)):
+                emit(f"    {self.name(stmt.name)} = {self._initializer(stmt)};")
+            else:
+                self.statement(stmt, 1)
+        if main is not None and main.return_type is not VOID:
+            emit(f"    return (int){self.name('main')}();")
+        elif main is not None:
+            emit(f"    {self.name('main')}();")
+            emit('    return 0;')
+        else:
+            emit('    return 0;')
+        emit('}')
+        return '\n'.join(self.lines) + '\n'
+
+    # --- Utilidades ---
+
+    def name(self, name):
+        return name if name in self.imported else PREFIX + name
+
+    def _prototype(self, func):
+        params = ', '.join(f"{c_type(type_)} {self.name(param)}" for param, type_ in func.params)
+        return f"{c_type(func.return_type)} {self.name(func.name)}({params or 'void'})"
+
+    def _decl_type(self, decl):
+        dtype = decl.var_type if isinstance(decl, VarDecl) else decl.dtype
+        if dtype is None:
+            raise CBackendError(f"Declaration of '{decl.name}' has no type (was the program checked?)")
+        return dtype
+
+    def _initializer(self, decl):
+        if decl.value is None:
+            return '0'
+        return self.expr(decl.value)
+
+    def expr(self, node):
+        return node.accept(self, None)
+
+    def statement(self, node, depth):
+        if isinstance(node, FuncCall):
+            self.emit(depth, self.expr(node) + ';')
+        elif isinstance(node, EXPRESSIONS):
+            self.emit(depth, f"(void){self.expr(node)};")
+        else:
+            node.accept(self, depth)
+
+    def emit(self, depth, text):
+        self.lines.append('    ' * depth + text)
+
+    # --- Declaraciones ---
+
+    def visit_Program(self, node, env):
+        raise CBackendError("Use generate() to translate a Program")
+
+    def visit_FuncDecl(self, node, env):
+        if env != 0:
+            raise CBackendError(f"Nested function '{node.name}' is not supported by the C backend")
+        self.function_return = node.return_type
+        self.emit(0, f"static {self._prototype(node)} {{")
+        body = node.body
+        shadowed = {param for param, _ in node.params} & {
+            stmt.name for stmt in body.statements if isinstance(stmt, (VarDecl, ConstDecl))}
+        if shadowed:
+            body.accept(self, 1)  # Bloque propio: puede redeclarar parámetros
+        else:
+            for stmt in body.statements:
+                self.statement(stmt, 1)
+        if node.return_type is not VOID:
+            self.emit(1, f"return ({c_type(node.return_type)})0;")
+        self.emit(0, '}')
+        self.function_return = None
+
+    def visit_ImportFunctionDecl(self, node, env):
+        raise CBackendError(f"Imported function '{node.name}' must be declared at top level")
+
+    def visit_VarDecl(self, node, env):
+        self.emit(env, f"{c_type(node.var_type)} {self.name(node.name)} = {self._initializer(node)};")
+
+    def visit_ConstDecl(self, node, env):
+        self.emit(env, f"const {c_type(self._decl_type(node))} {self.name(node.name)} = "
+                       f"{self._initializer(node)};")
+
+    # --- Sentencias ---
+
+    def visit_Block(self, node, env):
+        self.emit(env, '{')
+        for stmt in node.statements:
+            self.statement(stmt, env + 1)
+        self.emit(env, '}')
+
+    def visit_Assignment(self, node, env):
+        self.emit(env, f"{self.name(node.name)} = {self.expr(node.value)};")
+
+    def visit_Print(self, node, env):
+        value = self.expr(node.expression)
+        dtype = node.expression.dtype
+        if dtype is INT:
+            self.emit(env, f'printf("%d\\n", (int){value});')
+        elif dtype is FLOAT:
+            self.emit(env, f'printf("%g\\n", (double){value});')
+        elif dtype is CHAR:
+            self.emit(env, f'printf("%c\\n", (int){value});')
+        elif dtype is BOOL:
+            self.emit(env, f'puts({value} ? "true" : "false");')
+        elif dtype is STRING:
+            self.emit(env, f'printf("%s\\n", {value});')
+        else:
+            raise CBackendError(f"Cannot print a value of type {dtype}")
+
+    def visit_If(self, node, env):
+        self.emit(env, f"if ({self.expr(node.condition)})")
+        node.then_block.accept(self, env)
+        if node.else_block:
+            self.emit(env, 'else')
+            node.else_block.accept(self, env)
+
+    def visit_While(self, node, env):
+        self.emit(env, f"while ({self.expr(node.condition)})")
+        node.body.accept(self, env)
+
+    def visit_Return(self, node, env):
+        if self.function_return is None:
+            raise CBackendError("Return outside of a function")
+        if node.value is None:
+            self.emit(env, 'return;')
+        else:
+            self.emit(env, f"return {self.expr(node.value)};")
+
+    def visit_Break(self, node, env):
+        self.emit(env, 'break;')
+
+    def visit_Continue(self, node, env):
+        self.emit(env, 'continue;')
+
+    def visit_ErrorNode(self, node, env):
+        raise CBackendError(f"Cannot generate code for a program with errors ({node.message})")
+
+    # --- Expresiones ---
+
+    def visit_IntLiteral(self, node, env):
+        if -2**31 <= node.value < 2**31:
+            return str(node.value) if node.value >= 0 else f"({node.value})"
+        return f"(int32_t){node.value}LL"
+
+    def visit_FloatLiteral(self, node, env):
+        if math.isinf(node.value):
+            return 'INFINITY' if node.value > 0 else '(-INFINITY)'
+        text = repr(node.value)
+        return text if node.value >= 0 else f"({text})"
+
+    def visit_BoolLiteral(self, node, env):
+        return 'true' if node.value else 'false'
+
+    def visit_CharLiteral(self, node, env):
+        return f"((uint8_t){ord(node.value)})"
+
+    def visit_StringLiteral(self, node, env):
+        return c_string(node.value)
+
+    def visit_Identifier(self, node, env):
+        return self.name(node.name)
+
+    def visit_TypeCast(self, node, env):
+        return f"(({c_type(node.cast_type)}){self.expr(node.expression)})"
+
+    def visit_BinaryOp(self, node, env):
+        right = self.expr(node.right)
+        if node.operator == 'BANG':
+            return f"(!{right})"  # '!x' se representa como BinaryOp(false, BANG, x)
+        left = self.expr(node.left)
+        operator = C_OPERATORS.get(node.operator)
+        if operator is None:
+            raise CBackendError(f"Operator {node.operator} is not supported by the C backend")
+        if node.dtype is INT and node.operator in WRAPPING_OPERATORS:
+            return f"((int32_t)((uint32_t){left} {operator} (uint32_t){right}))"
+        return f"({left} {operator} {right})"
+
+    def visit_FuncCall(self, node, env):
+        return f"{self.name(node.name)}({', '.join(self.expr(arg) for arg in node.args)})"
+
+    def visit_MemoryAccess(self, node, env):
+        raise CBackendError("Memory access is not supported by the C backend")
+
+
+def generate_c(program):
+    """Genera el código C de un Program verificado"""
+    return CGenerator().generate(program)
+
+
+def build_executable(c_source, output, cc=None, flags=('-O2',)):
+    """
+    Compila `c_source` con el compilador de C del sistema.
+
+    Args:
+        c_source (str): Código generado por generate_c
+        output (str): Ruta del ejecutable
+        cc (str, optional): Compilador (por defecto $CC o 'cc')
+        flags: Opciones adicionales para el compilador
+
+    Raises:
+        CBackendError: Si el compilador falla
+    """
+    cc = cc or os.environ.get('CC', 'cc')
+    command = [cc, *flags, '-x', 'c', '-', '-o', output, '-lm']
+    try:
+        completed = subprocess.run(command, input=c_source, text=True,
+                                   capture_output=True)
+    except OSError as e:
+        raise CBackendError(f"Cannot run C compiler '{cc}': {e.strerror}") from e
+    if completed.returncode != 0:
+        raise CBackendError(f"C compiler failed:\n{completed.stderr}")
+
+
+def main(argv=None):
+    from compiler import compile_source
+    from gox_error_manager import format_diagnostic
+
+    arg_parser = argparse.ArgumentParser(
+        prog="c_backend.py", description="Genera código C (y opcionalmente un ejecutable) desde goxLang")
+    arg_parser.add_argument('filename', help="Archivo fuente .gox")
+    arg_parser.add_argument('-o', '--output', metavar='ARCHIVO',
+                            help="Archivo .c de salida (por defecto junto al fuente)")
+    arg_parser.add_argument('--build', metavar='EJECUTABLE',
+                            help="Compilar además el ejecutable con el compilador de C del sistema")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.filename, 'r', encoding='utf-8') as f:
+        result = compile_source(f.read())
+    if not result.valid:
+        for diag in result.diagnostics:
+            print(format_diagnostic(diag))
+        return 1
+    try:
+        c_source = generate_c(result.ast)
+        output = args.output or os.path.splitext(args.filename)[0] + '.c'
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(c_source)
+        print(f"Código C escrito en {output}")
+        if args.build:
+            build_executable(c_source, args.build)
+            print(f"Ejecutable escrito en {args.build}")
+    except CBackendError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,179 @@
 #!/usr/bin/env python3
+import os
 import sys
+import json
 from typing import *
-from symtab import Symtab
+from symtab import Symtab, FlatSymtab
 from typesys import *
 from gox_error_manager import *
 from goxLang_AST_nodes import *
 from parser import Parser
-from lexer import Lexer
+from lexer import Lexer, ENGINES
+from stats import Stats, NULL_STATS, instrument_visitor, instrument_symtab
+from profiler import SourceProfiler
+from interface import InterfaceError, build_interface, read_interface, source_hash, write_interface
+from contextlib import nullcontext
+
+# Tamaño mínimo (en caracteres) de la parte del programa que verifica cada
+# hilo en la verificación en paralelo; por debajo el reparto no compensa
+PARALLEL_MIN_CHUNK = 1 << 18
+
+# Los hilos solo verifican en paralelo de verdad si el intérprete no tiene GIL
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
 
 class TypeChecker:
-    def __init__(self):
-        self.error_manager = ErrorManager()
-        self.current_function_return_type: Optional[str] = None
+    def __init__(self, symtab_class=Symtab, stats=None, max_errors=None, jobs=1, interfaces=None):
+        """
+        Args:
+            symtab_class: Implementación de tabla de símbolos a usar
+                (Symtab o FlatSymtab)
+            stats (Stats, optional): Si está habilitado, se instrumentan los
+                visitantes y la tabla de símbolos
+            max_errors (int, optional): Abortar el análisis al llegar a este
+                número de errores
+            jobs (int): Número de hilos para verificar en paralelo los
+                cuerpos de las funciones de nivel superior (1 = secuencial).
+                Solo se usa en intérpretes sin GIL y en programas de al
+                menos 2 * PARALLEL_MIN_CHUNK caracteres; con GIL los hilos
+                no ganan nada (ver benchmarks/bench_checker.py). Se ignora
+                si la instrumentación está activa.
+            interfaces (dict, optional): Firmas exportadas por otros módulos
+                del proyecto, {nombre: firma con params, return_type y
+                module}. Cada `import func` se compara con la suya.
+        """
+        self.max_errors = max_errors
+        self.jobs = jobs
+        self.interfaces = dict(interfaces or {})
+        if stats is not None and stats.enabled:
+            self.jobs = 1
+            symtab_class = instrument_symtab(symtab_class, stats)
+            instrument_visitor(self, stats)
+        self.symtab_class = symtab_class
+        self.error_manager = ErrorManager(default_code=TYPE_ERROR, max_errors=max_errors)
+        self.current_function_return_type: Optional[GoxType] = None
         self.in_loop: bool = False
-        self.current_symtab: Optional[Symtab] = None
-        self.show_symbol_table = True  # Control para mostrar tabla de símbolos
+        self.current_symtab: Optional[Symtab] = None  # Ámbito global tras check()
+        self.lines = None  # LineIndex del archivo, para reportar columnas y spans
 
     def check(self, node) -> bool:
         """
-        Realiza el análisis de tipos en el programa completo.
+        Realiza el análisis de tipos en el programa completo. No imprime
+        nada: los errores quedan en error_manager y la tabla de símbolos
+        global en current_symtab.
         
         Returns:
             bool: True si no hay errores de tipos, False si se encontraron errores
         """
-        global_env = Symtab("global")
+        global_env = self.symtab_class("global")
         self.current_symtab = global_env
-        node.accept(self, global_env)
-        
-        # Mostrar tabla de símbolos si está habilitado
-        if self.show_symbol_table:
-            print("\n=== Tabla de Símbolos ===")
-            global_env.print(show_all_scopes=True)
-            
+        self.lines = getattr(node, 'lines', None)
+        try:
+            workers = self._parallel_workers(node)
+            if workers > 1:
+                self._check_program_parallel(node, global_env, workers)
+            else:
+                node.accept(self, global_env)
+        except TooManyErrors:
+            pass
         return not self.error_manager.has_errors()
 
+    def _parallel_workers(self, node):
+        """Hilos para verificar `node` (1 = secuencial), como en Lexer.tokenize"""
+        if self.jobs <= 1 or not FREE_THREADED or not isinstance(node, Program) or self.lines is None:
+            return 1
+        return min(self.jobs, len(self.lines.source) // PARALLEL_MIN_CHUNK)
+
+    def load_interface(self, path):
+        """
+        Carga las firmas exportadas de un archivo de interfaz (.goxi) para
+        verificar los `import func` sin analizar el fuente del módulo.
+
+        Raises:
+            InterfaceError: Si el archivo no es una interfaz válida
+        """
+        self.interfaces.update(read_interface(path).functions)
+
+    def report(self, message, node):
+        """
+        Registra un error en la posición de `node`. La línea y la columna
+        se calculan desde su offset; si el nodo tiene `end` (parser con
+        spans=True) se informan también la línea y la columna de fin.
+        """
+        offset = getattr(node, 'offset', None)
+        if offset is None or self.lines is None:
+            self.error_manager.add_error(message)
+            return
+        lineno, column = self.lines.position(offset)
+        end = getattr(node, 'end', None)
+        if end is None:
+            self.error_manager.add_error(message, lineno, column)
+            return
+        end_line, end_column = self.lines.position(end)
+        self.error_manager.add_error(message, lineno, column,
+                                     end_lineno=end_line, end_columna=end_column)
+
+    def line_of(self, node):
+        """Línea de `node`, calculada desde su offset si se conoce"""
+        offset = getattr(node, 'offset', None)
+        if offset is not None and self.lines is not None:
+            return self.lines.lineno(offset)
+        return None
+
+    def _check_program_parallel(self, node, env, workers):
+        """
+        Verificación en dos fases de un Program.
+
+        Fase 1 (secuencial): recorre las sentencias de nivel superior
+        registrando las firmas de las funciones sin entrar en sus cuerpos.
+        Fase 2 (paralela): verifica los cuerpos de las funciones en un pool
+        de `workers` hilos. Los hilos comparten el AST y los símbolos
+        globales, así que no se serializa nada (un pool de procesos pasaba
+        más tiempo serializando el AST que verificándolo). Cada cuerpo ve
+        exactamente los globales declarados antes de la función, igual que
+        en la verificación secuencial, y los diagnósticos se combinan en el
+        orden del código fuente.
+        """
+        phase_one = ErrorManager(default_code=TYPE_ERROR)
+        main_manager, self.error_manager = self.error_manager, phase_one
+        ranges = []     # Diagnósticos de la fase 1 por sentencia: (inicio, fin)
+        tasks = []      # (índice de sentencia, globales visibles, FuncDecl)
+        scope_slots = {}  # índice de sentencia -> posición en env.children
+        try:
+            for index, stmt in enumerate(node.statements):
+                start = len(phase_one._errors)
+                if isinstance(stmt, FuncDecl):
+                    visible = len(env.entries)
+                    try:
+                        env.add(stmt.name, stmt)
+                        scope_slots[index] = len(env.children)
+                        env.children.append(None)  # Se reemplaza con el ámbito de la fase 2
+                        tasks.append((index, visible, stmt))
+                    except Symtab.SymbolDefinedError as e:
+                        self.report(str(e), stmt)
+                else:
+                    stmt.accept(self, env)
+                ranges.append((start, len(phase_one._errors)))
+        finally:
+            self.error_manager = main_manager
+
+        global_refs = list(env.entries.items())
+        body_diagnostics = {}
+        for index, scope, diagnostics in _run_function_checks(
+                self.symtab_class, global_refs, tasks, workers, self.max_errors, self.lines):
+            func = node.statements[index]
+            func.scope = scope
+            scope.parent = env
+            env.children[scope_slots[index]] = scope
+            body_diagnostics[index] = diagnostics
+
+        # Combinar en orden de código fuente (respeta duplicados y máximo)
+        diagnostics = phase_one.diagnostics()
+        for index, (start, end) in enumerate(ranges):
+            for diag in diagnostics[start:end]:
+                self.error_manager.add_diagnostic(diag)
+            for diag in body_diagnostics.get(index, ()):
+                self.error_manager.add_diagnostic(diag)
+
     def visit_Program(self, node, env):
         for stmt in node.statements:
             stmt.accept(self, env)
@@ -44,19 +184,19 @@ class TypeChecker:
             env.add(node.name, node)
             if node.value:
                 node.value.accept(self, env)
-                if node.value.dtype is None:
-                    self.error_manager.add_error(
-                        f"Invalid initializer for variable '{node.name}'",
-                        getattr(node, 'lineno', None))
-                elif node.var_type == 'int' and node.value.dtype == 'float':
+                if node.value.dtype is UNKNOWN:
+                    pass  # El error ya se reportó en la expresión
+                elif node.value.dtype is None:
+                    self.report(
+                        f"Invalid initializer for variable '{node.name}'", node)
+                elif node.var_type is INT and node.value.dtype is FLOAT:
                     # Conversión explícita de float a int
-                    node.value = TypeCast('int', node.value)
+                    node.value = TypeCast(INT, node.value)
                 elif not can_assign(node.var_type, node.value.dtype):
-                    self.error_manager.add_error(
-                        f"Cannot initialize {node.var_type} variable with {node.value.dtype} value",
-                        getattr(node, 'lineno', None))
+                    self.report(
+                        f"Cannot initialize {node.var_type} variable with {node.value.dtype} value", node)
         except Symtab.SymbolDefinedError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
+            self.report(str(e), node)
         return None
 
     def visit_ConstDecl(self, node, env):
@@ -65,45 +205,50 @@ class TypeChecker:
             node.dtype = node.value.dtype
             env.add(node.name, node)
         except Symtab.SymbolDefinedError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
+            self.report(str(e), node)
         return None
 
     def visit_Assignment(self, node, env):
         # Verificar que la variable existe
         try:
             var_info = env.get(node.name)
+            node.symbol = var_info
             node.value.accept(self, env)
             
             # Verificar compatibilidad de tipos
-            if not can_assign(var_info.dtype, node.value.dtype):
-                self.error_manager.add_error(
-                    f"Cannot assign {node.value.dtype} to {var_info.dtype} variable '{node.name}'",
-                    getattr(node, 'lineno', None))
+            if node.value.dtype is not UNKNOWN and not can_assign(var_info.dtype, node.value.dtype):
+                self.report(
+                    f"Cannot assign {node.value.dtype} to {var_info.dtype} variable '{node.name}'", node)
             
             node.dtype = var_info.dtype
         except Symtab.SymbolNotFoundError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
+            self.report(str(e), node)
         return None
 
     def visit_BinaryOp(self, node, env):
         node.left.accept(self, env)
         node.right.accept(self, env)
         
-        # Conversión implícita de int a float si es necesario
-        if node.operator in ['TIMES', 'PLUS', 'MINUS', 'DIVIDE']:
-            if node.left.dtype == 'int' and node.right.dtype == 'float':
-                node.left = TypeCast('float', node.left)
-            elif node.left.dtype == 'float' and node.right.dtype == 'int':
-                node.right = TypeCast('float', node.right)
-        
-        result_type = check_binop(
-            node.operator,
-            getattr(node.left, 'dtype', None),
-            getattr(node.right, 'dtype', None),
-            self.error_manager,
-            getattr(node, 'lineno', None)
-        )
+        left_type = getattr(node.left, 'dtype', None)
+        right_type = getattr(node.right, 'dtype', None)
+        if left_type is UNKNOWN or right_type is UNKNOWN:
+            # Un operando ya tiene un error reportado: no generar cascada
+            node.dtype = UNKNOWN
+            return None
+        entry = lookup_binop(node.operator, left_type, right_type)
+        if entry is None:
+            # Camino lento solo para reportar el error adecuado
+            node.dtype = check_binop(
+                node.operator, left_type, right_type,
+                self.error_manager, self.line_of(node))
+            return None
         
+        # Insertar las conversiones implícitas (p. ej. int -> float)
+        result_type, left_cast, right_cast = entry
+        if left_cast:
+            node.left = TypeCast(left_cast, node.left)
+        if right_cast:
+            node.right = TypeCast(right_cast, node.right)
         node.dtype = result_type
         return None
 
@@ -120,139 +265,189 @@ class TypeChecker:
         return None
 
     def visit_IntLiteral(self, node, env):
-        node.dtype = 'int'
+        node.dtype = INT
         return None
 
     def visit_FloatLiteral(self, node, env):
-        node.dtype = 'float'
+        node.dtype = FLOAT
         return None
 
     def visit_BoolLiteral(self, node, env):
-        node.dtype = 'bool'
+        node.dtype = BOOL
         return None
 
     def visit_StringLiteral(self, node, env):
-        node.dtype = 'string'
+        node.dtype = STRING
         return None
 
     def visit_CharLiteral(self, node, env):
-        node.dtype = 'char'
+        node.dtype = CHAR
         return None
 
     def visit_Identifier(self, node, env):
         try:
             symbol = env.get(node.name)
+            node.symbol = symbol  # Declaración a la que se refiere (índice de posiciones)
             node.dtype = symbol.dtype
         except Symtab.SymbolNotFoundError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
-            node.dtype = 'unknown'
+            self.report(str(e), node)
+            node.dtype = UNKNOWN
         return None
 
     def visit_If(self, node, env):
         node.condition.accept(self, env)
-        if node.condition.dtype != 'bool':
-            self.error_manager.add_error(
-                "If condition must be boolean",
-                getattr(node, 'lineno', None))
+        if node.condition.dtype is not BOOL and node.condition.dtype is not UNKNOWN:
+            self.report(
+                "If condition must be boolean", node)
         
         # Verificar el bloque then
-        then_env = Symtab("if_then", parent=env)
-        node.then_block.accept(self, then_env)
+        then_env = self.symtab_class("if_then", parent=env)
+        try:
+            node.then_block.accept(self, then_env)
+        finally:
+            then_env.close()
         
         # Verificar el bloque else si existe
         if node.else_block:
-            else_env = Symtab("if_else", parent=env)
-            node.else_block.accept(self, else_env)
+            else_env = self.symtab_class("if_else", parent=env)
+            try:
+                node.else_block.accept(self, else_env)
+            finally:
+                else_env.close()
         
         return None
 
     def visit_While(self, node, env):
         node.condition.accept(self, env)
-        if node.condition.dtype != 'bool':
-            self.error_manager.add_error(
-                "While condition must be boolean",
-                getattr(node, 'lineno', None))
+        if node.condition.dtype is not BOOL and node.condition.dtype is not UNKNOWN:
+            self.report(
+                "While condition must be boolean", node)
         
         # Crear nuevo ámbito para el cuerpo del while
-        loop_env = Symtab("while_body", parent=env)
+        loop_env = self.symtab_class("while_body", parent=env)
         self.in_loop = True
-        node.body.accept(self, loop_env)
-        self.in_loop = False
+        try:
+            node.body.accept(self, loop_env)
+        finally:
+            self.in_loop = False
+            loop_env.close()
         
         return None
 
     def visit_Block(self, node, env):
-        block_env = Symtab("block", parent=env)
-        for stmt in node.statements:
-            stmt.accept(self, block_env)
+        block_env = self.symtab_class("block", parent=env)
+        node.scope = block_env
+        try:
+            for stmt in node.statements:
+                stmt.accept(self, block_env)
+        finally:
+            block_env.close()
         return None
 
     def visit_Print(self, node, env):
         node.expression.accept(self, env)
         return None
 
+    def visit_ImportFunctionDecl(self, node, env):
+        try:
+            env.add(node.name, node)
+        except Symtab.SymbolDefinedError as e:
+            self.report(str(e), node)
+            return None
+        exported = self.interfaces.get(node.name)
+        if exported is None:
+            return None  # Función externa (del entorno de ejecución)
+        if (exported.return_type != node.return_type
+                or [t for _, t in exported.params] != [t for _, t in node.params]):
+            params = ', '.join(f"{name} {type_}" for name, type_ in exported.params)
+            self.report(
+                f"Imported function '{node.name}' does not match its declaration in module "
+                f"'{exported.module}': func {node.name}({params}) {exported.return_type}", node)
+        return None
+
     def visit_FuncDecl(self, node, env):
         try:
             # Registrar la función en el ámbito actual
             env.add(node.name, node)
             
             # Crear nuevo ámbito para los parámetros y cuerpo
-            func_env = Symtab(node.name, parent=env)
-            
-            # Registrar parámetros
-            for param_name, param_type in node.params:
-                param_node = VarDecl(param_name, param_type)
-                func_env.add(param_name, param_node)
-            
-            # Verificar el cuerpo de la función
-            self.current_function_return_type = node.return_type
-            node.body.accept(self, func_env)
-            self.current_function_return_type = None
+            func_env = self.symtab_class(node.name, parent=env)
+            node.scope = func_env
+            try:
+                # Registrar parámetros (se ubican en la declaración de la función)
+                for param_name, param_type in node.params:
+                    param_node = _with_location(VarDecl(param_name, param_type), node)
+                    func_env.add(param_name, param_node)
+                
+                # Verificar el cuerpo de la función
+                self.current_function_return_type = node.return_type
+                node.body.accept(self, func_env)
+                self.current_function_return_type = None
+            finally:
+                func_env.close()
             
         except Symtab.SymbolDefinedError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
+            self.report(str(e), node)
         return None
 
     def visit_Return(self, node, env):
         if node.value:
             node.value.accept(self, env)
-            if not can_assign(self.current_function_return_type, node.value.dtype):
-                self.error_manager.add_error(
-                    f"Return type mismatch: expected {self.current_function_return_type}, got {node.value.dtype}",
-                    getattr(node, 'lineno', None))
-        elif self.current_function_return_type != 'void':
-            self.error_manager.add_error(
-                f"Non-void function must return a value",
-                getattr(node, 'lineno', None))
+            if (node.value.dtype is not UNKNOWN
+                    and not can_assign(self.current_function_return_type, node.value.dtype)):
+                self.report(
+                    f"Return type mismatch: expected {self.current_function_return_type}, got {node.value.dtype}", node)
+        elif self.current_function_return_type is not VOID:
+            self.report(
+                f"Non-void function must return a value", node)
         return None
 
     def visit_FuncCall(self, node, env):
         try:
             func_info = env.get(node.name)
+            node.symbol = func_info
             
             # Verificar argumentos
             for arg in node.args:
                 arg.accept(self, env)
             
-            # TODO: Verificar coincidencia de parámetros y argumentos
+            params = getattr(func_info, 'params', None)
+            if params is None:
+                self.report(f"'{node.name}' is not a function", node)
+                node.dtype = UNKNOWN
+                return None
+            if len(node.args) != len(params):
+                self.report(
+                    f"Function '{node.name}' expects {len(params)} arguments, got {len(node.args)}", node)
+            else:
+                for position, (arg, (param_name, param_type)) in enumerate(zip(node.args, params), 1):
+                    if arg.dtype is None or arg.dtype is UNKNOWN:
+                        continue  # Sin tipo o con un error ya reportado
+                    if not can_assign(param_type, arg.dtype):
+                        self.report(
+                            f"Argument {position} of '{node.name}' must be {param_type} "
+                            f"(parameter '{param_name}'), got {arg.dtype}", arg)
             node.dtype = func_info.return_type
         except Symtab.SymbolNotFoundError as e:
-            self.error_manager.add_error(str(e), getattr(node, 'lineno', None))
-            node.dtype = 'unknown'
+            self.report(str(e), node)
+            node.dtype = UNKNOWN
+        return None
+
+    def visit_ErrorNode(self, node, env):
+        # El parser ya reportó el error de sintaxis
+        node.dtype = UNKNOWN
         return None
 
     def visit_Break(self, node, env):
         if not self.in_loop:
-            self.error_manager.add_error(
-                "Break statement outside loop",
-                getattr(node, 'lineno', None))
+            self.report(
+                "Break statement outside loop", node)
         return None
 
     def visit_Continue(self, node, env):
         if not self.in_loop:
-            self.error_manager.add_error(
-                "Continue statement outside loop",
-                getattr(node, 'lineno', None))
+            self.report(
+                "Continue statement outside loop", node)
         return None
 
     def visit_TypeCast(self, node, env):
@@ -266,6 +461,92 @@ class TypeChecker:
         # TODO: Determinar tipo de acceso a memoria
         return None
 
+def _with_location(stub, node):
+    """Copia en `stub` la posición (offset y fin) de `node`"""
+    for attr in ('offset', 'end'):
+        value = getattr(node, attr, None)
+        if value is not None:
+            setattr(stub, attr, value)
+    return stub
+
+def check_function_bodies(symtab_class, global_refs, tasks, max_errors=None, lines=None):
+    """
+    Trabajador de la fase 2: verifica una serie de funciones consecutivas.
+    Los cuerpos se anotan en el mismo AST que recorre el hilo principal.
+
+    Args:
+        symtab_class: Clase de tabla de símbolos
+        global_refs: [(nombre, símbolo)] globales en orden de declaración
+            (compartidos entre hilos, solo se leen)
+        tasks: [(índice, globales visibles, FuncDecl)] en orden de código fuente
+        max_errors (int, optional): Máximo de errores por función
+        lines (LineIndex, optional): Tabla de líneas para reportar columnas
+
+    Returns:
+        [(índice, ámbito de la función, diagnósticos)]
+    """
+    checker = TypeChecker(symtab_class, max_errors=max_errors)
+    checker.lines = lines
+    env = symtab_class("global")
+    declared = 0
+    results = []
+    for index, visible, func in tasks:
+        # Declarar los globales que preceden a la función
+        while declared < visible:
+            env.add(*global_refs[declared])
+            declared += 1
+        checker.error_manager = ErrorManager(default_code=TYPE_ERROR, max_errors=max_errors)
+        try:
+            func.accept(checker, env)
+        except TooManyErrors:
+            pass
+        declared += 1  # visit_FuncDecl registró la propia función
+        scope = env.children[-1]
+        scope.detach()  # Separarlo del ámbito global propio de este hilo
+        results.append((index, scope, checker.error_manager.diagnostics()))
+    return results
+
+def _run_function_checks(symtab_class, global_refs, tasks, jobs, max_errors, lines=None):
+    """Reparte las funciones en bloques consecutivos entre `jobs` hilos"""
+    from concurrent.futures import ThreadPoolExecutor
+    if not tasks:
+        return []
+    chunk_count = min(len(tasks), jobs * 4)
+    size = -(-len(tasks) // chunk_count)
+    chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(check_function_bodies, symtab_class,
+                            global_refs, chunk, max_errors, lines)
+            for chunk in chunks
+        ]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+def print_token_stream(tokens):
+    """Muestra el flujo de tokens (salida de depuración del driver)"""
+    print("\n=== TOKEN STREAM ===")
+    for i, token in enumerate(tokens):
+        print(f"{i}: {token.type} '{token.value}' (line {tokens.lineno(i)})")
+
+def write_debug_files(ast, error_manager, directory="temp"):
+    """Genera archivos JSON con el AST y el registro de errores de sintaxis"""
+    os.makedirs(directory, exist_ok=True)
+    if ast:
+        with open(os.path.join(directory, "ast_output.json"), "w") as f:
+            json.dump(ast.to_dict(), f, indent=4)
+
+    with open(os.path.join(directory, "error_log.txt"), "w") as f:
+        for error in error_manager.get_all():
+            f.write(error + "\n")
+
+def print_symbol_table(symtab):
+    """Muestra la tabla de símbolos con todos sus ámbitos"""
+    print("\n=== Tabla de Símbolos ===")
+    symtab.print(show_all_scopes=True)
+
 def print_errors(title, errors):
     """Imprime errores con formato consistente"""
     if errors:
@@ -273,16 +554,107 @@ def print_errors(title, errors):
         for error in errors:
             print(f"  - {error}")
 
+def print_limit_notes(phase):
+    """Informa si se omitieron diagnósticos por límite, duplicados o cascada"""
+    manager = phase.error_manager
+    if manager.aborted:
+        print(f"  (análisis detenido: se alcanzó el máximo de {manager.max_errors} errores)")
+    if manager.duplicates:
+        print(f"  ({manager.duplicates} diagnósticos duplicados omitidos)")
+    if getattr(phase, 'suppressed', 0):
+        print(f"  ({phase.suppressed} errores en cascada omitidos)")
+
+def emit_interface(ast, source_code, filename, output=''):
+    """Escribe la interfaz (.goxi) del programa verificado"""
+    base = os.path.splitext(filename)[0]
+    output = output or base + '.goxi'
+    interface = build_interface(os.path.basename(base), ast, source_hash(source_code))
+    write_interface(output, interface)
+    print(f"Interfaz escrita en {output}")
+
 def print_success(message):
     """Imprime mensaje de éxito con formato"""
     print(f"\n✓ {message}")
 
+# Implementaciones de tabla de símbolos seleccionables con --symtab
+SYMTABS = {'nested': Symtab, 'flat': FlatSymtab}
+
+def parse_args(argv=None):
+    """Analiza los argumentos de la línea de comandos"""
+    import argparse
+    arg_parser = argparse.ArgumentParser(
+        prog="check.py", usage="python check.py archivo.gox [opciones]")
+    arg_parser.add_argument('filename', help="Archivo fuente .gox")
+    arg_parser.add_argument('--stats', nargs='?', const='text', choices=['text', 'json'],
+                            help="Mostrar tiempos por fase y contadores (text o json)")
+    arg_parser.add_argument('--stats-output', metavar='ARCHIVO',
+                            help="Escribir las estadísticas en un archivo en lugar de stdout")
+    arg_parser.add_argument('--max-errors', type=int, metavar='N',
+                            help="Detener cada fase al llegar a N errores")
+    arg_parser.add_argument('--diagnostics', metavar='ARCHIVO',
+                            help="Exportar los diagnósticos (.sarif para SARIF, si no JSON Lines)")
+    arg_parser.add_argument('--profile', action='store_true',
+                            help="Atribuir el tiempo de compilación a las líneas del archivo fuente")
+    arg_parser.add_argument('--profile-output', metavar='ARCHIVO',
+                            help="Escribir las pilas colapsadas (formato flamegraph) en un archivo")
+    arg_parser.add_argument('--engine', choices=ENGINES, default='regex',
+                            help="Motor del lexer (regex o dispatch)")
+    arg_parser.add_argument('--symtab', choices=sorted(SYMTABS), default='nested',
+                            help="Tabla de símbolos del checker (nested o flat)")
+    arg_parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                            help="Usar N procesos para el lexer (archivos de varios MB)")
+    arg_parser.add_argument('--interface', action='append', default=[], metavar='ARCHIVO',
+                            help="Cargar las firmas de un módulo desde su interfaz (.goxi)")
+    arg_parser.add_argument('--emit-interface', nargs='?', const='', metavar='ARCHIVO',
+                            help="Escribir la interfaz del programa (por defecto junto al fuente, .goxi)")
+    return arg_parser.parse_args(argv)
+
+def profile_phase(profiler, name):
+    """Contexto de fase del perfilador, o uno vacío si no se está perfilando"""
+    return profiler.phase(name) if profiler else nullcontext()
+
+def export_diagnostics(managers, filename, source_uri):
+    """Exporta los diagnósticos de todas las fases a un archivo"""
+    combined = ErrorManager()
+    for manager in managers:
+        combined.extend(manager)
+    with open(filename, 'w') as f:
+        if filename.endswith('.sarif'):
+            combined.export_sarif(f, source_uri)
+        else:
+            combined.export_jsonl(f)
+
+def report_profile(profiler, source_code, output=None):
+    """Imprime las líneas más costosas y guarda las pilas colapsadas"""
+    print("\n" + profiler.format_report(source_code))
+    if output:
+        with open(output, 'w') as f:
+            f.write(profiler.collapsed() + "\n")
+        print(f"Pilas colapsadas escritas en {output}")
+
+def report_stats(stats, fmt, output=None):
+    """Imprime o guarda el reporte de estadísticas"""
+    stats.finish()
+    report = stats.to_json() if fmt == 'json' else stats.format_text()
+    if output:
+        with open(output, 'w') as f:
+            f.write(report + "\n")
+    else:
+        print("\n" + report)
+
 def main():
-    if len(sys.argv) != 2:
+    if len(sys.argv) < 2:
         print("Uso: python check.py archivo.gox")
         sys.exit(1)
 
-    filename = sys.argv[1]
+    args = parse_args()
+    filename = args.filename
+    stats = Stats() if args.stats else NULL_STATS
+    profiler = SourceProfiler() if args.profile or args.profile_output else None
+    quiet = stats.enabled or profiler is not None
+    source_code = ''
+    # Diagnósticos de cada fase, para exportarlos al final
+    managers = []
     
     try:
         # Leer código fuente
@@ -292,36 +664,77 @@ def main():
         print(f"\nAnalizando: {filename}")
         
         # Análisis léxico
-        lexer = Lexer()
-        tokens, lex_errors = lexer.tokenize(source_code)
+        lexer = Lexer(max_errors=args.max_errors, jobs=args.jobs, engine=args.engine)
+        with stats.phase('tokenize'), profile_phase(profiler, 'tokenize'):
+            tokens, lex_errors = lexer.tokenize(source_code)
+        stats.incr('tokens', len(tokens))
+        if lex_errors:
+            lex_manager = ErrorManager(default_code=LEX_ERROR)
+            for err in lex_errors:
+                lex_manager.add_error(err)
+            managers.append(lex_manager)
         print_errors("Errores léxicos encontrados", lex_errors)
         if lex_errors:
             sys.exit(1)
 
         # Análisis sintáctico
-        parser = Parser(tokens)
-        ast = parser.parse()
+        if not quiet:
+            print_token_stream(tokens)
+        parser = Parser(tokens, string_table=lexer.string_table, max_errors=args.max_errors)
+        managers.append(parser.error_manager)
+        if profiler:
+            profiler.instrument_parser(parser)
+        with stats.phase('parse'), profile_phase(profiler, 'parse'):
+            ast = parser.parse()
+        if not quiet and ast is not None:
+            write_debug_files(ast, parser.error_manager)
         print_errors("Errores de sintaxis encontrados", parser.error_manager.get_all())
+        print_limit_notes(parser)
         if ast is None:
             sys.exit(1)
+        stats.count_nodes(ast, 'parse.nodes')
 
         # Análisis semántico
-        checker = TypeChecker()
-        is_valid = checker.check(ast)
+        checker = TypeChecker(SYMTABS[args.symtab], stats=stats, max_errors=args.max_errors)
+        for path in args.interface:
+            checker.load_interface(path)
+        managers.append(checker.error_manager)
+        if profiler:
+            profiler.instrument_checker(checker)
+        with stats.phase('check'), profile_phase(profiler, 'check'):
+            is_valid = checker.check(ast)
+        if not quiet:
+            print_symbol_table(checker.current_symtab)
         
-        if is_valid:
+        if is_valid and parser.error_manager.has_errors():
+            # El AST parcial no tiene errores semánticos, pero sí de sintaxis
+            sys.exit(1)
+        elif is_valid:
             print_success("Programa válido semánticamente")
+            if args.emit_interface is not None:
+                emit_interface(ast, source_code, filename, args.emit_interface)
             sys.exit(0)
         else:
             print_errors("Errores semánticos encontrados", checker.error_manager.get_all())
+            print_limit_notes(checker)
             sys.exit(1)
             
     except FileNotFoundError:
         print(f"\nError: No se encontró el archivo {filename}")
         sys.exit(1)
+    except InterfaceError as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"\nError inesperado: {str(e)}")
         sys.exit(1)
+    finally:
+        if args.diagnostics:
+            export_diagnostics(managers, args.diagnostics, filename)
+        if stats.enabled:
+            report_stats(stats, args.stats, args.stats_output)
+        if profiler:
+            report_profile(profiler, source_code, args.profile_output)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
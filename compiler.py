@@ -0,0 +1,84 @@
+'''
+Núcleo reentrante del compilador goxLang.
+
+Encadena lexer, parser y checker sin efectos secundarios: no imprime, no
+escribe archivos y no usa estado global, así que varias compilaciones
+pueden correr a la vez en hilos o procesos distintos. Toda la E/S (flujo
+de tokens, temp/, tabla de símbolos por consola) queda en el driver
+(check.py).
+
+    result = compile_source(texto)
+    if not result.valid:
+        for diag in result.diagnostics:
+            print(format_diagnostic(diag))
+'''
+from collections import namedtuple
+
+from lexer import Lexer
+from parser import Parser
+from check import TypeChecker
+from symtab import Symtab
+from gox_error_manager import ErrorManager, LEX_ERROR
+
+# Resultado de una compilación: `valid` es True si no hubo errores en
+# ninguna fase, `diagnostics` es la lista de Diagnostic de todas las fases
+# en orden (léxico, sintaxis, tipos), `ast` el Program y `symtab` el ámbito
+# global (None si no se llegó a construirlos)
+CheckResult = namedtuple('CheckResult', ['valid', 'diagnostics', 'ast', 'symtab'],
+                         defaults=(None, None))
+
+
+class CompilationCancelled(Exception):
+    """Se lanza cuando `cancelled()` indica que el resultado ya no interesa"""
+
+
+def compile_source(source_code, max_errors=None, symtab_class=Symtab, jobs=1, cancelled=None,
+                   interfaces=None, spans=False):
+    """
+    Ejecuta lexer, parser y checker sobre `source_code`. Es una función de
+    módulo para poder ejecutarse en un ProcessPoolExecutor.
+
+    Args:
+        source_code (str): Código fuente goxLang
+        max_errors (int, optional): Máximo de errores por fase
+        symtab_class: Implementación de tabla de símbolos (Symtab o FlatSymtab)
+        jobs (int): Procesos del lexer para archivos de varios MB (1 = secuencial)
+        cancelled (callable, optional): Se consulta entre fases; si devuelve
+            True se abandona la compilación (p. ej. el documento cambió)
+        interfaces (dict, optional): Firmas exportadas por otros módulos
+            (ver TypeChecker)
+        spans (bool): Guardar en cada nodo el final de su texto (`end`),
+            necesario para PositionIndex y para diagnósticos con rango
+
+    Returns:
+        CheckResult
+
+    Raises:
+        CompilationCancelled: Si `cancelled()` devolvió True
+    """
+    lexer = Lexer(max_errors=max_errors, jobs=jobs)
+    tokens, lex_errors = lexer.tokenize(source_code)
+    if lex_errors:
+        manager = ErrorManager(default_code=LEX_ERROR)
+        position = lexer.lines.position
+        for err, (start, end) in zip(lex_errors, lexer.error_spans):
+            lineno, columna = position(start)
+            end_lineno, end_columna = position(end)
+            manager.add_error(err, lineno, columna, end_lineno=end_lineno,
+                              end_columna=end_columna)
+        return CheckResult(False, manager.diagnostics())
+
+    if cancelled is not None and cancelled():
+        raise CompilationCancelled()
+    parser = Parser(tokens, string_table=lexer.string_table, max_errors=max_errors, spans=spans)
+    ast = parser.parse()
+    diagnostics = parser.error_manager.diagnostics()
+    if ast is None:
+        return CheckResult(False, diagnostics)
+
+    if cancelled is not None and cancelled():
+        raise CompilationCancelled()
+    checker = TypeChecker(symtab_class, max_errors=max_errors, interfaces=interfaces)
+    valid = checker.check(ast) and not parser.error_manager.has_errors()
+    return CheckResult(valid, diagnostics + checker.error_manager.diagnostics(),
+                       ast, checker.current_symtab)
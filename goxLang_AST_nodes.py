@@ -1,3 +1,5 @@
+from typesys import INT, FLOAT, BOOL, CHAR, STRING, as_type
+
 class Program:
     def __init__(self, statements):
         self.statements = statements
@@ -44,8 +46,9 @@ class If:
         return visitor.visit_If(self, env)
 
 class Block:
-    def __init__(self, statements):
+    def __init__(self, statements, offset=None):
         self.statements = statements
+        self.offset = offset
         self.dtype = None
 
     def to_dict(self):
@@ -60,7 +63,7 @@ class Block:
 class IntLiteral:
     def __init__(self, value):
         self.value = value
-        self.dtype = 'int'
+        self.dtype = INT
 
     def to_dict(self):
         return {"type": "IntLiteral", "value": self.value}
@@ -71,7 +74,7 @@ class IntLiteral:
 class FloatLiteral:
     def __init__(self, value):
         self.value = value
-        self.dtype = 'float'
+        self.dtype = FLOAT
 
     def to_dict(self):
         return {"type": "FloatLiteral", "value": self.value}
@@ -82,7 +85,7 @@ class FloatLiteral:
 class StringLiteral:
     def __init__(self, value):
         self.value = value
-        self.dtype = 'string'
+        self.dtype = STRING
 
     def to_dict(self):
         return {"type": "StringLiteral", "value": self.value}
@@ -93,7 +96,7 @@ class StringLiteral:
 class BoolLiteral:
     def __init__(self, value):
         self.value = value
-        self.dtype = 'bool'
+        self.dtype = BOOL
 
     def to_dict(self):
         return {"type": "BoolLiteral", "value": self.value}
@@ -104,7 +107,7 @@ class BoolLiteral:
 class CharLiteral:
     def __init__(self, value):
         self.value = value
-        self.dtype = 'char'
+        self.dtype = CHAR
 
     def to_dict(self):
         return {"type": "CharLiteral", "value": self.value}
@@ -125,9 +128,9 @@ class Identifier:
 
 class TypeCast:
     def __init__(self, cast_type, expression):
-        self.cast_type = cast_type
+        self.cast_type = as_type(cast_type)
         self.expression = expression
-        self.dtype = cast_type
+        self.dtype = self.cast_type
 
     def to_dict(self):
         return {
@@ -156,9 +159,9 @@ class MemoryAccess:
 class ImportFunctionDecl:
     def __init__(self, name, params, return_type):
         self.name = name
-        self.params = params
-        self.return_type = return_type
-        self.dtype = return_type
+        self.params = [(param_name, as_type(param_type)) for param_name, param_type in params]
+        self.return_type = as_type(return_type)
+        self.dtype = self.return_type
 
     def to_dict(self):
         return {
@@ -190,9 +193,9 @@ class ConstDecl:
 class VarDecl:
     def __init__(self, name, var_type, value=None):
         self.name = name
-        self.var_type = var_type
+        self.var_type = as_type(var_type)
         self.value = value
-        self.dtype = var_type
+        self.dtype = self.var_type
 
     def to_dict(self):
         return {
@@ -224,10 +227,10 @@ class Assignment:
 class FuncDecl:
     def __init__(self, name, params, return_type, body):
         self.name = name
-        self.params = params
-        self.return_type = return_type
+        self.params = [(param_name, as_type(param_type)) for param_name, param_type in params]
+        self.return_type = as_type(return_type)
         self.body = body
-        self.dtype = return_type
+        self.dtype = self.return_type
 
     def to_dict(self):
         return {
@@ -256,10 +259,10 @@ class Return:
         return visitor.visit_Return(self, env)
 
 class While:
-    def __init__(self, condition, body, lineno=None):
+    def __init__(self, condition, body, offset=None):
         self.condition = condition
         self.body = body
-        self.lineno = lineno
+        self.offset = offset
         self.dtype = None
 
     def accept(self, visitor, env):
@@ -270,15 +273,15 @@ class While:
             "type": "While",
             "condition": self.condition.to_dict(),
             "body": self.body.to_dict(),
-            "lineno": self.lineno
+            "offset": self.offset
         }
 
 class BinaryOp:
-    def __init__(self, left, operator, right, lineno=None):
+    def __init__(self, left, operator, right, offset=None):
         self.left = left
         self.operator = operator
         self.right = right
-        self.lineno = lineno
+        self.offset = offset
         self.dtype = None
 
     def to_dict(self):
@@ -310,6 +313,19 @@ class FuncCall:
 
 Call = FuncCall  # Alias
 
+class ErrorNode:
+    """Marcador de una construcción que no se pudo analizar (recuperación de errores)"""
+    def __init__(self, message=None, offset=None):
+        self.message = message
+        self.offset = offset
+        self.dtype = None
+
+    def to_dict(self):
+        return {"type": "Error", "message": self.message, "offset": self.offset}
+
+    def accept(self, visitor, env):
+        return visitor.visit_ErrorNode(self, env)
+
 class Break:
     def __init__(self):
         self.dtype = None
@@ -328,4 +344,30 @@ class Continue:
         return {"type": "Continue"}
 
     def accept(self, visitor, env):
-        return visitor.visit_Continue(self, env)
\ No newline at end of file
+        return visitor.visit_Continue(self, env)
+
+
+# Atributos que apuntan a otro nodo del árbol sin ser hijos (p. ej. la
+# declaración a la que resuelve un Identifier tras la verificación)
+REFERENCE_ATTRIBUTES = frozenset({'symbol'})
+
+
+def walk(node):
+    """
+    Recorre el AST en preorden, devolviendo cada nodo (incluido `node`).
+    Los hijos son los atributos que son nodos o listas de nodos, salvo los
+    de REFERENCE_ATTRIBUTES.
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        children = []
+        for key, value in vars(current).items():
+            if key in REFERENCE_ATTRIBUTES:
+                continue
+            if hasattr(value, 'accept'):
+                children.append(value)
+            elif isinstance(value, list):
+                children.extend(item for item in value if hasattr(item, 'accept'))
+        stack.extend(reversed(children))
@@ -1,9 +1,77 @@
+import json
+from collections import namedtuple
+
+# Registro compacto de un diagnóstico. `lineno`/`columna` marcan el inicio
+# del span y `end_lineno`/`end_columna` (opcionales) el final.
+Diagnostic = namedtuple(
+    'Diagnostic',
+    ['type', 'message', 'lineno', 'columna', 'code', 'end_lineno', 'end_columna'],
+    defaults=(None, None, None, None, None)
+)
+
+# Códigos de error por fase (se usan como código por defecto)
+LEX_ERROR = 'E001'
+SYNTAX_ERROR = 'E100'
+TYPE_ERROR = 'E200'
+
+class TooManyErrors(Exception):
+    """Se lanza cuando se alcanza el máximo de errores configurado"""
+    def __init__(self, limit):
+        self.limit = limit
+        super().__init__(f"Too many errors ({limit}), stopping")
+
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+
+def format_diagnostic(diag):
+    """Formatea un diagnóstico como '[ERROR] (line 3, col 5): mensaje'"""
+    location = []
+    if diag.lineno is not None:
+        location.append(f"line {diag.lineno}")
+    if diag.columna is not None:
+        location.append(f"col {diag.columna}")
+    loc_str = f" ({', '.join(location)})" if location else ""
+    return f"[{diag.type.upper()}]{loc_str}: {diag.message}"
+
+
 class ErrorManager:
-    def __init__(self):
-        # Lista de errores registrados
+    def __init__(self, default_code=None, max_errors=None, dedupe=True):
+        """
+        Args:
+            default_code (str, optional): Código asignado a los diagnósticos
+                que no indican uno (p. ej. SYNTAX_ERROR en el parser)
+            max_errors (int, optional): Al registrar este número de errores
+                se lanza TooManyErrors para abortar el análisis
+            dedupe (bool): Descartar diagnósticos repetidos (mismo tipo,
+                mensaje y línea)
+        """
+        # Lista de diagnósticos registrados (errores y advertencias)
         self._errors = []
+        # Mensajes ya formateados, en el mismo orden que _errors
+        self._formatted = []
+        self._error_count = 0
+        self._warning_count = 0
+        self.default_code = default_code
+        self.max_errors = max_errors
+        self.dedupe = dedupe
+        self._seen = set()
+        self.duplicates = 0
+        # True si se abortó el análisis por exceso de errores
+        self.aborted = False
+
+    def _is_duplicate(self, msg_type, message, lineno):
+        if not self.dedupe:
+            return False
+        key = (msg_type, message, lineno)
+        if key in self._seen:
+            self.duplicates += 1
+            return True
+        self._seen.add(key)
+        return False
         
-    def add_error(self, message, lineno=None, columna=None):
+    def add_error(self, message, lineno=None, columna=None, code=None,
+                  end_lineno=None, end_columna=None):
         """
         Registra un nuevo error en el sistema.
         
@@ -11,16 +79,24 @@ class ErrorManager:
             message (str): Mensaje descriptivo del error
             lineno (int, optional): Número de línea donde ocurrió el error
             columna (int, optional): Número de columna donde ocurrió el error
+            code (str, optional): Código del error
+            end_lineno (int, optional): Línea donde termina el span
+            end_columna (int, optional): Columna donde termina el span
+
+        Raises:
+            TooManyErrors: Si se alcanza `max_errors`
         """
-        error_info = {
-            'type': 'error',
-            'message': message,
-            'lineno': lineno,
-            'columna': columna
-        }
-        self._errors.append(error_info)
+        if self._is_duplicate('error', message, lineno):
+            return
+        self._errors.append(Diagnostic('error', message, lineno, columna,
+                                       code or self.default_code, end_lineno, end_columna))
+        self._error_count += 1
+        if self.max_errors is not None and self._error_count >= self.max_errors:
+            self.aborted = True
+            raise TooManyErrors(self.max_errors)
     
-    def add_warning(self, message, lineno=None, columna=None):
+    def add_warning(self, message, lineno=None, columna=None, code=None,
+                    end_lineno=None, end_columna=None):
         """
         Registra una advertencia en el sistema.
         
@@ -28,26 +104,66 @@ class ErrorManager:
             message (str): Mensaje descriptivo de la advertencia
             lineno (int, optional): Número de línea
             columna (int, optional): Número de columna
+            code (str, optional): Código de la advertencia
+            end_lineno (int, optional): Línea donde termina el span
+            end_columna (int, optional): Columna donde termina el span
         """
-        warning_info = {
-            'type': 'warning',
-            'message': message,
-            'lineno': lineno,
-            'columna': columna
-        }
-        self._errors.append(warning_info)
+        if self._is_duplicate('warning', message, lineno):
+            return
+        self._errors.append(Diagnostic('warning', message, lineno, columna,
+                                       code or self.default_code, end_lineno, end_columna))
+        self._warning_count += 1
+
+    def add_diagnostic(self, diag):
+        """
+        Registra un Diagnostic ya construido (p. ej. proveniente de otro
+        proceso), aplicando la deduplicación y el máximo de errores.
+        """
+        if diag.type == 'error':
+            self.add_error(diag.message, diag.lineno, diag.columna, diag.code,
+                           diag.end_lineno, diag.end_columna)
+        else:
+            self.add_warning(diag.message, diag.lineno, diag.columna, diag.code,
+                             diag.end_lineno, diag.end_columna)
+
+    def extend(self, other):
+        """Agrega al final los diagnósticos de otro ErrorManager"""
+        for diag in other.diagnostics():
+            self._errors.append(diag)
+            if diag.type == 'error':
+                self._error_count += 1
+            else:
+                self._warning_count += 1
     
     def has_errors(self):
         """Indica si hay errores registrados"""
-        return any(e['type'] == 'error' for e in self._errors)
+        return self._error_count > 0
     
     def has_warnings(self):
         """Indica si hay advertencias registradas"""
-        return any(e['type'] == 'warning' for e in self._errors)
+        return self._warning_count > 0
+
+    def error_count(self):
+        """Número de errores registrados"""
+        return self._error_count
+
+    def warning_count(self):
+        """Número de advertencias registradas"""
+        return self._warning_count
+
+    def diagnostics(self):
+        """Devuelve los diagnósticos registrados (registros Diagnostic)"""
+        return list(self._errors)
     
     def clear(self):
         """Limpia todos los errores y advertencias"""
         self._errors.clear()
+        self._formatted.clear()
+        self._error_count = 0
+        self._warning_count = 0
+        self._seen.clear()
+        self.duplicates = 0
+        self.aborted = False
     
     def get_errors(self):
         """Devuelve una lista con todos los errores formateados"""
@@ -78,26 +194,76 @@ class ErrorManager:
     
     def _format_messages(self, msg_type=None):
         """
-        Formatea los mensajes para su visualización.
+        Formatea los mensajes para su visualización. Cada diagnóstico se
+        formatea una sola vez, la primera vez que se solicita.
         
         Args:
             msg_type (str, optional): 'error', 'warning' o None para todos
         """
-        formatted = []
-        for msg in self._errors:
-            if msg_type and msg['type'] != msg_type:
-                continue
-                
-            location = []
-            if msg['lineno'] is not None:
-                location.append(f"line {msg['lineno']}")
-            if msg['columna'] is not None:
-                location.append(f"col {msg['columna']}")
-            
-            loc_str = f" ({', '.join(location)})" if location else ""
-            formatted.append(f"[{msg['type'].upper()}]{loc_str}: {msg['message']}")
-        
-        return formatted
+        formatted = self._formatted
+        for diag in self._errors[len(formatted):]:
+            formatted.append(format_diagnostic(diag))
+        if msg_type is None:
+            return list(formatted)
+        return [text for diag, text in zip(self._errors, formatted) if diag.type == msg_type]
+
+    def export_jsonl(self, stream):
+        """
+        Escribe los diagnósticos en formato JSON Lines (un objeto por línea).
+
+        Args:
+            stream: Archivo abierto en modo texto
+        """
+        dumps = json.dumps
+        for diag in self._errors:
+            stream.write(dumps(diag._asdict(), ensure_ascii=False))
+            stream.write("\n")
+
+    def to_sarif(self, uri=None, tool_name='goxlang'):
+        """
+        Construye un reporte SARIF 2.1.0 con los diagnósticos.
+
+        Args:
+            uri (str, optional): Archivo fuente al que se refieren
+            tool_name (str): Nombre de la herramienta en el reporte
+        """
+        rules = sorted({diag.code for diag in self._errors if diag.code})
+        results = []
+        for diag in self._errors:
+            result = {
+                'level': diag.type,
+                'message': {'text': diag.message},
+            }
+            if diag.code:
+                result['ruleId'] = diag.code
+            if uri or diag.lineno is not None:
+                location = {}
+                if uri:
+                    location['artifactLocation'] = {'uri': uri}
+                if diag.lineno is not None:
+                    region = {'startLine': diag.lineno}
+                    if diag.columna is not None:
+                        region['startColumn'] = diag.columna
+                    if diag.end_lineno is not None:
+                        region['endLine'] = diag.end_lineno
+                    if diag.end_columna is not None:
+                        region['endColumn'] = diag.end_columna
+                    location['region'] = region
+                result['locations'] = [{'physicalLocation': location}]
+            results.append(result)
+        return {
+            '$schema': SARIF_SCHEMA,
+            'version': '2.1.0',
+            'runs': [{
+                'tool': {'driver': {'name': tool_name, 'rules': [{'id': rule} for rule in rules]}},
+                'results': results,
+            }],
+        }
+
+    def export_sarif(self, stream, uri=None):
+        """Escribe los diagnósticos como reporte SARIF en `stream`"""
+        json.dump(self.to_sarif(uri), stream, indent=2, ensure_ascii=False)
+        stream.write("\n")
     
     # Métodos de compatibilidad (pueden eliminarse en versiones futuras)
     def registrar(self, descripcion, linea, columna=None):
@@ -0,0 +1,120 @@
+'''
+Archivos de interfaz (.goxi) de las unidades de compilación goxLang.
+
+Una interfaz es la tabla de lo que exporta un módulo: las firmas de sus
+funciones de nivel superior (nombre, parámetros y tipo de retorno), que es
+lo único que otro módulo puede importar (`import func`). Se guarda en un
+archivo pequeño para que las compilaciones que dependen del módulo lean
+solo la interfaz, sin volver a analizar su código fuente:
+
+    interface = build_interface('lib/math', program)
+    write_interface('lib/math.goxi', interface)
+
+    checker = TypeChecker()
+    checker.load_interface('lib/math.goxi')
+
+El formato es JSON compacto con un número de versión; el hash del fuente
+permite saber si la interfaz quedó vieja.
+'''
+import hashlib
+import json
+from collections import namedtuple
+
+from goxLang_AST_nodes import FuncDecl
+
+INTERFACE_SUFFIX = '.goxi'
+INTERFACE_VERSION = 2
+
+# Firma de una función exportada. `params` es una tupla de (nombre, tipo)
+# y los tipos se guardan por nombre para poder serializarlos.
+Signature = namedtuple('Signature', ['name', 'params', 'return_type', 'module'])
+
+# Interfaz de un módulo: {nombre: Signature}
+Interface = namedtuple('Interface', ['module', 'functions', 'source_hash'], defaults=(None,))
+
+
+class InterfaceError(Exception):
+    """Se lanza si un archivo de interfaz no se puede leer o no es válido"""
+
+
+def source_hash(source_code):
+    """Hash del código fuente de una unidad"""
+    return hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+
+
+def build_interface(module, program, source_hash=None):
+    """
+    Construye la interfaz de un módulo a partir de su Program verificado.
+
+    Args:
+        module (str): Nombre del módulo
+        program (Program): AST ya verificado
+        source_hash (str, optional): Hash del fuente del que sale
+
+    Returns:
+        Interface
+    """
+    functions = {}
+    for stmt in program.statements:
+        if isinstance(stmt, FuncDecl) and stmt.name not in functions:
+            functions[stmt.name] = Signature(
+                stmt.name, tuple((param, str(type_)) for param, type_ in stmt.params),
+                str(stmt.return_type), module)
+    return Interface(module, functions, source_hash)
+
+
+def dumps_interface(interface):
+    """Serializa una interfaz en JSON compacto"""
+    return json.dumps({
+        'version': INTERFACE_VERSION,
+        'module': interface.module,
+        'source_hash': interface.source_hash,
+        'functions': [[sig.name, [list(param) for param in sig.params], sig.return_type]
+                      for sig in interface.functions.values()],
+    }, separators=(',', ':'), ensure_ascii=False)
+
+
+def loads_interface(text):
+    """
+    Lee una interfaz serializada con dumps_interface.
+
+    Raises:
+        InterfaceError: Si el texto no es una interfaz válida
+    """
+    try:
+        data = json.loads(text)
+        if data.get('version') != INTERFACE_VERSION:
+            raise InterfaceError(f"Unsupported interface version {data.get('version')}")
+        module = data['module']
+        functions = {name: Signature(name, tuple((param, type_) for param, type_ in params),
+                                     return_type, module)
+                     for name, params, return_type in data['functions']}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InterfaceError(f"Invalid interface file: {e}") from e
+    return Interface(module, functions, data.get('source_hash'))
+
+
+def write_interface(path, interface):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps_interface(interface))
+
+
+def read_interface(path):
+    """
+    Lee un archivo .goxi.
+
+    Raises:
+        InterfaceError: Si el archivo no existe o no es válido
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError as e:
+        raise InterfaceError(f"Cannot read interface file {path}: {e.strerror}") from e
+    return loads_interface(text)
+
+
+def interface_hash(interface):
+    """Hash estable de lo que exporta una interfaz (sin el hash del fuente)"""
+    data = json.dumps(sorted(interface.functions.values()), separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
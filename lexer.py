@@ -1,7 +1,126 @@
 import re
+import string
+from array import array
+from bisect import bisect_right
 from collections import namedtuple
 
-Token = namedtuple('Token', ['type', 'value', 'lineno'])
+class LineIndex:
+    """
+    Tabla de inicios de línea de un archivo fuente. Hay una por archivo
+    (la comparten el lexer, la lista de tokens y el Program) y convierte
+    offsets (posiciones en el texto) en línea y columna por búsqueda
+    binaria, así los tokens y nodos solo guardan offsets. La tabla se
+    calcula la primera vez que se consulta: si no hay errores ni consultas
+    de posición, analizar un archivo no la construye.
+    """
+    def __init__(self, source_code, first_line=1):
+        """
+        Args:
+            source_code (str): Texto del archivo (o de un fragmento)
+            first_line (int): Número de la primera línea del texto
+        """
+        self.source = source_code
+        self.first_line = first_line
+        self._line_starts = None
+
+    @property
+    def line_starts(self):
+        """Offsets donde empieza cada línea (array de enteros de 8 bytes)"""
+        if self._line_starts is None:
+            starts = array('q', [0])
+            starts.extend(match.end() for match in NEWLINE_REGEX.finditer(self.source))
+            self._line_starts = starts
+        return self._line_starts
+
+    def lineno(self, offset):
+        """Línea (desde first_line) que contiene `offset`"""
+        return bisect_right(self.line_starts, offset) - 1 + self.first_line
+
+    def position(self, offset):
+        """Devuelve (línea, columna) de `offset`; las columnas empiezan en 1"""
+        starts = self.line_starts
+        index = bisect_right(starts, offset) - 1
+        return index + self.first_line, offset - starts[index] + 1
+
+    def offset(self, lineno, column=1):
+        """Offset de una posición (línea, columna); inversa de position()"""
+        starts = self.line_starts
+        index = min(max(lineno - self.first_line, 0), len(starts) - 1)
+        return starts[index] + column - 1
+
+    def line_count(self):
+        return len(self.line_starts)
+
+
+# Token con su posición: `offset` en el texto fuente. La línea y la columna
+# se calculan con la tabla de líneas del archivo y el final con
+# TokenList.end().
+Token = namedtuple('Token', ['type', 'value', 'offset'])
+
+
+class TokenList:
+    """
+    Secuencia de tokens guardada por columnas: tipos, valores y offsets en
+    listas paralelas. Los tipos y valores son objetos compartidos (nombres
+    de tipo constantes y valores internados) y cada offset es el mismo
+    objeto int que luego guarda el nodo del AST que empieza en ese token,
+    así que ni el token ni el nodo crean uno propio. Un token no cuesta una
+    tupla: los Token se crean al acceder por índice o al iterar. `lines` es
+    la tabla de líneas del archivo.
+    """
+    __slots__ = ('types', 'values', 'offsets', 'lines')
+
+    def __init__(self, lines=None, types=None, values=None, offsets=None):
+        self.types = types if types is not None else []
+        self.values = values if values is not None else []
+        self.offsets = offsets if offsets is not None else []
+        self.lines = lines
+
+    @classmethod
+    def from_tokens(cls, tokens, lines=None):
+        """Construye la lista a partir de cualquier iterable de Token"""
+        result = cls(lines)
+        for token in tokens:
+            result.append(token)
+        return result
+
+    def append(self, token):
+        self.types.append(token.type)
+        self.values.append(token.value)
+        self.offsets.append(token.offset)
+
+    def truncate(self, size):
+        """Descarta los tokens desde la posición `size`"""
+        del self.types[size:]
+        del self.values[size:]
+        del self.offsets[size:]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TokenList(self.lines, self.types[index], self.values[index], self.offsets[index])
+        return Token(self.types[index], self.values[index], self.offsets[index])
+
+    def __iter__(self):
+        return map(Token._make, zip(self.types, self.values, self.offsets))
+
+    def end(self, index):
+        """
+        Offset justo después del token `index`. Se deriva del valor, que es
+        el texto del token; los literales guardan su contenido decodificado,
+        así que su final se busca en el texto fuente.
+        """
+        kind = self.types[index]
+        offset = self.offsets[index]
+        if (kind == 'STRING' or kind == 'CHAR') and self.lines is not None:
+            return LITERAL_REGEX.match(self.lines.source, offset).end()
+        return offset + len(self.values[index])
+
+    def lineno(self, index):
+        """Línea del token `index` (None si no hay tabla de líneas)"""
+        return self.lines.lineno(self.offsets[index]) if self.lines is not None else None
 
 class LexerError(Exception):
     """Excepción para errores del lexer"""
@@ -37,7 +156,7 @@ reserved = {
 token_specification = [
     # El orden es importante - los más específicos primero
     ('BLOCKCOMMENT', r'/\*[\s\S]*?\*/'),  # Comentarios multilínea
-    ('COMMENT', r'//.*'),  # Comentarios de línea
+    ('COMMENT', r'//[^\n]*'),  # Comentarios de línea (DOTALL está activo)
     ('FLOAT', r'-?\d+\.\d+'),  # Números con punto decimal
     ('NUMBER', r'-?\d+'),  # Enteros
     ('STRING', r'"(?:\\.|[^"\\])*"'),  # Strings con escape
@@ -64,58 +183,443 @@ token_specification = [
     ('COMMA', r','),
     ('SEMICOLON', r';'),
     ('ID', r'[A-Za-z_][A-Za-z0-9_]*'),
-    ('WHITESPACE', r'[ \t\r]+'),  # Espacios y tabs
-    ('NEWLINE', r'\n'),  # Manejo explícito de nuevas líneas
+    ('WHITESPACE', r'[ \t\r\n]+'),  # Espacios, tabs y saltos de línea
     ('MISMATCH', r'.'),  # Cualquier otro carácter
 ]
 
-class Lexer:
+NEWLINE_REGEX = re.compile(r'\n')
+
+# Literales de cadena y de carácter, para hallar el final de su texto
+LITERAL_REGEX = re.compile('|'.join(pattern for name, pattern in token_specification
+                                   if name in ('STRING', 'CHAR')), re.DOTALL)
+
+# Motores de análisis disponibles:
+# - 'regex': una sola expresión regular con todas las alternativas; cada
+#   bloque de espacios y cada comentario es una coincidencia aparte.
+# - 'dispatch': tabla indexada por el primer carácter del token. Los
+#   espacios, saltos de línea y comentarios se saltan en bloque con una
+#   sola coincidencia, los operadores de un carácter no usan expresiones
+#   regulares y el resto solo prueba las alternativas que pueden empezar
+#   con ese carácter.
+ENGINES = ('regex', 'dispatch')
+
+# Tokens que pueden empezar con cada grupo de caracteres, en el orden de
+# token_specification. Los espacios y comentarios los salta SKIP_RUN.
+FIRST_CHAR_TOKENS = [
+    (string.ascii_letters + '_', ('ID',)),
+    (string.digits, ('FLOAT', 'NUMBER')),
+    ('-', ('FLOAT', 'NUMBER', 'MINUS')),
+    ('"', ('STRING',)),
+    ("'", ('CHAR',)),
+    ('=', ('EQ', 'ASSIGN')),
+    ('!', ('NE',)),
+    ('<', ('LE', 'LT')),
+    ('>', ('GE', 'GT')),
+    ('+', ('PLUS',)),
+    ('*', ('TIMES',)),
+    ('/', ('DIVIDE',)),
+    ('%', ('MOD',)),
+    ('^', ('POW',)),
+    ('(', ('LPAREN',)),
+    (')', ('RPAREN',)),
+    ('{', ('LBRACE',)),
+    ('}', ('RBRACE',)),
+    ('[', ('LBRACKET',)),
+    (']', ('RBRACKET',)),
+    (',', ('COMMA',)),
+    (';', ('SEMICOLON',)),
+]
+
+# Secuencia de espacios, saltos de línea y comentarios que se descarta de una vez
+SKIP_RUN = re.compile(r'(?:[ \t\r\n]+|/\*[\s\S]*?\*/|//[^\n]*)*')
+
+def build_dispatch_table():
+    """
+    Construye la tabla de despacho a partir de token_specification.
+
+    Returns:
+        dict: carácter -> tipo de token (si el token es ese único carácter)
+            o expresión regular compilada con las alternativas posibles
+    """
+    patterns = dict(token_specification)
+    table = {}
+    for chars, names in FIRST_CHAR_TOKENS:
+        if len(names) == 1 and len(chars) == 1 and patterns[names[0]] == re.escape(chars):
+            table[chars] = names[0]
+            continue
+        regex = re.compile('|'.join(f'(?P<{name}>{patterns[name]})' for name in names), re.DOTALL)
+        for char in chars:
+            table[char] = regex
+    return table
+
+DISPATCH_TABLE = build_dispatch_table()
+
+# Construcciones que pueden contener saltos de línea o caracteres que
+# engañarían al pre-escaneo. Se prueban en el mismo orden que en
+# token_specification, así que coinciden exactamente con lo que reconoce el lexer.
+SKIP_REGEX = re.compile('|'.join(pattern for name, pattern in token_specification
+                                 if name in ('BLOCKCOMMENT', 'COMMENT', 'STRING', 'CHAR')),
+                        re.DOTALL)
+
+# Tamaño mínimo de cada fragmento en el modo paralelo; por debajo de esto
+# el costo de los procesos supera al de analizar secuencialmente
+PARALLEL_MIN_CHUNK = 1 << 20
+
+# Secuencias de escape admitidas en literales de carácter y de cadena
+ESCAPES = {
+    'n': '\n',
+    't': '\t',
+    'r': '\r',
+    '0': '\0',
+    'a': '\a',
+    'b': '\b',
+    'f': '\f',
+    'v': '\v',
+    '\\': '\\',
+    "'": "'",
+    '"': '"',
+}
+
+ESCAPE_REGEX = re.compile(r'\\(.)', re.DOTALL)
+
+def _decode_escape(match):
+    try:
+        return ESCAPES[match.group(1)]
+    except KeyError:
+        raise ValueError(match.group()) from None
+
+def decode_literal(literal):
+    """
+    Quita las comillas de un literal de carácter o de cadena y convierte
+    sus secuencias de escape usando la tabla ESCAPES.
+
+    Args:
+        literal (str): Texto del literal tal como aparece en el código,
+            incluidas las comillas
+
+    Returns:
+        str: Contenido del literal
+
+    Raises:
+        ValueError: Si contiene una secuencia de escape desconocida (el
+            mensaje es la secuencia, p. ej. '\\q')
+    """
+    body = literal[1:-1]
+    if '\\' not in body:
+        return body  # Camino rápido: sin escapes
+    return ESCAPE_REGEX.sub(_decode_escape, body)
+
+# Tipos de token cuyo valor se interna en la tabla de cadenas
+INTERNED = ('ID', 'STRING') + tuple(set(reserved.values()))
+
+def split_points(source_code, parts):
+    """
+    Busca posiciones seguras para dividir el código fuente en `parts`
+    fragmentos: justo después de un salto de línea que no esté dentro de
+    un comentario de bloque ni de un literal.
+
+    Args:
+        source_code (str): Código fuente completo
+        parts (int): Número de fragmentos deseado
+
+    Returns:
+        list: Posiciones de inicio de cada fragmento (la primera es 0)
+    """
+    size = len(source_code)
+    starts = [0]
+    skips = SKIP_REGEX.finditer(source_code)
+    span_end = -1
+    for part in range(1, parts):
+        target = max(size * part // parts, starts[-1])
+        while True:
+            newline = source_code.find('\n', target)
+            if newline < 0:
+                return starts
+            # Avanzar el pre-escaneo hasta pasar el salto de línea
+            while span_end <= newline:
+                match = next(skips, None)
+                if match is None:
+                    span_end = size + 1
+                    span_start = size + 1
+                    break
+                span_start, span_end = match.span()
+            if span_start <= newline < span_end:
+                target = span_end  # El salto está dentro de un comentario o literal
+                continue
+            break
+        if newline + 1 >= size:
+            return starts
+        starts.append(newline + 1)
+    return starts
+
+def _tokenize_chunk(source_code, base, first_line, max_errors, engine):
+    """
+    Trabajador del modo paralelo: analiza un fragmento que empieza en el
+    offset `base` y en la línea `first_line` del archivo. Los tokens se
+    devuelven por columnas (tipos, valores, offsets), que se serializan
+    mucho más rápido que una lista de namedtuples.
+    """
+    lexer = Lexer(max_errors=max_errors, engine=engine)
+    tokens, errors, marks, end = lexer._scan(source_code, LineIndex(source_code, first_line), base)
+    return (tokens.types, tokens.values, tokens.offsets), errors, marks, end
+
+class StringTable:
+    """
+    Tabla de cadenas por compilación. Guarda una única copia de cada
+    identificador y literal de cadena, de modo que los tokens, el AST y las
+    tablas de símbolos comparten el mismo objeto str para cada nombre.
+    Dos nombres internados son iguales si y solo si son el mismo objeto.
+
+    El parser y el checker no comparan nombres con `is` a propósito: todas
+    sus comparaciones pasan por diccionarios (Symtab), que ya prueban la
+    identidad antes que la igualdad, así que con nombres internados no se
+    llega a comparar el contenido. Un `is` explícito además fallaría con
+    nombres que no salen del lexer (AST construidos a mano, interfaces .goxi,
+    copias de símbolos de la verificación en paralelo).
+    """
     def __init__(self):
+        # Se precargan las palabras reservadas para que los nombres de tipos
+        # ('int', 'float', ...) sean los mismos objetos que usa typesys
+        self._strings = {word: word for word in reserved}
+
+    def intern(self, value):
+        """Devuelve la copia canónica de `value`, registrándola si es nueva"""
+        return self._strings.setdefault(value, value)
+
+    def __contains__(self, value):
+        return value in self._strings
+
+    def __len__(self):
+        return len(self._strings)
+
+
+class Lexer:
+    def __init__(self, string_table=None, max_errors=None, jobs=1, engine='regex'):
+        """
+        Args:
+            string_table (StringTable, optional): Tabla de cadenas compartida
+                por la compilación. Si no se indica se crea una nueva.
+            max_errors (int, optional): Detener el análisis al llegar a este
+                número de errores léxicos
+            jobs (int): Número de procesos para analizar archivos grandes
+                por fragmentos (1 = secuencial)
+            engine (str): Motor de análisis, uno de ENGINES
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown lexer engine '{engine}' (expected one of {', '.join(ENGINES)})")
+        self.max_errors = max_errors
+        self.jobs = jobs
+        self.engine = engine
+        self.string_table = string_table if string_table is not None else StringTable()
+        self.lines = None  # LineIndex del último archivo analizado
+        self.error_spans = []  # (inicio, fin) del texto de cada error léxico
         self.token_regex = re.compile(
             '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification),
             re.DOTALL
         )
     
     def tokenize(self, source_code):
-        tokens = []
+        """
+        Convierte el código fuente en tokens.
+
+        Returns:
+            tuple: (TokenList terminada en EOF, mensajes de error). La tabla
+                de líneas del archivo queda en `self.lines` y en la lista, y
+                el span de cada error en `self.error_spans`.
+        """
+        if self.jobs > 1 and len(source_code) >= 2 * PARALLEL_MIN_CHUNK:
+            return self.tokenize_parallel(source_code)
+        self.lines = LineIndex(source_code)
+        tokens, errors, marks, end = self._scan(source_code, self.lines)
+        self.error_spans = [(start, stop) for _, start, stop in marks]
+        # Añadir token EOF al final
+        tokens.append(Token('EOF', '', end))
+        return tokens, errors
+
+    def tokenize_parallel(self, source_code):
+        """
+        Analiza el código fuente en fragmentos, cada uno en un proceso.
+
+        Los fragmentos se cortan en saltos de línea fuera de comentarios y
+        literales; cada trabajador conoce el offset y la línea donde empieza
+        su fragmento. El resultado es idéntico al de la versión secuencial.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        self.lines = lines = LineIndex(source_code)
+        parts = max(1, min(self.jobs * 2, len(source_code) // PARALLEL_MIN_CHUNK))
+        starts = split_points(source_code, parts)
+        bounds = list(zip(starts, starts[1:] + [len(source_code)]))
+        # Línea inicial de cada fragmento
+        first_lines = [1]
+        for start, stop in bounds[:-1]:
+            first_lines.append(first_lines[-1] + source_code.count('\n', start, stop))
+
+        tokens = TokenList(lines)
+        errors = []
+        spans = []
+        intern = self.string_table.intern
+        end = len(source_code)
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(_tokenize_chunk, source_code[start:stop], start,
+                                       first, self.max_errors, self.engine)
+                       for (start, stop), first in zip(bounds, first_lines)]
+            for future in futures:
+                (kinds, values, offsets), chunk_errors, marks, end = future.result()
+                count = len(tokens)
+                tokens.types.extend(kinds)
+                # Los valores vienen de otro proceso: llevarlos a esta tabla de cadenas
+                tokens.values.extend([intern(value) if kind in INTERNED else value
+                                      for kind, value in zip(kinds, values)])
+                tokens.offsets.extend(offsets)
+                if self.max_errors is not None and len(errors) + len(chunk_errors) >= self.max_errors:
+                    # Cortar donde se habría detenido el análisis secuencial
+                    kept, _, end = marks[self.max_errors - len(errors) - 1]
+                    tokens.truncate(count + kept)
+                    spans.extend(span for _, *span in marks[:self.max_errors - len(errors)])
+                    errors.extend(chunk_errors[:self.max_errors - len(errors)])
+                    break
+                spans.extend(span for _, *span in marks)
+                errors.extend(chunk_errors)
+        tokens.append(Token('EOF', '', end))
+        self.error_spans = [tuple(span) for span in spans]
+        return tokens, errors
+
+    def _scan(self, source_code, lines, base=0):
+        """Analiza `source_code` con el motor configurado (ver _scan_regex)"""
+        if self.engine == 'dispatch':
+            return self._scan_dispatch(source_code, lines, base)
+        return self._scan_regex(source_code, lines, base)
+
+    def _scan_regex(self, source_code, lines, base=0):
+        """
+        Analiza `source_code` con el motor 'regex'.
+
+        Args:
+            source_code (str): Texto a analizar
+            lines (LineIndex): Tabla de líneas de `source_code` (para los
+                mensajes de error)
+            base (int): Offset de `source_code` dentro del archivo
+
+        Returns:
+            tuple: (TokenList sin EOF, errores, [(tokens, inicio, fin)] al
+                registrar cada error, offset final)
+        """
+        # Los fragmentos del modo paralelo se asocian a la tabla del archivo al unirlos
+        tokens = TokenList(None if base else lines)
         errors = []
-        lineno = 1
+        marks = []
+        intern = self.string_table.intern
+        add_type = tokens.types.append
+        add_value = tokens.values.append
+        add_offset = tokens.offsets.append
+        match_token = self.token_regex.match
+        max_errors = self.max_errors
+        size = len(source_code)
         pos = 0
-        
-        while pos < len(source_code):
-            match = self.token_regex.match(source_code, pos)
-            if not match:
-                errors.append(f"Carácter inesperado: '{source_code[pos]}' en línea {lineno}")
+
+        while pos < size:
+            if max_errors is not None and len(errors) >= max_errors:
                 break
-            
+            match = match_token(source_code, pos)
+            start = pos
+            pos = match.end()
             kind = match.lastgroup
+            if kind == 'WHITESPACE' or kind == 'COMMENT' or kind == 'BLOCKCOMMENT':
+                continue
             value = match.group()
-            pos = match.end()
-            
-            if kind == 'NEWLINE':
-                lineno += 1
+            if kind == 'MISMATCH':
+                errors.append(f"Carácter ilegal '{value}' en línea {lines.lineno(start)}")
+                marks.append((len(tokens), base + start, base + pos))
                 continue
-            elif kind in ['WHITESPACE', 'COMMENT', 'BLOCKCOMMENT']:
-                if kind == 'BLOCKCOMMENT':
-                    lineno += value.count('\n')
+            if kind == 'ID':
+                value = intern(value)
+                if value in reserved:
+                    kind = reserved[value]
+            elif kind == 'STRING' or kind == 'CHAR':
+                value = self._decode(kind, value, lines, start, errors)
+                if value is None:
+                    marks.append((len(tokens), base + start, base + pos))
+                    continue
+            add_type(kind)
+            add_value(value)
+            add_offset(base + start)
+
+        return tokens, errors, marks, base + pos
+
+    def _scan_dispatch(self, source_code, lines, base=0):
+        """
+        Analiza `source_code` con el motor 'dispatch'. Mismos argumentos y
+        resultado que _scan_regex, y exactamente los mismos tokens y errores.
+        """
+        tokens = TokenList(None if base else lines)
+        errors = []
+        marks = []
+        intern = self.string_table.intern
+        add_type = tokens.types.append
+        add_value = tokens.values.append
+        add_offset = tokens.offsets.append
+        skip = SKIP_RUN.match
+        table = DISPATCH_TABLE
+        max_errors = self.max_errors
+        size = len(source_code)
+        pos = 0
+
+        while True:
+            if max_errors is not None and len(errors) >= max_errors:
+                break
+            # Saltar en bloque espacios, saltos de línea y comentarios
+            pos = skip(source_code, pos).end()
+            if pos >= size:
+                break
+
+            char = source_code[pos]
+            entry = table.get(char)
+            if entry.__class__ is str:
+                # Operador de un solo carácter
+                add_type(entry)
+                add_value(char)
+                add_offset(base + pos)
+                pos += 1
                 continue
-            elif kind == 'MISMATCH':
-                errors.append(f"Carácter ilegal '{value}' en línea {lineno}")
+            match = entry.match(source_code, pos) if entry is not None else None
+            if match is None:
+                errors.append(f"Carácter ilegal '{char}' en línea {lines.lineno(pos)}")
+                pos += 1
+                marks.append((len(tokens), base + pos - 1, base + pos))
                 continue
-            elif kind == 'ID' and value in reserved:
-                kind = reserved[value]
-            elif kind == 'CHAR':
-                if len(value) < 3:
-                    errors.append(f"Literal de carácter inválido {value} en línea {lineno}")
-                    continue
-                try:
-                    value = eval(value)  # Convierte escapes
-                except Exception:
-                    errors.append(f"Literal de carácter inválido {value} en línea {lineno}")
+
+            kind = match.lastgroup
+            value = match.group()
+            start = pos
+            pos = match.end()
+            if kind == 'ID':
+                value = intern(value)
+                if value in reserved:
+                    kind = reserved[value]
+            elif kind == 'STRING' or kind == 'CHAR':
+                value = self._decode(kind, value, lines, start, errors)
+                if value is None:
+                    marks.append((len(tokens), base + start, base + pos))
                     continue
-            
-            tokens.append(Token(kind, value, lineno))
-        
-        # Añadir token EOF al final
-        tokens.append(Token('EOF', '', lineno))
-        return tokens, errors
\ No newline at end of file
+            add_type(kind)
+            add_value(value)
+            add_offset(base + start)
+
+        return tokens, errors, marks, base + pos
+
+    def _decode(self, kind, literal, lines, start, errors):
+        """
+        Decodifica un literal de cadena o de carácter. Devuelve None (y
+        registra el error) si el literal no es válido.
+        """
+        try:
+            value = decode_literal(literal)
+        except ValueError as e:
+            errors.append(f"Secuencia de escape inválida {e} en línea {lines.lineno(start)}")
+            return None
+        if kind == 'STRING':
+            return self.string_table.intern(value)
+        if len(value) != 1:
+            errors.append(f"Literal de carácter inválido {literal} en línea {lines.lineno(start)}")
+            return None
+        return value
@@ -0,0 +1,466 @@
+'''
+Servidor Language Server Protocol (LSP) para goxLang sobre stdio.
+
+Mantiene los documentos abiertos en memoria y los vuelve a analizar en
+segundo plano mientras se editan, en lugar de lanzar check.py en cada
+guardado:
+
+    python lsp_server.py [--debounce 0.3] [--max-errors N] [--jobs N]
+
+- Los cambios llegan de forma incremental (solo el rango editado) y se
+  aplican sobre el texto en memoria.
+- Cada cambio reinicia un temporizador por documento; el análisis corre
+  cuando el usuario deja de escribir `debounce` segundos.
+- Un análisis cuya versión del documento ya quedó vieja se cancela entre
+  fases (compile_source con `cancelled`), y nunca publica resultados.
+- Los diagnósticos del ErrorManager se publican con
+  textDocument/publishDiagnostics; hover, ir a la definición y buscar
+  referencias usan el PositionIndex del último análisis.
+'''
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from compiler import CompilationCancelled, compile_source
+from lexer import LineIndex
+from position_index import PositionIndex
+
+# Códigos de error de JSON-RPC
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+# Sincronización incremental de documentos (TextDocumentSyncKind.Incremental)
+SYNC_INCREMENTAL = 2
+
+# DiagnosticSeverity de LSP
+SEVERITIES = {'error': 1, 'warning': 2}
+
+
+def read_message(stream):
+    """
+    Lee un mensaje JSON-RPC con cabecera Content-Length.
+
+    Args:
+        stream: Flujo binario (p. ej. sys.stdin.buffer)
+
+    Returns:
+        dict o None al llegar al final del flujo
+    """
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(stream.read(length).decode('utf-8'))
+
+
+def write_message(stream, message):
+    """Escribe `message` con cabecera Content-Length en un flujo binario"""
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    stream.write(b'Content-Length: %d\r\n\r\n' % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+class Document:
+    '''
+    Texto de un documento abierto y su tabla de líneas.
+
+    Las posiciones de LSP son (línea, carácter) desde 0, con caracteres
+    contados en unidades UTF-16 salvo que se negocie 'utf-32'.
+    '''
+    def __init__(self, uri, text, version, encoding='utf-16'):
+        self.uri = uri
+        self.version = version
+        self.encoding = encoding
+        self.closed = False
+        # Último análisis terminado: (versión, texto, tabla de líneas del
+        # texto, CheckResult, PositionIndex)
+        self.analysis = None
+        self._set_text(text)
+
+    def _set_text(self, text):
+        self.text = text
+        self.lines = LineIndex(text, first_line=0)
+
+    def _line_text(self, lines, text, line):
+        starts = lines.line_starts
+        end = starts[line + 1] if line + 1 < len(starts) else len(text)
+        return text[starts[line]:end]
+
+    def offset(self, position, lines=None, text=None):
+        """Convierte una posición LSP en offset del texto"""
+        lines = lines or self.lines
+        text = text if text is not None else self.text
+        line = position['line']
+        if line >= lines.line_count():
+            return len(text)
+        character = position['character']
+        start = lines.line_starts[line]
+        if self.encoding == 'utf-16':
+            line_text = self._line_text(lines, text, line)
+            if not line_text.isascii():
+                units = 0
+                for index, char in enumerate(line_text):
+                    if units >= character:
+                        return start + index
+                    units += 2 if ord(char) > 0xFFFF else 1
+                return start + len(line_text)
+        return min(start + character, len(text))
+
+    def position(self, offset, lines=None, text=None):
+        """Convierte un offset del texto en posición LSP"""
+        lines = lines or self.lines
+        text = text if text is not None else self.text
+        line, column = lines.position(offset)
+        character = column - 1
+        if self.encoding == 'utf-16':
+            prefix = text[lines.line_starts[line]:offset]
+            if not prefix.isascii():
+                character += sum(1 for char in prefix if ord(char) > 0xFFFF)
+        return {'line': line, 'character': character}
+
+    def apply_change(self, change):
+        """
+        Aplica un TextDocumentContentChangeEvent: reemplazo del rango
+        indicado o, sin rango, del texto completo.
+        """
+        change_range = change.get('range')
+        if change_range is None:
+            self._set_text(change['text'])
+            return
+        start = self.offset(change_range['start'])
+        end = self.offset(change_range['end'])
+        self._set_text(self.text[:start] + change['text'] + self.text[end:])
+
+
+class DocumentStore:
+    '''
+    Documentos abiertos por el cliente, indexados por URI.
+    '''
+    def __init__(self):
+        self.documents = {}
+        self.encoding = 'utf-16'
+
+    def open(self, uri, text, version):
+        document = Document(uri, text, version, self.encoding)
+        self.documents[uri] = document
+        return document
+
+    def change(self, uri, version, changes):
+        document = self.documents[uri]
+        for change in changes:
+            document.apply_change(change)
+        document.version = version
+        return document
+
+    def close(self, uri):
+        document = self.documents.pop(uri, None)
+        if document is not None:
+            document.closed = True
+        return document
+
+    def get(self, uri):
+        return self.documents.get(uri)
+
+
+class LanguageServer:
+    '''
+    Bucle principal del servidor: lee mensajes del cliente, mantiene el
+    DocumentStore y programa los análisis.
+    '''
+    def __init__(self, reader, writer, debounce=0.3, max_errors=None, jobs=1):
+        """
+        Args:
+            reader: Flujo binario de entrada (mensajes del cliente)
+            writer: Flujo binario de salida (respuestas y notificaciones)
+            debounce (float): Segundos sin cambios antes de analizar
+            max_errors (int, optional): Máximo de errores por fase
+            jobs (int): Procesos del lexer por análisis (documentos de varios MB)
+        """
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce
+        self.max_errors = max_errors
+        self.jobs = jobs
+        self.store = DocumentStore()
+        self.initialized = False
+        self.shutdown_requested = False
+        self._write_lock = threading.Lock()
+        self._timers = {}  # uri -> threading.Timer del análisis pendiente
+        # Un solo hilo de análisis: los análisis encolados de un documento que
+        # volvió a cambiar se descartan antes de empezar
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='goxlang-analysis')
+        self.handlers = {
+            'initialize': self.initialize,
+            'initialized': lambda params: None,
+            'shutdown': self.shutdown,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didClose': self.did_close,
+            'textDocument/didSave': lambda params: None,
+            'textDocument/hover': self.hover,
+            'textDocument/definition': self.definition,
+            'textDocument/references': self.references,
+            '$/cancelRequest': lambda params: None,
+            '$/setTrace': lambda params: None,
+        }
+
+    # --- Transporte ---
+
+    def send(self, message):
+        message['jsonrpc'] = '2.0'
+        with self._write_lock:
+            write_message(self.writer, message)
+
+    def notify(self, method, params):
+        self.send({'method': method, 'params': params})
+
+    def serve(self):
+        """
+        Atiende mensajes hasta recibir 'exit' o el fin de la entrada.
+
+        Returns:
+            int: Código de salida (0 si hubo 'shutdown' antes de 'exit')
+        """
+        try:
+            while True:
+                message = read_message(self.reader)
+                if message is None or message.get('method') == 'exit':
+                    break
+                self.dispatch(message)
+        finally:
+            for timer in list(self._timers.values()):
+                timer.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        return 0 if self.shutdown_requested else 1
+
+    def dispatch(self, message):
+        method = message.get('method')
+        request_id = message.get('id')
+        if method is None:
+            return  # Respuesta a una petición del servidor; no se usan
+        handler = self.handlers.get(method)
+        if request_id is None:
+            if handler is not None and (self.initialized or method == 'initialized'):
+                handler(message.get('params') or {})
+            return
+        if handler is None:
+            self.send({'id': request_id, 'error': {
+                'code': METHOD_NOT_FOUND, 'message': f"Method not found: {method}"}})
+            return
+        if not self.initialized and method != 'initialize':
+            self.send({'id': request_id, 'error': {
+                'code': SERVER_NOT_INITIALIZED, 'message': "Server not initialized"}})
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except Exception as e:
+            self.send({'id': request_id, 'error': {'code': INTERNAL_ERROR, 'message': str(e)}})
+            return
+        self.send({'id': request_id, 'result': result})
+
+    # --- Ciclo de vida ---
+
+    def initialize(self, params):
+        encodings = params.get('capabilities', {}).get('general', {}).get('positionEncodings', [])
+        if 'utf-32' in encodings:
+            self.store.encoding = 'utf-32'
+        self.initialized = True
+        return {
+            'capabilities': {
+                'positionEncoding': self.store.encoding,
+                'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL},
+                'hoverProvider': True,
+                'definitionProvider': True,
+                'referencesProvider': True,
+            },
+            'serverInfo': {'name': 'goxlang'},
+        }
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    # --- Documentos ---
+
+    def did_open(self, params):
+        item = params['textDocument']
+        self.store.open(item['uri'], item['text'], item.get('version'))
+        self.schedule(item['uri'], delay=0)
+
+    def did_change(self, params):
+        item = params['textDocument']
+        if self.store.get(item['uri']) is None:
+            return
+        self.store.change(item['uri'], item.get('version'), params['contentChanges'])
+        self.schedule(item['uri'])
+
+    def did_close(self, params):
+        uri = params['textDocument']['uri']
+        timer = self._timers.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+        self.store.close(uri)
+        self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    # --- Análisis ---
+
+    def schedule(self, uri, delay=None):
+        """Programa el análisis de `uri` tras `delay` segundos sin cambios"""
+        timer = self._timers.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(self.debounce if delay is None else delay, self._submit, (uri,))
+        timer.daemon = True
+        self._timers[uri] = timer
+        timer.start()
+
+    def _submit(self, uri):
+        document = self.store.get(uri)
+        if document is None:
+            return
+        try:
+            self._executor.submit(self.analyze, document, document.version, document.text)
+        except RuntimeError:
+            pass  # El servidor está terminando
+
+    def analyze(self, document, version, text):
+        """
+        Analiza una versión del documento y publica sus diagnósticos, salvo
+        que el documento haya cambiado o se haya cerrado entretanto.
+        """
+        def stale():
+            return document.closed or document.version != version
+
+        if stale():
+            return
+        try:
+            result = compile_source(text, max_errors=self.max_errors, jobs=self.jobs,
+                                    cancelled=stale, spans=True)
+        except CompilationCancelled:
+            return
+        index = PositionIndex(result.ast, result.symtab) if result.ast is not None else None
+        if stale():
+            return
+        lines = LineIndex(text, first_line=0)
+        document.analysis = (version, text, lines, result, index)
+        self.notify('textDocument/publishDiagnostics', {
+            'uri': document.uri,
+            'version': version,
+            'diagnostics': [self.to_lsp_diagnostic(document, lines, text, diag)
+                            for diag in result.diagnostics],
+        })
+
+    def to_lsp_diagnostic(self, document, lines, text, diag):
+        """
+        Convierte un Diagnostic del ErrorManager en un Diagnostic de LSP.
+        `lines` es la tabla (desde la línea 0) del texto analizado.
+        """
+        line = diag.lineno - 1 if diag.lineno is not None else 0
+        start = lines.offset(line, diag.columna or 1)
+        if diag.end_lineno is not None and diag.end_columna is not None:
+            end = lines.offset(diag.end_lineno - 1, diag.end_columna)
+        elif line + 1 < lines.line_count():
+            end = lines.line_starts[line + 1] - 1  # Sin span: hasta el fin de la línea
+        else:
+            end = len(text)
+        diagnostic = {
+            'range': {
+                'start': document.position(start, lines, text),
+                'end': document.position(max(start, end), lines, text),
+            },
+            'severity': SEVERITIES.get(diag.type, 1),
+            'source': 'goxlang',
+            'message': diag.message,
+        }
+        if diag.code:
+            diagnostic['code'] = diag.code
+        return diagnostic
+
+    # --- Consultas ---
+
+    def _query(self, params):
+        """
+        Devuelve (documento, índice, líneas del texto analizado, texto
+        analizado, offset del cursor) o None si no hay análisis disponible.
+        """
+        document = self.store.get(params['textDocument']['uri'])
+        if document is None or document.analysis is None:
+            return None
+        _, text, lines, _, index = document.analysis
+        if index is None:
+            return None
+        offset = document.offset(params['position'], lines, text)
+        return document, index, lines, text, offset
+
+    def _location(self, document, lines, text, node):
+        return {
+            'uri': document.uri,
+            'range': {
+                'start': document.position(node.offset, lines, text),
+                'end': document.position(node.end, lines, text),
+            },
+        }
+
+    def hover(self, params):
+        query = self._query(params)
+        if query is None:
+            return None
+        document, index, lines, text, offset = query
+        contents = index.hover(offset)
+        if contents is None:
+            return None
+        node = index.node_at(offset)
+        return {
+            'contents': {'kind': 'plaintext', 'value': contents},
+            'range': self._location(document, lines, text, node)['range'],
+        }
+
+    def definition(self, params):
+        query = self._query(params)
+        if query is None:
+            return None
+        document, index, lines, text, offset = query
+        node = index.definition(offset)
+        if node is None or getattr(node, 'offset', None) is None:
+            return None
+        return self._location(document, lines, text, node)
+
+    def references(self, params):
+        query = self._query(params)
+        if query is None:
+            return []
+        document, index, lines, text, offset = query
+        include = params.get('context', {}).get('includeDeclaration', True)
+        return [self._location(document, lines, text, node)
+                for node in index.references(offset, include_declaration=include)]
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Servidor LSP de goxLang (stdio)')
+    arg_parser.add_argument('--debounce', type=float, default=0.3,
+                            help='Segundos sin cambios antes de volver a analizar')
+    arg_parser.add_argument('--max-errors', type=int, default=None,
+                            help='Máximo de errores por fase')
+    arg_parser.add_argument('--jobs', '-j', type=int, default=1,
+                            help='Procesos para el lexer (documentos de varios MB)')
+    args = arg_parser.parse_args(argv)
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer, debounce=args.debounce,
+                            max_errors=args.max_errors, jobs=args.jobs)
+    return server.serve()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,72 +1,103 @@
-import os
-import json
 from goxLang_AST_nodes import *
-from lexer import Lexer, Token
-from gox_error_manager import ErrorManager
+from lexer import Lexer, Token, TokenList
+from gox_error_manager import ErrorManager, TooManyErrors, SYNTAX_ERROR, LEX_ERROR
+from typesys import BOOL
 
 class Parser:
-    def __init__(self, tokens=None):
-        self.lexer = Lexer()
-        self.tokens = tokens or []
+    # Tokens tras los cuales el parser vuelve a un estado confiable
+    SYNC_AFTER = ('SEMICOLON', 'RBRACE')
+    # Tokens que inician una sentencia y también sirven de sincronización
+    STATEMENT_START = ('VAR', 'CONST', 'FUNC', 'IMPORT', 'IF', 'WHILE',
+                       'RETURN', 'PRINT', 'BREAK', 'CONTINUE')
+    # Tokens que una expresión no consume al fallar: el '{' de un bloque
+    # queda para que if/while se recuperen en él
+    EXPRESSION_STOP = SYNC_AFTER + STATEMENT_START + ('LBRACE',)
+
+    def __init__(self, tokens=None, string_table=None, max_errors=None, spans=False):
+        self.lexer = Lexer(string_table)
+        if tokens is not None and not isinstance(tokens, TokenList):
+            tokens = TokenList.from_tokens(tokens)
+        self.tokens = tokens if tokens is not None else TokenList()
+        self.types = self.tokens.types  # Columna de tipos, para consultas rápidas
+        # Con spans=True cada nodo guarda también `end` (para consultas de IDE)
+        self.spans = spans
         self.current = 0
-        self.error_manager = ErrorManager()
+        self.error_manager = ErrorManager(default_code=SYNTAX_ERROR, max_errors=max_errors)
+        # Tras un error se silencian los errores en cascada hasta sincronizar
+        self.suppressing = False
+        self.suppressed = 0
+        self.error_events = 0  # Errores detectados, incluidos los silenciados
 
     def add_error(self, message, lineno=None, col=None):
         """Registra un error con información de posición"""
+        self.error_events += 1
+        if self.suppressing:
+            self.suppressed += 1
+            return
+        self.suppressing = True
         self.error_manager.add_error(message, lineno, col)
 
+    def _sync_point(self):
+        """Deja de silenciar errores al llegar a un punto de sincronización"""
+        if self.current > 0 and self.types[self.current - 1] in self.SYNC_AFTER:
+            self.suppressing = False
+        elif self.types[self.current] in self.STATEMENT_START:
+            self.suppressing = False
+
+    def synchronize(self):
+        """
+        Recuperación en modo pánico: descarta tokens hasta quedar justo
+        después de un ';' o antes de '}', de una palabra clave que inicia
+        sentencia o del fin de archivo.
+        """
+        while not self.is_at_end():
+            if self.current > 0 and self.types[self.current - 1] == 'SEMICOLON':
+                return
+            kind = self.types[self.current]
+            if kind == 'RBRACE' or kind in self.STATEMENT_START:
+                return
+            self.advance()
+
     def check_next(self, token_type):
         """Verifica el tipo del siguiente token sin consumirlo"""
-        if self.current + 1 >= len(self.tokens):
+        if self.current + 1 >= len(self.types):
             return False
-        return self.tokens[self.current + 1].type == token_type
+        return self.types[self.current + 1] == token_type
 
     def tokenize(self, source_code):
         """Convierte el código fuente en tokens"""
         tokens, lex_errors = self.lexer.tokenize(source_code)
         for err in lex_errors:
-            self.error_manager.add_error(err)
+            self.error_manager.add_error(err, code=LEX_ERROR)
         return tokens, lex_errors
 
     def parse(self):
-        """Analiza los tokens y retorna el AST o None si hay errores"""
-        # Debug: Mostrar todos los tokens
-        print("\n=== TOKEN STREAM ===")
-        for i, token in enumerate(self.tokens):
-            print(f"{i}: {token.type} '{token.value}' (line {token.lineno})")
-
+        """
+        Analiza los tokens y retorna el AST o None si hay errores.
+        No imprime ni escribe archivos: los errores quedan en error_manager.
+        """
         if not self.tokens:
             self.add_error("No hay tokens para analizar")
             return None
 
         # Asegurar token EOF
-        if self.tokens[-1].type != "EOF":
-            last_line = self.tokens[-1].lineno if self.tokens else 1
-            self.tokens.append(Token("EOF", "", last_line))
+        if self.types[-1] != "EOF":
+            self.tokens.append(Token("EOF", "", self.tokens.end(len(self.types) - 1)))
         
         self.current = 0
         
         try:
-            program_node = self.parse_program()
-            self._generate_debug_files(program_node)
-            return program_node
+            return self.parse_program()
+        except TooManyErrors:
+            return None
         except Exception as e:
-            current_token = self.peek()
-            lineno = current_token.lineno if hasattr(current_token, 'lineno') else None
-            self.add_error(f"Error durante el parsing: {str(e)}", lineno)
+            lineno = self.tokens.lineno(self.current)
+            try:
+                self.error_manager.add_error(f"Error durante el parsing: {str(e)}", lineno)
+            except TooManyErrors:
+                pass
             return None
 
-    def _generate_debug_files(self, program_node):
-        """Genera archivos JSON con el AST y errores"""
-        os.makedirs("temp", exist_ok=True)
-        if program_node:
-            with open("temp/ast_output.json", "w") as f:
-                json.dump(program_node.to_dict(), f, indent=4)
-        
-        with open("temp/error_log.txt", "w") as f:
-            for error in self.error_manager.get_all():
-                f.write(error + "\n")
-
     def parse_program(self):
         """Program ::= Statement*"""
         statements = []
@@ -74,9 +105,45 @@ class Parser:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
-        return Program(statements)
+        program = Program(statements)
+        program.lines = self.tokens.lines  # Tabla de líneas para convertir offsets
+        return program
+
+    def line(self, token):
+        """Línea de un token, calculada desde su offset (None sin tabla de líneas)"""
+        lines = self.tokens.lines
+        return lines.lineno(token.offset) if lines is not None else None
+
+    def _located(self, node, start):
+        """
+        Asigna a un nodo el offset de su primer token (el token `start`) si
+        aún no lo tiene; es el mismo objeto int de la columna de offsets. Con
+        spans=True guarda además `end`, el final del último token consumido.
+        """
+        if node is None or getattr(node, 'offset', None) is not None:
+            return node
+        node.offset = self.tokens.offsets[start]
+        if self.spans:
+            node.end = self.tokens.end(self.current - 1 if self.current > start else start)
+        return node
 
     def parse_statement(self):
+        """Analiza una sentencia y le asigna la línea de su primer token"""
+        if self.suppressing:
+            self._sync_point()
+        start = self.current
+        errors_before = self.error_events
+        stmt = self._parse_statement()
+        if self.error_events != errors_before:
+            # La sentencia tuvo errores: garantizar avance y sincronizar
+            if self.current == start:
+                self.advance()
+            self.synchronize()
+            if stmt is None:
+                stmt = ErrorNode("Invalid statement", self.tokens.offsets[start])
+        return self._located(stmt, start)
+
+    def _parse_statement(self):
         """Statement ::= PrintStmt | IfStmt | WhileStmt | ReturnStmt 
                        | VarDecl | ConstDecl | FuncDecl | ImportDecl
                        | Assignment | ExprStmt | Block | Break | Continue"""
@@ -96,17 +163,17 @@ class Parser:
             return self.parse_const_decl()
         elif self.match("WHILE"):
             return self.parse_while()
-        elif self.match("LBRACE"):
+        elif self.check("LBRACE"):
             return self.parse_block()
         elif self.match("RETURN"):
             return self.parse_return()
         elif self.match("BREAK"):
             if not self.match("SEMICOLON"):
-                self.add_error("Expected ';' after break statement", current_token.lineno)
+                self.add_error("Expected ';' after break statement", self.line(current_token))
             return Break()
         elif self.match("CONTINUE"):
             if not self.match("SEMICOLON"):
-                self.add_error("Expected ';' after continue statement", current_token.lineno)
+                self.add_error("Expected ';' after continue statement", self.line(current_token))
             return Continue()
         else:
             return self.parse_expression_statement()
@@ -121,7 +188,7 @@ class Parser:
             self.advance()  # Consume el ASSIGN
             value = self.parse_expression()
             if not self.match("SEMICOLON"):
-                self.add_error("Expected ';' after assignment", current_token.lineno)
+                self.add_error("Expected ';' after assignment", self.line(current_token))
             return Assignment(name_token.value, value)
         
         # Intenta parsear una expresión normal
@@ -133,13 +200,13 @@ class Parser:
         if isinstance(expr, Identifier) and self.match("LPAREN"):
             args = self.parse_argument_list()
             if not self.match("SEMICOLON"):
-                self.add_error("Expected ';' after function call", current_token.lineno)
+                self.add_error("Expected ';' after function call", self.line(current_token))
             return FuncCall(expr.name, args)
             
         if self.match("SEMICOLON"):
             return expr
             
-        self.add_error("Expected ';' after expression", current_token.lineno)
+        self.add_error("Expected ';' after expression", self.line(current_token))
         return expr
 
     def parse_argument_list(self):
@@ -154,7 +221,7 @@ class Parser:
                 break
                 
         if not self.match("RPAREN"):
-            self.add_error("Expected ')' after arguments", current_token.lineno)
+            self.add_error("Expected ')' after arguments", self.line(current_token))
         return args
 
     def parse_print(self):
@@ -162,17 +229,12 @@ class Parser:
         current_token = self.peek()
         expr = self.parse_expression()
         if not self.match("SEMICOLON"):
-            self.add_error("Expected ';' after print statement", current_token.lineno)
+            self.add_error("Expected ';' after print statement", self.line(current_token))
         return Print(expr)
 
     def parse_if(self):
         """IfStmt ::= 'if' Expression Block ('else' Block)?"""
-        current_token = self.peek()
         condition = self.parse_expression()
-        
-        if condition.dtype != 'bool':
-            self.add_error("Condition must be a boolean expression", current_token.lineno)
-            
         then_block = self.parse_block()
         else_block = None
         
@@ -183,23 +245,23 @@ class Parser:
 
     def parse_while(self):
         """WhileStmt ::= 'while' Expression Block"""
-        while_token = self.advance()  # Consume 'while'
+        while_token = self.previous()  # 'while' ya fue consumido por parse_statement
         
         condition = self.parse_expression()
         if not condition:
-            self.add_error("Expected condition after 'while'", while_token.lineno)
+            self.add_error("Expected condition after 'while'", self.line(while_token))
             return None
 
         # No debe haber ; después de la condición
         if self.match('SEMICOLON'):
-            self.add_error("Unexpected ';' after while condition", while_token.lineno)
+            self.add_error("Unexpected ';' after while condition", self.line(while_token))
 
         body = self.parse_block()
         if not body:
-            self.add_error("Expected block after while condition", while_token.lineno)
+            self.add_error("Expected block after while condition", self.line(while_token))
             return None
 
-        return While(condition, body, while_token.lineno)
+        return While(condition, body)
 
     def parse_return(self):
         """ReturnStmt ::= 'return' Expression? ';'"""
@@ -210,7 +272,7 @@ class Parser:
             expr = self.parse_expression()
             
         if not self.match("SEMICOLON"):
-            self.add_error("Expected ';' after return statement", current_token.lineno)
+            self.add_error("Expected ';' after return statement", self.line(current_token))
             
         return Return(expr)
 
@@ -219,7 +281,7 @@ class Parser:
         current_token = self.peek()
         
         if not self.match("FUNC"):
-            self.add_error("Expected 'func' after 'import'", current_token.lineno)
+            self.add_error("Expected 'func' after 'import'", self.line(current_token))
             return None
             
         return self._parse_func_signature(imported=True)
@@ -233,26 +295,26 @@ class Parser:
         current_token = self.peek()
         
         if not self.check("ID"):
-            self.add_error("Expected function name", current_token.lineno)
+            self.add_error("Expected function name", self.line(current_token))
             return None
             
         name = self.advance().value
 
         if not self.match("LPAREN"):
-            self.add_error("Expected '(' after function name", current_token.lineno)
+            self.add_error("Expected '(' after function name", self.line(current_token))
             return None
 
         params = self.parse_parameter_list()
 
         if not self.check("TYPE"):
-            self.add_error("Expected return type", current_token.lineno)
+            self.add_error("Expected return type", self.line(current_token))
             return None
             
         return_type = self.advance().value
 
         if imported:
             if not self.match("SEMICOLON"):
-                self.add_error("Expected ';' after imported function", current_token.lineno)
+                self.add_error("Expected ';' after imported function", self.line(current_token))
             return ImportFunctionDecl(name, params, return_type)
         else:
             body = self.parse_block()
@@ -265,13 +327,13 @@ class Parser:
         
         while not self.check("RPAREN") and not self.is_at_end():
             if not self.check("ID"):
-                self.add_error("Expected parameter name", current_token.lineno)
+                self.add_error("Expected parameter name", self.line(current_token))
                 break
                 
             param_name = self.advance().value
             
             if not self.check("TYPE"):
-                self.add_error("Expected type after parameter name", current_token.lineno)
+                self.add_error("Expected type after parameter name", self.line(current_token))
                 break
                 
             param_type = self.advance().value
@@ -281,7 +343,7 @@ class Parser:
                 break
 
         if not self.match("RPAREN"):
-            self.add_error("Expected ')' after parameters", current_token.lineno)
+            self.add_error("Expected ')' after parameters", self.line(current_token))
         
         return params
 
@@ -290,13 +352,13 @@ class Parser:
         current_token = self.peek()
         
         if not self.check("ID"):
-            self.add_error("Expected variable name", current_token.lineno)
+            self.add_error("Expected variable name", self.line(current_token))
             return None
             
         name = self.advance().value
 
         if not self.check("TYPE"):
-            self.add_error("Expected type after variable name", current_token.lineno)
+            self.add_error("Expected type after variable name", self.line(current_token))
             return None
             
         var_type = self.advance().value
@@ -306,7 +368,7 @@ class Parser:
             value = self.parse_expression()
 
         if not self.match("SEMICOLON"):
-            self.add_error("Expected ';' after variable declaration", current_token.lineno)
+            self.add_error("Expected ';' after variable declaration", self.line(current_token))
             
         return VarDecl(name, var_type, value)
 
@@ -315,28 +377,29 @@ class Parser:
         current_token = self.peek()
         
         if not self.check("ID"):
-            self.add_error("Expected constant name", current_token.lineno)
+            self.add_error("Expected constant name", self.line(current_token))
             return None
             
         name = self.advance().value
 
         if not self.match("ASSIGN"):
-            self.add_error("Expected '=' in constant declaration", current_token.lineno)
+            self.add_error("Expected '=' in constant declaration", self.line(current_token))
             return None
 
         value = self.parse_expression()
 
         if not self.match("SEMICOLON"):
-            self.add_error("Expected ';' after constant declaration", current_token.lineno)
+            self.add_error("Expected ';' after constant declaration", self.line(current_token))
             
         return ConstDecl(name, value)
 
     def parse_block(self):
         """Block ::= '{' Statement* '}'"""
+        start = self.current
         lbrace_token = self.peek()
         if not self.match('LBRACE'):
-            self.add_error(f"Expected '{{' to start block, got '{lbrace_token.type}'", lbrace_token.lineno)
-            return None
+            self.add_error(f"Expected '{{' to start block, got '{lbrace_token.type}'", self.line(lbrace_token))
+            return ErrorNode("Expected block", lbrace_token.offset)
 
         statements = []
         while not self.check('RBRACE') and not self.is_at_end():
@@ -346,10 +409,9 @@ class Parser:
 
         if not self.match('RBRACE'):
             current_token = self.peek()
-            self.add_error(f"Expected '}}' to end block, got '{current_token.type}'", current_token.lineno)
-            return None
+            self.add_error(f"Expected '}}' to end block, got '{current_token.type}'", self.line(current_token))
 
-        return Block(statements, lbrace_token.lineno)
+        return self._located(Block(statements), start)
 
     def parse_expression(self):
         """Expression ::= Equality"""
@@ -357,117 +419,127 @@ class Parser:
 
     def parse_equality(self):
         """Equality ::= Comparison (('==' | '!=') Comparison)*"""
+        start = self.current
         expr = self.parse_comparison()
         
         while self.match('EQ', 'NE'):
-            operator = self.previous().type
+            operator = self.types[self.current - 1]
             right = self.parse_comparison()
-            expr = BinaryOp(expr, operator, right)
-            expr.dtype = 'bool'
+            expr = self._located(BinaryOp(expr, operator, right), start)
+            expr.dtype = BOOL
             
         return expr
 
     def parse_comparison(self):
         """Comparison ::= Term (('<' | '>' | '<=' | '>=') Term)*"""
+        start = self.current
         expr = self.parse_term()
         
         while self.match('LT', 'GT', 'LE', 'GE'):
-            operator = self.previous().type
+            operator = self.types[self.current - 1]
             right = self.parse_term()
-            expr = BinaryOp(expr, operator, right)
-            expr.dtype = 'bool'
+            expr = self._located(BinaryOp(expr, operator, right), start)
+            expr.dtype = BOOL
             
         return expr
 
     def parse_term(self):
         """Term ::= Factor (('+' | '-') Factor)*"""
+        start = self.current
         expr = self.parse_factor()
         
         while self.match("PLUS", "MINUS"):
-            operator = self.previous().type
+            operator = self.types[self.current - 1]
             right = self.parse_factor()
-            expr = BinaryOp(expr, operator, right)
+            expr = self._located(BinaryOp(expr, operator, right), start)
             
         return expr
 
     def parse_factor(self):
         """Factor ::= Unary (('*' | '/' | '%') Unary)*"""
+        start = self.current
         expr = self.parse_unary()
         
         while self.match("TIMES", "DIVIDE", "MOD"):
-            operator = self.previous().type
+            operator = self.types[self.current - 1]
             right = self.parse_unary()
-            expr = BinaryOp(expr, operator, right)
+            expr = self._located(BinaryOp(expr, operator, right), start)
             
         return expr
 
     def parse_unary(self):
         """Unary ::= ('-' | '!') Unary | Primary"""
+        start = self.current
         if self.match("MINUS", "BANG"):
-            operator = self.previous().type
+            operator = self.types[self.current - 1]
+            zero = self._located(IntLiteral(0) if operator == "MINUS" else BoolLiteral(False), start)
             right = self.parse_unary()
-            zero = IntLiteral(0) if operator == "MINUS" else BoolLiteral(False)
-            return BinaryOp(zero, operator, right)
+            return self._located(BinaryOp(zero, operator, right), start)
             
         return self.parse_primary()
 
     def parse_primary(self):
         """Primary ::= Literal | Identifier | '(' Expression ')' 
                      | TypeCast | MemoryAccess"""
+        current_token = self.peek()
         if self.is_at_end():
-            current_token = self.peek()
-            self.add_error("Unexpected end of input", current_token.lineno)
-            return None
+            self.add_error("Unexpected end of input", self.line(current_token))
+            return ErrorNode("Unexpected end of input", current_token.offset)
 
-        current_token = self.advance()
+        # Los tokens de sincronización no se consumen para que la sentencia
+        # pueda recuperarse en ellos
+        if current_token.type in self.EXPRESSION_STOP:
+            self.add_error(f"Unexpected token in expression: {current_token.type}", self.line(current_token))
+            return ErrorNode(f"Unexpected {current_token.type}", current_token.offset)
+
+        self.advance()
         
         if current_token.type == "NUMBER":
-            return IntLiteral(int(current_token.value))
+            return self._located(IntLiteral(int(current_token.value)), self.current - 1)
         elif current_token.type == "FLOAT":
-            return FloatLiteral(float(current_token.value))
+            return self._located(FloatLiteral(float(current_token.value)), self.current - 1)
         elif current_token.type == "STRING":
-            return StringLiteral(current_token.value)
+            return self._located(StringLiteral(current_token.value), self.current - 1)
         elif current_token.type == "CHAR":
-            return CharLiteral(current_token.value)
+            return self._located(CharLiteral(current_token.value), self.current - 1)
         elif current_token.type == "TRUE":
-            return BoolLiteral(True)
+            return self._located(BoolLiteral(True), self.current - 1)
         elif current_token.type == "FALSE":
-            return BoolLiteral(False)
+            return self._located(BoolLiteral(False), self.current - 1)
         elif current_token.type == "ID":
-            return Identifier(current_token.value)
+            return self._located(Identifier(current_token.value), self.current - 1)
         elif current_token.type == "LPAREN":
             expr = self.parse_expression()
             if not self.match("RPAREN"):
-                self.add_error("Expected ')' after expression", current_token.lineno)
+                self.add_error("Expected ')' after expression", self.line(current_token))
             return expr
             
-        self.add_error(f"Unexpected token in expression: {current_token.type}", current_token.lineno)
-        return None
+        self.add_error(f"Unexpected token in expression: {current_token.type}", self.line(current_token))
+        return ErrorNode(f"Unexpected {current_token.type}", current_token.offset)
 
     # ===== Métodos de ayuda para el análisis =====
     def match(self, *types):
         """Verifica si el token actual coincide con alguno de los tipos dados"""
-        for t in types:
-            if self.check(t):
-                self.advance()
-                return True
+        kind = self.types[self.current]
+        if kind != "EOF" and kind in types:
+            self.current += 1
+            return True
         return False
 
     def check(self, token_type):
         """Verifica el tipo del token actual sin consumirlo"""
-        if self.is_at_end():
-            return False
-        return self.peek().type == token_type
+        kind = self.types[self.current]
+        return kind == token_type and kind != "EOF"
 
     def advance(self):
         """Consume el token actual y lo devuelve"""
-        if not self.is_at_end():
+        if self.types[self.current] != "EOF":
             self.current += 1
         return self.previous()
 
     def is_at_end(self):
         """Indica si se llegó al final de los tokens"""
-        return self.peek().type == "EOF"
+        return self.types[self.current] == "EOF"
 
     def peek(self):
         """Devuelve el token actual sin consumirlo"""
@@ -0,0 +1,190 @@
+'''
+Índice de posiciones sobre un AST ya verificado, para consultas de IDE.
+
+Los spans de los nodos (offset, end) están anidados o son disjuntos,
+así que se pueden aplanar en segmentos consecutivos del texto, cada uno
+con el nodo más interno que lo cubre. Una consulta es una búsqueda binaria
+sobre el inicio de los segmentos, en lugar de recorrer todo el Program:
+
+    index = PositionIndex(program, checker.current_symtab)
+    offset = index.offset_at(lineno, columna)
+    index.node_at(offset)       # nodo más interno en el cursor
+    index.scope_at(offset)      # Symtab del ámbito en el cursor
+    index.definition(offset)    # ir a la definición
+    index.hover(offset)         # tipo del símbolo o expresión
+    index.references(offset)    # buscar referencias
+
+Requiere que el parser haya asignado los spans (Parser(..., spans=True)
+o compile_source(..., spans=True)) y que el TypeChecker haya
+registrado en cada referencia (Identifier, Assignment, FuncCall) el
+símbolo al que apunta y en cada FuncDecl/Block su ámbito.
+'''
+from bisect import bisect_right
+from collections import defaultdict
+
+from goxLang_AST_nodes import walk, VarDecl, ConstDecl, FuncDecl, ImportFunctionDecl
+
+# Nodos que declaran un nombre
+DECLARATIONS = (VarDecl, ConstDecl, FuncDecl, ImportFunctionDecl)
+
+
+class SegmentIndex:
+    '''
+    Mapa de offsets al intervalo más interno que los contiene, para una
+    familia de intervalos anidados o disjuntos.
+    '''
+    def __init__(self, items):
+        """
+        Args:
+            items: Iterable de (inicio, fin, valor)
+        """
+        self.starts = []
+        self.values = []
+        stack = []  # (fin, valor) de los intervalos abiertos
+        for start, end, value in sorted(items, key=lambda item: (item[0], -item[1])):
+            while stack and stack[-1][0] <= start:
+                closed_end, _ = stack.pop()
+                self._emit(closed_end, stack[-1][1] if stack else None)
+            self._emit(start, value)
+            stack.append((end, value))
+        while stack:
+            closed_end, _ = stack.pop()
+            self._emit(closed_end, stack[-1][1] if stack else None)
+
+    def _emit(self, position, value):
+        if self.starts and self.starts[-1] == position:
+            self.values[-1] = value
+        else:
+            self.starts.append(position)
+            self.values.append(value)
+
+    def find(self, offset):
+        """Valor del intervalo más interno que contiene `offset`, o None"""
+        index = bisect_right(self.starts, offset) - 1
+        return self.values[index] if index >= 0 else None
+
+    def __len__(self):
+        return len(self.starts)
+
+
+def _span(node):
+    offset = getattr(node, 'offset', None)
+    end = getattr(node, 'end', None)
+    return None if offset is None or end is None else (offset, end)
+
+
+def _key(symbol):
+    """Identifica una declaración por tipo, nombre y posición (válido también
+    para las copias que el checker crea de los parámetros). Los parámetros
+    comparten la posición de su función, así que el tipo evita que un
+    parámetro con el nombre de la función se confunda con ella"""
+    kind = 'func' if isinstance(symbol, (FuncDecl, ImportFunctionDecl)) else 'var'
+    return (kind, symbol.name, getattr(symbol, 'offset', None))
+
+
+class PositionIndex:
+    '''
+    Consultas de posición sobre un Program verificado.
+    '''
+    def __init__(self, program, global_scope=None):
+        """
+        Args:
+            program (Program): AST con spans, ya verificado
+            global_scope (Symtab, optional): Ámbito global de la verificación
+        """
+        self.program = program
+        self.lines = getattr(program, 'lines', None)
+        self.global_scope = global_scope
+        self.declarations = {}                 # clave -> nodo de declaración
+        self.references_by_key = defaultdict(list)  # clave -> nodos que la usan
+        nodes = []
+        scopes = []
+        for node in walk(program):
+            span = _span(node)
+            if span is None:
+                continue  # Nodos sin posición (p. ej. TypeCast insertados por el checker)
+            nodes.append((*span, node))
+            scope = getattr(node, 'scope', None)
+            if scope is not None:
+                scopes.append((*span, scope))
+            if isinstance(node, DECLARATIONS):
+                self.declarations.setdefault(_key(node), node)
+            symbol = getattr(node, 'symbol', None)
+            if symbol is not None:
+                self.references_by_key[_key(symbol)].append(node)
+        self._nodes = SegmentIndex(nodes)
+        self._scopes = SegmentIndex(scopes)
+
+    def offset_at(self, lineno, column=1):
+        """Convierte (línea, columna) en offset"""
+        return self.lines.offset(lineno, column)
+
+    def position(self, node):
+        """Devuelve (línea, columna, línea final, columna final) de un nodo"""
+        start, end = _span(node)
+        return self.lines.position(start) + self.lines.position(end)
+
+    def node_at(self, offset):
+        """Nodo más interno cuyo span contiene `offset`, o None"""
+        return self._nodes.find(offset)
+
+    def scope_at(self, offset):
+        """Ámbito (Symtab) vigente en `offset`"""
+        scope = self._scopes.find(offset)
+        return scope if scope is not None else self.global_scope
+
+    def _symbol_at(self, offset):
+        node = self.node_at(offset)
+        if node is None:
+            return None, None
+        if isinstance(node, DECLARATIONS):
+            return node, node
+        return node, getattr(node, 'symbol', None)
+
+    def definition(self, offset):
+        """
+        Declaración del nombre en `offset` (ir a la definición).
+
+        Returns:
+            Nodo de declaración o None. Los parámetros se ubican en la
+            declaración de su función.
+        """
+        _, symbol = self._symbol_at(offset)
+        if symbol is None:
+            return None
+        return self.declarations.get(_key(symbol), symbol)
+
+    def hover(self, offset):
+        """
+        Texto para mostrar en `offset`: 'nombre: tipo' para símbolos o el
+        tipo de la expresión.
+        """
+        node, symbol = self._symbol_at(offset)
+        if node is None:
+            return None
+        if symbol is not None:
+            params = getattr(symbol, 'params', None)
+            if params is not None:
+                args = ', '.join(f"{name} {type_}" for name, type_ in params)
+                return f"func {symbol.name}({args}) {symbol.return_type}"
+            return f"{symbol.name}: {symbol.dtype}"
+        dtype = getattr(node, 'dtype', None)
+        return None if dtype is None else str(dtype)
+
+    def references(self, offset, include_declaration=True):
+        """
+        Nodos que usan el mismo símbolo que el nombre en `offset`.
+
+        Returns:
+            list: Referencias en orden de aparición (con la declaración al
+                principio si `include_declaration`)
+        """
+        _, symbol = self._symbol_at(offset)
+        if symbol is None:
+            return []
+        key = _key(symbol)
+        found = sorted(self.references_by_key.get(key, ()), key=lambda node: node.offset)
+        declaration = self.declarations.get(key)
+        if include_declaration and declaration is not None:
+            found.insert(0, declaration)
+        return found
@@ -0,0 +1,128 @@
+'''
+Perfilador de compilación para goxLang.
+
+Traza el parser y el TypeChecker y atribuye el tiempo de compilación a las
+construcciones del archivo fuente (por número de línea). Sirve para
+responder "¿qué parte de este .gox es cara de compilar?".
+
+Genera:
+- un resumen de las líneas más costosas (tiempo propio)
+- pilas colapsadas compatibles con flamegraph.pl / speedscope, por ejemplo:
+      check;Program;FuncDecl f L2;While L4;BinaryOp L5 1234
+  donde el número final son microsegundos de tiempo propio.
+'''
+import time
+from collections import defaultdict
+
+# Métodos del parser que se trazan: nombre -> etiqueta
+PARSER_METHODS = {
+    'parse_statement': 'stmt',
+    'parse_block': 'block',
+    'parse_expression': 'expr',
+}
+
+
+class SourceProfiler:
+    '''
+    Acumula tiempo propio por pila de construcciones y por línea fuente.
+    '''
+    def __init__(self):
+        self.stacks = defaultdict(float)  # tupla de etiquetas -> segundos propios
+        self.lines = defaultdict(float)   # línea -> segundos propios
+        self._frames = []                 # [etiqueta, línea, tiempo de hijos]
+
+    def _enter(self, label, lineno):
+        if lineno is None and self._frames:
+            lineno = self._frames[-1][1]
+        self._frames.append([label, lineno, 0.0])
+
+    def _exit(self, elapsed):
+        label, lineno, children = self._frames.pop()
+        own = elapsed - children
+        path = tuple(frame[0] for frame in self._frames) + (label,)
+        self.stacks[path] += own
+        if lineno is not None:
+            self.lines[lineno] += own
+        if self._frames:
+            self._frames[-1][2] += elapsed
+
+    def _traced(self, method, make_label):
+        perf_counter = time.perf_counter
+
+        def traced(*args):
+            label, lineno = make_label(*args)
+            self._enter(label, lineno)
+            start = perf_counter()
+            try:
+                return method(*args)
+            finally:
+                self._exit(perf_counter() - start)
+        return traced
+
+    def phase(self, name):
+        """Contexto que agrupa bajo `name` todo lo trazado en su interior"""
+        return _Phase(self, name)
+
+    def instrument_parser(self, parser):
+        """Traza las sentencias, bloques y expresiones de un Parser"""
+        for name, kind in PARSER_METHODS.items():
+            def make_label(kind=kind):
+                token = parser.peek()
+                lineno = parser.line(token)
+                return f"{kind} {token.type} L{lineno}", lineno
+            setattr(parser, name, self._traced(getattr(parser, name), make_label))
+
+    def instrument_checker(self, checker):
+        """Traza cada visitante del TypeChecker"""
+        def make_label(node, env):
+            lineno = checker.line_of(node)
+            label = node.__class__.__name__
+            name = getattr(node, 'name', None)
+            if isinstance(name, str):
+                label += f" {name}"
+            if lineno is not None:
+                label += f" L{lineno}"
+            return label, lineno
+
+        for name in dir(checker):
+            if name.startswith('visit_'):
+                setattr(checker, name, self._traced(getattr(checker, name), make_label))
+
+    def collapsed(self):
+        """Devuelve las pilas colapsadas (una por línea, peso en microsegundos)"""
+        lines = []
+        for path, seconds in sorted(self.stacks.items()):
+            micros = round(seconds * 1e6)
+            if micros:
+                lines.append(f"{';'.join(path)} {micros}")
+        return '\n'.join(lines)
+
+    def hot_lines(self, limit=10):
+        """Devuelve [(línea, segundos)] ordenado de mayor a menor costo"""
+        return sorted(self.lines.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def format_report(self, source_code, limit=10):
+        """Reporte en texto con las líneas fuente más costosas"""
+        source_lines = source_code.splitlines()
+        total = sum(self.lines.values()) or 1.0
+        report = ["=== Perfil de compilación (tiempo propio por línea) ==="]
+        for lineno, seconds in self.hot_lines(limit):
+            text = source_lines[lineno - 1].strip() if 0 < lineno <= len(source_lines) else ''
+            if len(text) > 60:
+                text = text[:57] + '...'
+            report.append(f"  línea {lineno:>6} {seconds * 1000:10.3f} ms {seconds / total:6.1%}  {text}")
+        return '\n'.join(report)
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name, None)
+        self.start = time.perf_counter()
+        return self.profiler
+
+    def __exit__(self, *exc):
+        self.profiler._exit(time.perf_counter() - self.start)
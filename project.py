@@ -0,0 +1,360 @@
+'''
+Modo proyecto: compila juntos todos los módulos goxLang de un directorio.
+
+Cada archivo .gox es un módulo; su nombre es la ruta relativa sin la
+extensión (p. ej. 'lib/math'). Un módulo exporta sus funciones de nivel
+superior, y `import func f(...) T;` se resuelve al módulo del proyecto que
+exporta `f`, lo que forma el grafo de dependencias. Los imports que ningún
+módulo exporta son funciones externas (del entorno de ejecución) y no crean
+dependencias.
+
+    result = build_project("proyecto/", jobs=4)
+    for module in result.modules.values():
+        ...
+
+Los módulos se verifican en orden topológico, por niveles: los de un mismo
+nivel no dependen entre sí y se verifican en paralelo. Cada `import func`
+se compara con la firma que exporta su módulo.
+
+La interfaz de cada módulo (ver interface.py) se guarda en la caché como
+archivo .goxi, y el índice de la caché registra el hash del fuente y el de
+las interfaces de sus dependencias. Al recompilar solo se verifican los
+módulos cuyo fuente cambió y aquellos cuyas dependencias cambiaron su
+interfaz; si un cambio no altera ninguna firma, los dependientes no se
+tocan, y los módulos sin cambios solo leen su .goxi.
+'''
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+from compiler import compile_source
+from gox_error_manager import Diagnostic, ErrorManager, format_diagnostic, TYPE_ERROR
+from interface import (INTERFACE_SUFFIX, Interface, InterfaceError, build_interface,
+                       interface_hash, read_interface, source_hash, write_interface)
+from lexer import Lexer, LineIndex
+
+SOURCE_SUFFIX = '.gox'
+CACHE_DIR = '.goxcache'
+CACHE_FILE = 'project.json'
+CACHE_VERSION = 2
+
+# Información del grafo que se obtiene de un módulo sin verificarlo:
+# imports [(nombre, offset)] y nombres de las funciones exportadas
+ModuleScan = namedtuple('ModuleScan', ['imports', 'exports'])
+
+# Resultado por módulo. `interface` es su Interface (None si no se
+# verificó) y `status` es 'checked' (verificado ahora), 'cached'
+# (tomado de la caché) o 'skipped' (no verificado por un ciclo de imports).
+ModuleResult = namedtuple('ModuleResult', ['name', 'path', 'valid', 'diagnostics',
+                                           'interface', 'dependencies', 'status'])
+
+ProjectResult = namedtuple('ProjectResult', ['valid', 'modules', 'order'])
+
+
+def discover_modules(root):
+    """
+    Busca los módulos de un proyecto.
+
+    Returns:
+        dict: {nombre del módulo: ruta del archivo}, en orden de nombre
+    """
+    modules = {}
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if not d.startswith('.'))
+        for filename in sorted(files):
+            if filename.endswith(SOURCE_SUFFIX):
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root)[:-len(SOURCE_SUFFIX)]
+                modules[name.replace(os.sep, '/')] = path
+    return modules
+
+
+def scan_module(source_code):
+    """
+    Extrae los imports y las funciones exportadas de un módulo solo con el
+    lexer (sin parser ni checker), para construir el grafo.
+
+    Returns:
+        ModuleScan
+    """
+    tokens, _ = Lexer(engine='dispatch').tokenize(source_code)
+    imports = []
+    exports = []
+    depth = 0
+    for index, token in enumerate(tokens):
+        kind = token.type
+        if kind == 'LBRACE':
+            depth += 1
+        elif kind == 'RBRACE':
+            depth = max(depth - 1, 0)
+        elif kind == 'FUNC' and depth == 0:
+            name = tokens[index + 1]
+            if name.type != 'ID':
+                continue
+            if index > 0 and tokens[index - 1].type == 'IMPORT':
+                imports.append((name.value, tokens[index - 1].offset))
+            else:
+                exports.append(name.value)
+    return ModuleScan(imports, exports)
+
+
+def check_module(name, source_code, interfaces, max_errors=None):
+    """
+    Verifica un módulo con las firmas de sus dependencias. Es una función
+    de módulo para poder ejecutarse en un ProcessPoolExecutor.
+
+    Returns:
+        tuple: (válido, diagnósticos, Interface del módulo)
+    """
+    result = compile_source(source_code, max_errors=max_errors, interfaces=interfaces)
+    digest = source_hash(source_code)
+    if result.ast is None:
+        return result.valid, result.diagnostics, Interface(name, {}, digest)
+    return result.valid, result.diagnostics, build_interface(name, result.ast, digest)
+
+
+def topological_levels(dependencies):
+    """
+    Agrupa los módulos en niveles: cada módulo queda en un nivel posterior
+    al de todas sus dependencias.
+
+    Args:
+        dependencies (dict): {módulo: conjunto de módulos de los que depende}
+
+    Returns:
+        tuple: (lista de niveles, módulos que forman parte de un ciclo o
+            dependen de uno)
+    """
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    levels = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            break
+        levels.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return levels, sorted(remaining)
+
+
+def find_cycle(dependencies, blocked, start):
+    """
+    Devuelve un ciclo de imports alcanzable desde `start`. Todo módulo
+    bloqueado depende de al menos otro módulo bloqueado.
+    """
+    path = []
+    position = {}
+    node = start
+    while node not in position:
+        position[node] = len(path)
+        path.append(node)
+        node = min(dependencies[node] & blocked)
+    return path[position[node]:] + [node]
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('modules', {})
+
+
+def save_cache(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'modules': entries}, f, ensure_ascii=False)
+
+
+def _check_modules(tasks, jobs):
+    """Verifica los módulos independientes de `tasks` con hasta `jobs` trabajadores"""
+    if jobs <= 1 or len(tasks) <= 1:
+        return [check_module(*task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    free_threaded = not getattr(sys, '_is_gil_enabled', lambda: True)()
+    executor_class = ThreadPoolExecutor if free_threaded else ProcessPoolExecutor
+    with executor_class(max_workers=min(jobs, len(tasks))) as executor:
+        return list(executor.map(check_module, *zip(*tasks)))
+
+
+def build_project(root, jobs=1, cache_dir=CACHE_DIR, max_errors=None):
+    """
+    Verifica todos los módulos de `root`, reutilizando la caché.
+
+    Args:
+        root (str): Directorio del proyecto
+        jobs (int): Trabajadores para verificar módulos independientes
+        cache_dir (str, optional): Directorio de la caché, relativo a `root`.
+            None desactiva la caché.
+        max_errors (int, optional): Máximo de errores por fase en cada módulo
+
+    Returns:
+        ProjectResult
+    """
+    paths = discover_modules(root)
+    cache_root = os.path.join(root, cache_dir) if cache_dir else None
+    cache_path = os.path.join(cache_root, CACHE_FILE) if cache_root else None
+    cache = load_cache(cache_path) if cache_path else {}
+
+    sources = {}
+    hashes = {}
+    scans = {}
+    for name, path in paths.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            sources[name] = f.read()
+        hashes[name] = source_hash(sources[name])
+        entry = cache.get(name)
+        if entry is not None and entry['source_hash'] == hashes[name]:
+            scans[name] = ModuleScan([tuple(item) for item in entry['imports']], entry['exports'])
+        else:
+            scans[name] = scan_module(sources[name])
+
+    # Resolver cada import al módulo que exporta la función
+    exporters = {}
+    for name, scan in scans.items():
+        for function in scan.exports:
+            exporters.setdefault(function, []).append(name)
+    dependencies = {}
+    graph_errors = {name: [] for name in paths}
+    for name, scan in scans.items():
+        deps = set()
+        for function, offset in scan.imports:
+            owners = [owner for owner in exporters.get(function, ()) if owner != name]
+            if len(owners) == 1:
+                deps.add(owners[0])
+            elif owners:
+                graph_errors[name].append((
+                    f"Imported function '{function}' is exported by several modules: "
+                    f"{', '.join(owners)}", offset))
+        dependencies[name] = deps
+
+    levels, blocked = topological_levels(dependencies)
+    for name in blocked:
+        cycle = find_cycle(dependencies, set(blocked), name)
+        if name in cycle:
+            message = f"Import cycle: {' -> '.join(cycle)}"
+        else:
+            message = f"Module depends on an import cycle: {' -> '.join(cycle)}"
+        graph_errors[name].append((message, None))
+
+    results = {}
+    new_cache = {}
+    export_hashes = {}   # módulo -> hash de su interfaz
+    for level in levels:
+        tasks = []
+        for name in level:
+            dep_hashes = {dep: export_hashes[dep] for dep in sorted(dependencies[name])}
+            entry = cache.get(name)
+            interface = None
+            if (entry is not None and entry['source_hash'] == hashes[name]
+                    and entry['dependencies'] == dep_hashes and not graph_errors[name]):
+                interface = _cached_interface(cache_root, name, hashes[name])
+            if interface is not None:
+                diagnostics = [Diagnostic(*diag) for diag in entry['diagnostics']]
+                results[name] = ModuleResult(name, paths[name], entry['valid'], diagnostics,
+                                             interface, dep_hashes, 'cached')
+            else:
+                visible = {}
+                for dep in dependencies[name]:
+                    visible.update(results[dep].interface.functions)
+                tasks.append((name, sources[name], visible, max_errors))
+        for (name, *_), (valid, diagnostics, interface) in zip(tasks, _check_modules(tasks, jobs)):
+            dep_hashes = {dep: export_hashes[dep] for dep in sorted(dependencies[name])}
+            diagnostics = _graph_diagnostics(sources[name], graph_errors[name]) + list(diagnostics)
+            results[name] = ModuleResult(name, paths[name], valid and not graph_errors[name],
+                                         diagnostics, interface, dep_hashes, 'checked')
+            if cache_root:
+                path = _interface_path(cache_root, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_interface(path, interface)
+        for name in level:
+            module = results[name]
+            export_hashes[name] = interface_hash(module.interface)
+            new_cache[name] = {
+                'source_hash': hashes[name],
+                'imports': scans[name].imports,
+                'exports': scans[name].exports,
+                'dependencies': module.dependencies,
+                'valid': module.valid,
+                'diagnostics': [list(diag) for diag in module.diagnostics],
+            }
+
+    # Los módulos de un ciclo no se verifican
+    for name in blocked:
+        results[name] = ModuleResult(name, paths[name], False,
+                                     _graph_diagnostics(sources[name], graph_errors[name]),
+                                     None, {}, 'skipped')
+
+    if cache_path:
+        save_cache(cache_path, new_cache)
+    order = [name for level in levels for name in level]
+    valid = all(module.valid for module in results.values())
+    return ProjectResult(valid, {name: results[name] for name in paths}, order)
+
+
+def _interface_path(cache_root, name):
+    return os.path.join(cache_root, *name.split('/')) + INTERFACE_SUFFIX
+
+
+def _cached_interface(cache_root, name, digest):
+    """Interfaz guardada de un módulo, o None si falta o quedó vieja"""
+    try:
+        interface = read_interface(_interface_path(cache_root, name))
+    except InterfaceError:
+        return None
+    return interface if interface.source_hash == digest else None
+
+
+def _graph_diagnostics(source_code, errors):
+    """Diagnósticos de resolución de imports, con la posición del import"""
+    if not errors:
+        return []
+    manager = ErrorManager(default_code=TYPE_ERROR)
+    lines = None
+    for message, offset in errors:
+        if offset is None:
+            manager.add_error(message)
+            continue
+        if lines is None:
+            lines = LineIndex(source_code)
+        lineno, columna = lines.position(offset)
+        manager.add_error(message, lineno, columna)
+    return manager.diagnostics()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog="project.py", description="Verifica todos los módulos de un proyecto goxLang")
+    arg_parser.add_argument('root', help="Directorio del proyecto")
+    arg_parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                            help="Verificar hasta N módulos independientes a la vez")
+    arg_parser.add_argument('--max-errors', type=int, metavar='N',
+                            help="Detener cada fase al llegar a N errores")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="No leer ni escribir la caché del proyecto")
+    args = arg_parser.parse_args(argv)
+
+    result = build_project(args.root, jobs=args.jobs, max_errors=args.max_errors,
+                           cache_dir=None if args.no_cache else CACHE_DIR)
+    statuses = [module.status for module in result.modules.values()]
+    for module in result.modules.values():
+        if module.diagnostics:
+            print(f"\n✗ {module.path}:")
+            for diag in module.diagnostics:
+                print(f"  - {format_diagnostic(diag)}")
+    print(f"\n{len(result.modules)} módulos, {statuses.count('checked')} verificados, "
+          f"{statuses.count('cached')} desde caché, {statuses.count('skipped')} omitidos")
+    if result.valid:
+        print("\n✓ Proyecto válido semánticamente")
+    return 0 if result.valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,567 @@
+'''
+Análisis de vida y asignación de registros para los backends de goxLang.
+
+El cuerpo de cada FuncDecl se baja a una lista lineal de instrucciones de
+tres direcciones sobre registros virtuales (uno por parámetro, uno por cada
+VarDecl/ConstDecl local y uno por cada temporal). Sobre esa lista se calcula
+qué registros están vivos en cada punto y luego un asignador linear scan
+(Poletto y Sarkar) los reparte en un banco de registros acotado:
+
+    program = compile_source(texto).ast
+    for function in lower_program(program):
+        allocation = allocate_registers(function, int_registers=8, float_registers=8)
+        allocation.registers   # {registro virtual: 'r0' | 'f0' | ...}
+        allocation.spills      # {registro virtual: ranura en memoria}
+
+- int, char, bool y string (puntero) usan los registros enteros r0, r1, ...
+  y float los registros f0, f1, ...; cada clase tiene su propio límite.
+- Los globales no se asignan: se leen y escriben en memoria con
+  load_global / store_global.
+- Si no alcanzan los registros se derrama el intervalo que termina más
+  tarde, que es el que más tiempo ocuparía el registro.
+- Se asume que las llamadas preservan los registros (callee-saved); un
+  backend con registros caller-saved debe guardar los vivos en la llamada.
+'''
+import argparse
+import sys
+from collections import namedtuple
+
+from goxLang_AST_nodes import *
+from typesys import FLOAT, VOID
+
+# Instrucción de tres direcciones. `dest` es el registro virtual escrito
+# (o None), `uses` los registros leídos y `value` el dato propio de cada op:
+#   const         dest = value (literal)
+#   move          dest = uses[0]
+#   binop         dest = uses[0] <value> uses[1]  (nombre de token: PLUS, LT, ...)
+#   not           dest = !uses[0]
+#   cast          dest = (value) uses[0]
+#   load_global   dest = global value
+#   store_global  global value = uses[0]
+#   call          dest = value(uses...)  (dest None si es void)
+#   print         print uses[0]
+#   label         etiqueta value
+#   jump          salto a value
+#   branch_false  salto a value si uses[0] es falso
+#   return        retorno de uses[0] (o sin valor)
+Instruction = namedtuple('Instruction', ['op', 'dest', 'uses', 'value'],
+                         defaults=(None, (), None))
+
+# Función bajada: `params` son los registros virtuales de los parámetros,
+# `types[v]` el tipo goxLang del registro v y `names[v]` el nombre de la
+# variable (None en los temporales).
+LoweredFunction = namedtuple('LoweredFunction',
+                             ['name', 'params', 'return_type', 'instructions', 'types', 'names'])
+
+# Intervalo de vida de un registro virtual: posiciones [start, end] de la
+# lista de instrucciones en las que está definido y vivo.
+Interval = namedtuple('Interval', ['vreg', 'start', 'end'])
+
+# Resultado de la asignación de una función
+Allocation = namedtuple('Allocation', ['function', 'registers', 'spills', 'intervals'])
+
+# Saltos: la instrucción siguiente no se ejecuta después de estas
+TERMINATORS = frozenset({'jump', 'return'})
+
+
+class RegisterAllocationError(Exception):
+    """Se lanza si la función usa algo que no se puede bajar"""
+
+
+def register_class(gox_type):
+    """Clase de registro de un tipo: 'float' o 'int'"""
+    return 'float' if gox_type is FLOAT else 'int'
+
+
+class Lowering:
+    '''
+    Visitante que baja un FuncDecl a instrucciones de tres direcciones. En
+    las sentencias `env` no se usa; las expresiones devuelven el registro
+    virtual con su valor.
+    '''
+    def __init__(self, func, global_names=()):
+        self.func = func
+        self.instructions = []
+        self.types = []
+        self.names = []
+        self.globals = set(global_names)
+        self.scopes = [{}]
+        self.loops = []   # (etiqueta de inicio, etiqueta de salida)
+        self.label_count = 0
+
+    def new_vreg(self, gox_type, name=None):
+        self.types.append(gox_type)
+        self.names.append(name)
+        return len(self.types) - 1
+
+    def new_label(self, hint):
+        self.label_count += 1
+        return f"{hint}{self.label_count}"
+
+    def emit(self, op, dest=None, uses=(), value=None):
+        self.instructions.append(Instruction(op, dest, tuple(uses), value))
+        return dest
+
+    def lower(self):
+        """
+        Baja la función completa.
+
+        Returns:
+            LoweredFunction
+        """
+        params = [self.declare(name, type_) for name, type_ in self.func.params]
+        for stmt in self.func.body.statements:
+            self.statement(stmt)
+        if not self.instructions or self.instructions[-1].op != 'return':
+            if self.func.return_type is VOID:
+                self.emit('return')
+            else:
+                # Igual que los backends: devolver 0 si el cuerpo no retorna
+                self.emit('return', uses=(self.emit('const', self.new_vreg(self.func.return_type), value=0),))
+        return LoweredFunction(self.func.name, params, self.func.return_type,
+                               self.instructions, self.types, self.names)
+
+    def declare(self, name, gox_type):
+        vreg = self.new_vreg(gox_type, name)
+        self.scopes[-1][name] = vreg
+        return vreg
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        if name in self.globals:
+            return None
+        raise RegisterAllocationError(f"Unknown variable '{name}' (was the program checked?)")
+
+    def statement(self, node):
+        node.accept(self, None)
+
+    def expr(self, node):
+        return node.accept(self, None)
+
+    def converted(self, vreg, target):
+        """Registro con el valor de `vreg` convertido al tipo `target`"""
+        source = self.types[vreg]
+        if target is None or source is target:
+            return vreg
+        return self.emit('cast', self.new_vreg(target), (vreg,), target)
+
+    def assign(self, name, value):
+        """Guarda el valor de `value` en la variable `name`"""
+        vreg = self.lookup(name)
+        if vreg is None:
+            self.emit('store_global', uses=(value,), value=name)
+        else:
+            self.emit('move', vreg, (self.converted(value, self.types[vreg]),))
+
+    # --- Sentencias ---
+
+    def visit_VarDecl(self, node, env):
+        self.declare_local(node, node.var_type)
+
+    def visit_ConstDecl(self, node, env):
+        self.declare_local(node, node.dtype)
+
+    def declare_local(self, node, gox_type):
+        if gox_type is None:
+            raise RegisterAllocationError(f"Declaration of '{node.name}' has no type (was the program checked?)")
+        # Como en el checker, el nombre ya es visible en su propio inicializador
+        vreg = self.declare(node.name, gox_type)
+        if node.value is None:
+            self.emit('const', vreg, value=0)
+        else:
+            self.emit('move', vreg, (self.converted(self.expr(node.value), gox_type),))
+
+    def visit_Assignment(self, node, env):
+        self.assign(node.name, self.expr(node.value))
+
+    def visit_Print(self, node, env):
+        self.emit('print', uses=(self.expr(node.expression),))
+
+    def visit_Block(self, node, env):
+        self.scopes.append({})
+        for stmt in node.statements:
+            self.statement(stmt)
+        self.scopes.pop()
+
+    def visit_If(self, node, env):
+        else_label = self.new_label('else')
+        end_label = self.new_label('endif')
+        self.emit('branch_false', uses=(self.expr(node.condition),), value=else_label)
+        node.then_block.accept(self, env)
+        if node.else_block:
+            self.emit('jump', value=end_label)
+            self.emit('label', value=else_label)
+            node.else_block.accept(self, env)
+            self.emit('label', value=end_label)
+        else:
+            self.emit('label', value=else_label)
+
+    def visit_While(self, node, env):
+        start_label = self.new_label('while')
+        end_label = self.new_label('endwhile')
+        self.emit('label', value=start_label)
+        self.emit('branch_false', uses=(self.expr(node.condition),), value=end_label)
+        self.loops.append((start_label, end_label))
+        node.body.accept(self, env)
+        self.loops.pop()
+        self.emit('jump', value=start_label)
+        self.emit('label', value=end_label)
+
+    def visit_Break(self, node, env):
+        self.emit('jump', value=self.loops[-1][1])
+
+    def visit_Continue(self, node, env):
+        self.emit('jump', value=self.loops[-1][0])
+
+    def visit_Return(self, node, env):
+        if node.value is None:
+            self.emit('return')
+        else:
+            value = self.converted(self.expr(node.value), self.func.return_type)
+            self.emit('return', uses=(value,))
+
+    def visit_FuncDecl(self, node, env):
+        raise RegisterAllocationError(f"Nested function '{node.name}' cannot be lowered")
+
+    def visit_ImportFunctionDecl(self, node, env):
+        raise RegisterAllocationError(f"Imported function '{node.name}' must be declared at top level")
+
+    def visit_ErrorNode(self, node, env):
+        raise RegisterAllocationError(f"Cannot lower a program with errors ({node.message})")
+
+    # --- Expresiones ---
+
+    def literal(self, node):
+        return self.emit('const', self.new_vreg(node.dtype), value=node.value)
+
+    def visit_IntLiteral(self, node, env):
+        return self.literal(node)
+
+    def visit_FloatLiteral(self, node, env):
+        return self.literal(node)
+
+    def visit_BoolLiteral(self, node, env):
+        return self.literal(node)
+
+    def visit_CharLiteral(self, node, env):
+        return self.literal(node)
+
+    def visit_StringLiteral(self, node, env):
+        return self.literal(node)
+
+    def visit_Identifier(self, node, env):
+        vreg = self.lookup(node.name)
+        if vreg is None:
+            return self.emit('load_global', self.new_vreg(node.dtype), value=node.name)
+        return vreg
+
+    def visit_TypeCast(self, node, env):
+        value = self.expr(node.expression)
+        return self.emit('cast', self.new_vreg(node.cast_type), (value,), node.cast_type)
+
+    def visit_BinaryOp(self, node, env):
+        if node.operator == 'BANG':
+            # '!x' se representa como BinaryOp(false, BANG, x)
+            return self.emit('not', self.new_vreg(node.dtype), (self.expr(node.right),))
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        return self.emit('binop', self.new_vreg(node.dtype), (left, right), node.operator)
+
+    def visit_FuncCall(self, node, env):
+        args = [self.expr(arg) for arg in node.args]
+        dest = None if node.dtype in (VOID, None) else self.new_vreg(node.dtype)
+        return self.emit('call', dest, args, node.name)
+
+    def visit_MemoryAccess(self, node, env):
+        raise RegisterAllocationError("Memory access cannot be lowered")
+
+
+def lower_function(func, global_names=()):
+    """
+    Baja un FuncDecl verificado a instrucciones de tres direcciones.
+
+    Args:
+        func (FuncDecl): Función con los tipos ya asignados por el checker
+        global_names (iterable): Nombres de las variables globales visibles
+
+    Returns:
+        LoweredFunction
+    """
+    return Lowering(func, global_names).lower()
+
+
+def lower_program(program):
+    """Baja todas las funciones de nivel superior de un Program verificado"""
+    global_names = {stmt.name for stmt in program.statements
+                    if isinstance(stmt, (VarDecl, ConstDecl))}
+    return [lower_function(stmt, global_names) for stmt in program.statements
+            if isinstance(stmt, FuncDecl)]
+
+
+def successors(instructions):
+    """Lista con las posiciones sucesoras de cada instrucción"""
+    labels = {instr.value: i for i, instr in enumerate(instructions) if instr.op == 'label'}
+    result = []
+    for i, instr in enumerate(instructions):
+        following = [i + 1] if i + 1 < len(instructions) and instr.op not in TERMINATORS else []
+        if instr.op in ('jump', 'branch_false'):
+            following.append(labels[instr.value])
+        result.append(following)
+    return result
+
+
+def liveness(function):
+    """
+    Calcula los registros vivos a la entrada y a la salida de cada
+    instrucción (análisis hacia atrás hasta llegar a punto fijo).
+
+    Los conjuntos son enteros usados como bitsets: el bit v indica que el
+    registro virtual v está vivo.
+
+    Args:
+        function (LoweredFunction): Función bajada
+
+    Returns:
+        tuple: (live_in, live_out), listas con un bitset por instrucción
+    """
+    instructions = function.instructions
+    succ = successors(instructions)
+    uses = []
+    defs = []
+    for instr in instructions:
+        mask = 0
+        for vreg in instr.uses:
+            mask |= 1 << vreg
+        uses.append(mask)
+        defs.append(0 if instr.dest is None else 1 << instr.dest)
+    live_in = [0] * len(instructions)
+    live_out = [0] * len(instructions)
+    changed = True
+    while changed:
+        changed = False
+        # En orden inverso converge en pocas pasadas (solo los bucles repiten)
+        for i in range(len(instructions) - 1, -1, -1):
+            out = 0
+            for s in succ[i]:
+                out |= live_in[s]
+            new_in = uses[i] | (out & ~defs[i])
+            if out != live_out[i] or new_in != live_in[i]:
+                live_out[i] = out
+                live_in[i] = new_in
+                changed = True
+    return live_in, live_out
+
+
+def _bits(mask):
+    """Posiciones de los bits en 1 de un bitset, en orden creciente"""
+    return [index for index, bit in enumerate(reversed(bin(mask)[2:])) if bit == '1']
+
+
+def live_intervals(function, live=None):
+    """
+    Intervalos de vida de los registros virtuales, ordenados por inicio.
+
+    Con el código en orden lineal, cada intervalo va de la primera a la
+    última posición en que el registro se define o se usa. Solo los bucles
+    lo alargan: lo que está vivo en la cabecera de un bucle sigue vivo
+    hasta su salto de vuelta. Los parámetros, y lo que está vivo al entrar
+    a la función, empiezan en la posición 0. Así basta recorrer los bitsets
+    de las cabeceras de bucle, no los de cada instrucción.
+
+    Args:
+        function (LoweredFunction): Función bajada
+        live (tuple, optional): Resultado de liveness() si ya se calculó
+
+    Returns:
+        list[Interval]
+    """
+    instructions = function.instructions
+    live_in, _ = live or liveness(function)
+    start = {}
+    end = {}
+    for vreg in list(function.params) + (_bits(live_in[0]) if instructions else []):
+        start[vreg] = end[vreg] = 0
+
+    labels = {}
+    for i, instr in enumerate(instructions):
+        if instr.op == 'label':
+            labels[instr.value] = i
+        if instr.dest is not None:
+            start.setdefault(instr.dest, i)
+            end[instr.dest] = i
+        for vreg in instr.uses:
+            start.setdefault(vreg, i)
+            end[vreg] = i
+
+    for i, instr in enumerate(instructions):
+        if instr.op not in ('jump', 'branch_false'):
+            continue
+        header = labels[instr.value]
+        if header > i:
+            continue  # Salto hacia adelante: no forma un bucle
+        for vreg in _bits(live_in[header]):
+            start[vreg] = min(start.get(vreg, header), header)
+            end[vreg] = max(end.get(vreg, i), i)
+    return sorted((Interval(vreg, start[vreg], end[vreg]) for vreg in start),
+                  key=lambda interval: (interval.start, interval.end))
+
+
+def linear_scan(intervals, register_names):
+    """
+    Asignador linear scan sobre un banco de registros.
+
+    Args:
+        intervals (list[Interval]): Intervalos ordenados por inicio
+        register_names (list[str]): Registros disponibles
+
+    Returns:
+        tuple: ({vreg: registro}, [vreg derramados])
+    """
+    free = list(reversed(register_names))
+    active = []   # Intervalos con registro, ordenados por final
+    registers = {}
+    spilled = []
+    for interval in intervals:
+        # Liberar los registros de los intervalos que ya terminaron
+        while active and active[0].end < interval.start:
+            free.append(registers[active.pop(0).vreg])
+        if free:
+            registers[interval.vreg] = free.pop()
+            _insert_by_end(active, interval)
+        elif active and active[-1].end > interval.end:
+            # Derramar el que termina más tarde y darle su registro al actual
+            victim = active.pop()
+            registers[interval.vreg] = registers.pop(victim.vreg)
+            spilled.append(victim.vreg)
+            _insert_by_end(active, interval)
+        else:
+            spilled.append(interval.vreg)
+    return registers, spilled
+
+
+def _insert_by_end(active, interval):
+    position = len(active)
+    while position and active[position - 1].end > interval.end:
+        position -= 1
+    active.insert(position, interval)
+
+
+def allocate_registers(function, int_registers=8, float_registers=8, live=None):
+    """
+    Asigna registros a todos los registros virtuales de una función.
+
+    Args:
+        function (LoweredFunction): Función bajada
+        int_registers (int): Registros enteros disponibles (r0, r1, ...)
+        float_registers (int): Registros flotantes disponibles (f0, f1, ...)
+        live (tuple, optional): Resultado de liveness() si ya se calculó
+
+    Returns:
+        Allocation: `registers` asigna a cada registro virtual un registro
+        real y `spills` a los derramados una ranura de memoria.
+    """
+    intervals = live_intervals(function, live)
+    banks = {'int': [f"r{i}" for i in range(int_registers)],
+             'float': [f"f{i}" for i in range(float_registers)]}
+    registers = {}
+    spills = {}
+    for kind, names in banks.items():
+        selected = [interval for interval in intervals
+                    if register_class(function.types[interval.vreg]) == kind]
+        assigned, spilled = linear_scan(selected, names)
+        registers.update(assigned)
+        for vreg in sorted(spilled):
+            spills[vreg] = len(spills)
+    return Allocation(function, registers, spills, intervals)
+
+
+def memory_traffic(allocation):
+    """
+    Cuenta las cargas y almacenamientos que genera una asignación.
+
+    Returns:
+        tuple: (accesos con la asignación, accesos si todas las variables
+        con nombre vivieran en memoria)
+    """
+    function = allocation.function
+    allocated = naive = 0
+    for instr in function.instructions:
+        operands = list(instr.uses) + ([instr.dest] if instr.dest is not None else [])
+        allocated += sum(1 for vreg in operands if vreg in allocation.spills)
+        naive += sum(1 for vreg in operands if function.names[vreg] is not None)
+        if instr.op in ('load_global', 'store_global'):
+            allocated += 1
+            naive += 1
+    return allocated, naive
+
+
+def format_instruction(instr, location=str):
+    """Texto de una instrucción; `location` nombra cada registro virtual"""
+    dest = f"{location(instr.dest)} = " if instr.dest is not None else ''
+    args = ', '.join(location(vreg) for vreg in instr.uses)
+    if instr.op == 'label':
+        return f"{instr.value}:"
+    if instr.op == 'const':
+        return f"    {dest}{instr.value!r}"
+    if instr.op == 'move':
+        return f"    {dest}{args}"
+    if instr.op == 'binop':
+        return f"    {dest}{location(instr.uses[0])} {instr.value} {location(instr.uses[1])}"
+    if instr.op in ('cast', 'load_global', 'store_global', 'call', 'jump', 'branch_false'):
+        target = f"{instr.value} " if instr.value is not None else ''
+        return f"    {dest}{instr.op} {target}{args}".rstrip()
+    return f"    {dest}{instr.op} {args}".rstrip()
+
+
+def format_allocation(allocation):
+    """Listado de la función con los registros asignados"""
+    function = allocation.function
+
+    def location(vreg):
+        if vreg in allocation.registers:
+            return allocation.registers[vreg]
+        return f"[spill{allocation.spills[vreg]}]"
+
+    params = ', '.join(f"{function.names[v]}:{location(v)}" for v in function.params)
+    lines = [f"func {function.name}({params})"]
+    lines.extend(format_instruction(instr, location) for instr in function.instructions)
+    allocated, naive = memory_traffic(allocation)
+    lines.append(f"    ; {len(allocation.intervals)} registros virtuales, "
+                 f"{len(allocation.spills)} derramados, "
+                 f"{allocated} accesos a memoria (sin asignación: {naive})")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from compiler import compile_source
+    from gox_error_manager import format_diagnostic
+
+    arg_parser = argparse.ArgumentParser(
+        prog="regalloc.py", description="Muestra la asignación de registros de las funciones goxLang")
+    arg_parser.add_argument('filename', help="Archivo fuente .gox")
+    arg_parser.add_argument('-r', '--registers', type=int, default=8, metavar='N',
+                            help="Registros enteros disponibles (por defecto 8)")
+    arg_parser.add_argument('-f', '--float-registers', type=int, default=8, metavar='N',
+                            help="Registros flotantes disponibles (por defecto 8)")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.filename, 'r', encoding='utf-8') as f:
+        result = compile_source(f.read())
+    if not result.valid:
+        for diag in result.diagnostics:
+            print(format_diagnostic(diag))
+        return 1
+    try:
+        functions = lower_program(result.ast)
+    except RegisterAllocationError as e:
+        print(f"Error: {e}")
+        return 1
+    for function in functions:
+        print(format_allocation(allocate_registers(function, args.registers, args.float_registers)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
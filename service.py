@@ -0,0 +1,130 @@
+'''
+Servicio asíncrono de verificación para goxLang.
+
+Permite embeber el compilador en un servidor basado en asyncio (por ejemplo
+el backend de un IDE web) que atiende a muchos usuarios a la vez:
+
+    service = CheckService(max_concurrency=4, max_pending=100)
+    result = await service.check_source(texto)
+    result = await service.check_file("programa.gox")
+
+    # O con el servicio compartido del módulo
+    result = await check_source(texto)
+
+El trabajo de CPU (lexer, parser y checker) corre en un executor para no
+bloquear el event loop, y la lectura de archivos se hace fuera del loop.
+Como mucho `max_concurrency` compilaciones corren a la vez; las demás
+esperan su turno, y si ya hay `max_pending` esperando se rechaza la
+solicitud con ServiceBusy para que el llamador pueda responder "ocupado".
+'''
+import asyncio
+
+from compiler import CheckResult, compile_source
+
+
+class ServiceBusy(Exception):
+    """Se lanza cuando hay demasiadas solicitudes esperando turno"""
+    def __init__(self, pending):
+        self.pending = pending
+        super().__init__(f"Check service busy ({pending} requests pending)")
+
+
+def _read_file(path, encoding):
+    with open(path, 'r', encoding=encoding) as f:
+        return f.read()
+
+
+class CheckService:
+    '''
+    Punto de entrada asíncrono al compilador con límite de concurrencia y
+    contrapresión.
+    '''
+    def __init__(self, max_concurrency=4, max_pending=64, executor=None, max_errors=None):
+        """
+        Args:
+            max_concurrency (int): Compilaciones que pueden correr a la vez
+            max_pending (int, optional): Solicitudes que pueden esperar
+                turno; al superarlo se lanza ServiceBusy. None = sin límite
+            executor (concurrent.futures.Executor, optional): Donde corre el
+                trabajo de CPU. Un ProcessPoolExecutor aprovecha varios
+                núcleos; por defecto se usa el executor del event loop.
+            max_errors (int, optional): Máximo de errores por fase
+        """
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.executor = executor
+        self.max_errors = max_errors
+        self.pending = 0   # Solicitudes esperando turno
+        self.running = 0   # Compilaciones en curso
+        self._semaphore = None  # Se crea dentro del event loop en uso
+
+    async def check_source(self, source_code):
+        """
+        Verifica un texto fuente.
+
+        Returns:
+            CheckResult
+
+        Raises:
+            ServiceBusy: Si ya hay `max_pending` solicitudes esperando
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.max_pending is not None and self.pending >= self.max_pending:
+            raise ServiceBusy(self.pending)
+
+        self.pending += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.pending -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, compile_source,
+                                          source_code, self.max_errors)
+        except BaseException:
+            self._finished(None)
+            raise
+        # El turno se libera cuando termina el trabajo en el executor, no
+        # cuando deja de esperarlo el llamador: si se cancela la corrutina,
+        # la compilación sigue ocupando su lugar hasta acabar.
+        future.add_done_callback(self._finished)
+        return await asyncio.shield(future)
+
+    def _finished(self, future):
+        """Libera el turno de una compilación terminada"""
+        self.running -= 1
+        self._semaphore.release()
+
+    async def check_file(self, path, encoding='utf-8'):
+        """
+        Lee `path` sin bloquear el event loop y lo verifica.
+
+        Returns:
+            CheckResult
+        """
+        source_code = await asyncio.to_thread(_read_file, path, encoding)
+        return await self.check_source(source_code)
+
+
+# Servicio compartido que usan las funciones de módulo
+_default_service = None
+
+
+def default_service():
+    """Devuelve (creándolo si hace falta) el servicio compartido del módulo"""
+    global _default_service
+    if _default_service is None:
+        _default_service = CheckService()
+    return _default_service
+
+
+async def check_source(source_code):
+    """Verifica un texto fuente con el servicio compartido"""
+    return await default_service().check_source(source_code)
+
+
+async def check_file(path, encoding='utf-8'):
+    """Lee y verifica un archivo con el servicio compartido"""
+    return await default_service().check_file(path, encoding)
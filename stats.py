@@ -0,0 +1,204 @@
+'''
+Instrumentación del compilador goxLang: temporizadores por fase y por
+visitante del TypeChecker, y contadores (tokens, nodos por clase, búsquedas
+en la tabla de símbolos, ámbitos creados).
+
+La instrumentación solo se instala cuando se pasa un objeto Stats
+habilitado; con NULL_STATS (o sin stats) el lexer, el parser y el checker
+ejecutan exactamente el mismo código que sin instrumentar.
+
+Los programas que embeben el compilador pueden suscribirse a los eventos:
+
+    def hook(event, name, value):
+        ...
+
+    stats.subscribe(hook)          # solo esta instancia
+    subscribe(hook)                # todas las instancias de Stats
+'''
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Suscriptores globales: reciben los eventos de todas las instancias de Stats
+_global_subscribers = []
+
+
+def subscribe(callback):
+    """
+    Suscribe `callback(event, name, value)` a todas las instancias de Stats.
+
+    Eventos:
+        'phase': name es la fase, value los segundos que tomó
+        'report': name es 'stats', value el diccionario de to_dict()
+    """
+    _global_subscribers.append(callback)
+
+
+def unsubscribe(callback):
+    """Elimina un suscriptor global"""
+    _global_subscribers.remove(callback)
+
+
+class Stats:
+    '''
+    Acumulador de tiempos y contadores de una compilación.
+    '''
+    enabled = True
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = Counter()
+        self.visitors = defaultdict(lambda: {'calls': 0, 'total': 0.0, 'self': 0.0})
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Suscribe `callback(event, name, value)` a los eventos de esta instancia"""
+        self._subscribers.append(callback)
+
+    def _emit(self, event, name, value):
+        for callback in self._subscribers + _global_subscribers:
+            callback(event, name, value)
+
+    @contextmanager
+    def phase(self, name):
+        """Mide el tiempo de una fase del pipeline (tokenize, parse, check...)"""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            self._emit('phase', name, elapsed)
+
+    def incr(self, name, amount=1):
+        """Incrementa un contador"""
+        self.counters[name] += amount
+
+    def count_nodes(self, ast, prefix='nodes'):
+        """Cuenta los nodos de un AST por clase"""
+        from goxLang_AST_nodes import walk
+        for node in walk(ast):
+            self.counters[f"{prefix}.{node.__class__.__name__}"] += 1
+
+    def finish(self):
+        """Notifica a los suscriptores el reporte final"""
+        self._emit('report', 'stats', self.to_dict())
+
+    def to_dict(self):
+        return {
+            'phases': dict(self.phases),
+            'counters': dict(sorted(self.counters.items())),
+            'visitors': {name: dict(data) for name, data in sorted(self.visitors.items())
+                         if data['calls']},
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=4)
+
+    def format_text(self):
+        """Devuelve el reporte en texto legible"""
+        lines = ["=== Estadísticas ==="]
+        if self.phases:
+            lines.append("Fases:")
+            for name, seconds in self.phases.items():
+                lines.append(f"  {name:<28} {seconds * 1000:10.3f} ms")
+        if self.counters:
+            lines.append("Contadores:")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:<28} {value:10d}")
+        if self.visitors:
+            lines.append("Visitantes (tiempo total / propio):")
+            ranked = sorted(self.visitors.items(), key=lambda item: item[1]['self'], reverse=True)
+            for name, data in ranked:
+                if not data['calls']:
+                    continue
+                lines.append(f"  {name:<28} {data['calls']:8d} llamadas "
+                             f"{data['total'] * 1000:10.3f} ms {data['self'] * 1000:10.3f} ms")
+        return '\n'.join(lines)
+
+
+class NullStats:
+    '''
+    Stats deshabilitado: las operaciones no hacen nada y no se instala
+    ninguna instrumentación.
+    '''
+    enabled = False
+
+    def subscribe(self, callback):
+        pass
+
+    def phase(self, name):
+        return nullcontext(self)
+
+    def incr(self, name, amount=1):
+        pass
+
+    def count_nodes(self, ast, prefix='nodes'):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_STATS = NullStats()
+
+
+def instrument_visitor(visitor, stats):
+    """
+    Reemplaza, solo en esta instancia, cada método visit_* por una versión
+    que mide tiempo total (inclusivo) y propio (excluyendo los hijos) y
+    cuenta los nodos visitados por clase.
+    """
+    stack = []
+    active = Counter()  # Evita contar dos veces el tiempo de llamadas recursivas
+    perf_counter = time.perf_counter
+
+    def wrap(name, method):
+        data = stats.visitors[name]
+        node_counter = f"check.nodes.{name[len('visit_'):]}"
+
+        def instrumented(node, env):
+            stack.append(0.0)
+            active[name] += 1
+            start = perf_counter()
+            try:
+                return method(node, env)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                active[name] -= 1
+                data['calls'] += 1
+                if not active[name]:
+                    data['total'] += elapsed
+                data['self'] += elapsed - children
+                if stack:
+                    stack[-1] += elapsed
+                stats.counters[node_counter] += 1
+        return instrumented
+
+    for name in dir(visitor):
+        if name.startswith('visit_'):
+            setattr(visitor, name, wrap(name, getattr(visitor, name)))
+
+
+def instrument_symtab(symtab_class, stats):
+    """
+    Devuelve una subclase de `symtab_class` que cuenta ámbitos creados,
+    inserciones y búsquedas.
+    """
+    class InstrumentedSymtab(symtab_class):
+        def __init__(self, name, parent=None):
+            super().__init__(name, parent)
+            stats.counters['symtab.scopes'] += 1
+
+        def add(self, name, value, lineno=None):
+            stats.counters['symtab.inserts'] += 1
+            return super().add(name, value, lineno)
+
+        def get(self, name, lineno=None):
+            stats.counters['symtab.lookups'] += 1
+            return super().get(name, lineno)
+
+    InstrumentedSymtab.__name__ = symtab_class.__name__
+    return InstrumentedSymtab
@@ -95,10 +95,11 @@ class Symtab:
         Raises:
             SymbolNotFoundError: Si el símbolo no existe en ningún ámbito
         '''
-        if name in self.entries:
-            return self.entries[name]
-        if self.parent:
-            return self.parent.get(name, lineno)
+        scope = self
+        while scope is not None:
+            if name in scope.entries:
+                return scope.entries[name]
+            scope = scope.parent
         raise self.SymbolNotFoundError(name, lineno)
         
     def get_type(self, name: str, lineno: Optional[int] = None) -> Optional[str]:
@@ -148,6 +149,22 @@ class Symtab:
             symbols.update(self.parent.get_symbols())
         symbols.update(self.entries)
         return symbols
+
+    def close(self) -> None:
+        '''
+        Cierra el ámbito al terminar de recorrerlo. En la tabla jerárquica
+        no hay nada que deshacer; existe para mantener la misma interfaz
+        que FlatSymtab.
+        '''
+        pass
+
+    def detach(self) -> None:
+        '''
+        Separa el ámbito de su padre, p. ej. para devolverlo desde un hilo
+        de la verificación en paralelo sin retener el entorno de ese hilo, o
+        para serializarlo sin arrastrar toda la cadena de padres.
+        '''
+        self.parent = None
         
     def print(self, show_all_scopes: bool = False) -> None:
         '''
@@ -184,4 +201,116 @@ class Symtab:
         return f"Symtab(name='{self.name}', entries={len(self.entries)}, children={len(self.children)})"
 
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+class FlatSymtab(Symtab):
+    '''
+    Tabla de símbolos "aplanada", intercambiable con Symtab.
+
+    Todos los ámbitos comparten un único diccionario nombre -> pila de
+    ligaduras. Cada ámbito guarda en `entries` los nombres que declaró, que
+    sirve a la vez como registro de deshacer: al cerrar el ámbito se
+    desapila una ligadura por cada nombre. Así la búsqueda y la inserción
+    son O(1) sin importar la profundidad de anidamiento, y cerrar un ámbito
+    cuesta O(1) por símbolo declarado en él.
+
+    A diferencia de Symtab, las búsquedas (get y get_symbols('all')) solo
+    son válidas desde el ámbito abierto más interno: las ligaduras de un
+    ámbito exterior incluyen las de sus hijos abiertos. Los ámbitos deben
+    cerrarse con close() en orden inverso al de creación (en un finally, para
+    que una excepción no deje ligaduras huérfanas). Ambas reglas se
+    comprueban con assert.
+    '''
+
+    def __init__(self, name: str, parent: Optional['FlatSymtab'] = None):
+        super().__init__(name, parent)
+        self._bindings: Dict[str, List[Any]] = parent._bindings if parent else {}
+        # Pila compartida de ámbitos abiertos; el tope es el más interno
+        self._open: List['FlatSymtab'] = parent._open if parent else []
+        self._open.append(self)
+        self._closed = False
+
+    def add(self, name: str, value: Any, lineno: Optional[int] = None) -> None:
+        '''
+        Agrega un nuevo símbolo al ámbito actual.
+
+        Raises:
+            SymbolDefinedError: Si el símbolo ya existe en el ámbito actual
+            SymbolConflictError: Si el símbolo existe pero con tipo diferente
+        '''
+        if name in self.entries:
+            existing = self.entries[name]
+            if hasattr(existing, 'dtype') and hasattr(value, 'dtype'):
+                if existing.dtype != value.dtype:
+                    raise self.SymbolConflictError(name, existing.dtype, value.dtype, lineno)
+            raise self.SymbolDefinedError(name, lineno)
+        self.entries[name] = value
+        stack = self._bindings.get(name)
+        if stack is None:
+            self._bindings[name] = [value]
+        else:
+            stack.append(value)
+
+    def get(self, name: str, lineno: Optional[int] = None) -> Any:
+        '''
+        Busca la ligadura visible más interna de un símbolo.
+
+        Raises:
+            SymbolNotFoundError: Si el símbolo no existe en ningún ámbito
+        '''
+        assert self._is_innermost(), f"lookup in scope '{self.name}', which is not the innermost open scope"
+        stack = self._bindings.get(name)
+        if stack:
+            return stack[-1]
+        raise self.SymbolNotFoundError(name, lineno)
+
+    def get_symbols(self, scope: str = 'all') -> Dict[str, Any]:
+        '''
+        Obtiene símbolos del ámbito actual o todos los visibles.
+
+        Args:
+            scope (str): 'current' para solo ámbito actual, 'all' para todos visibles
+
+        Returns:
+            Dict[str, Any]: Diccionario de símbolos
+        '''
+        if scope == 'current':
+            return self.entries.copy()
+        assert self._is_innermost(), f"lookup in scope '{self.name}', which is not the innermost open scope"
+        return {name: stack[-1] for name, stack in self._bindings.items()}
+
+    def _is_innermost(self) -> bool:
+        return bool(self._open) and self._open[-1] is self
+
+    def close(self) -> None:
+        '''
+        Cierra el ámbito deshaciendo sus ligaduras. Las entradas se conservan
+        en `entries` para poder imprimir el reporte completo al final.
+        '''
+        if self._closed:
+            return
+        assert self._is_innermost(), f"scope '{self.name}' closed before its inner scopes"
+        self._open.pop()
+        self._closed = True
+        for name in self.entries:
+            stack = self._bindings[name]
+            stack.pop()
+            if not stack:
+                del self._bindings[name]
+
+    def detach(self) -> None:
+        '''
+        Separa un ámbito ya cerrado de su padre y del estado compartido para
+        poder serializarlo. Cada ámbito del subárbol se queda solo con sus
+        propias entradas, así que serializarlo no arrastra las ligaduras ni
+        los ámbitos abiertos del resto del programa.
+        '''
+        assert self._closed, f"scope '{self.name}' detached while still open"
+        self.parent = None
+        stack = [self]
+        while stack:
+            scope = stack.pop()
+            scope._bindings = {name: [value] for name, value in scope.entries.items()}
+            scope._open = []
+            stack.extend(scope.children)
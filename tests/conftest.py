@@ -0,0 +1,41 @@
+'''
+Configuración de pytest: los módulos del compilador están en la raíz del
+repositorio, así que se agrega al path para importarlos desde las pruebas.
+'''
+import functools
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def compile_parallel(monkeypatch):
+    """
+    compile_source con TypeChecker(jobs=2) por el camino paralelo (en hilos),
+    aunque el intérprete tenga GIL y el programa sea pequeño. Las demás
+    llamadas a compile_source del test siguen siendo secuenciales.
+    """
+    import check
+    import compiler
+    monkeypatch.setattr(check, 'FREE_THREADED', True)
+    monkeypatch.setattr(check, 'PARALLEL_MIN_CHUNK', 1)
+    parallel = check.TypeChecker._check_program_parallel
+
+    def compile_parallel(source, **options):
+        checked = []
+
+        def spy(self, node, env, workers):
+            checked.append(node)
+            return parallel(self, node, env, workers)
+        with monkeypatch.context() as patch:
+            patch.setattr(check.TypeChecker, '_check_program_parallel', spy)
+            patch.setattr(compiler, 'TypeChecker', functools.partial(check.TypeChecker, jobs=2))
+            result = compiler.compile_source(source, **options)
+        assert checked == [result.ast]
+        return result
+    return compile_parallel
@@ -0,0 +1,44 @@
+'''
+Verificación de llamadas a funciones: número y tipo de los argumentos.
+'''
+from compiler import compile_source
+
+
+def errors(source):
+    result = compile_source(source)
+    return [(diag.lineno, diag.message) for diag in result.diagnostics]
+
+
+def test_valid_call():
+    source = "func f(a int, b float) float { return a + b; }\nf(1, 2.0);\nf(1, 2);\n"
+    assert errors(source) == []
+
+
+def test_argument_count():
+    source = "import func putchar(c int) int;\nputchar(1, 2);\nputchar();\n"
+    assert errors(source) == [
+        (2, "Function 'putchar' expects 1 arguments, got 2"),
+        (3, "Function 'putchar' expects 1 arguments, got 0"),
+    ]
+
+
+def test_argument_type():
+    source = 'func f(a int, b float) float { return a + b; }\nf(1.5, 2.0);\nf(1, "x");\n'
+    assert errors(source) == [
+        (2, "Argument 1 of 'f' must be int (parameter 'a'), got float"),
+        (3, "Argument 2 of 'f' must be float (parameter 'b'), got string"),
+    ]
+
+
+def test_call_to_variable():
+    assert errors("var x int = 1;\nx(1);\n") == [(2, "'x' is not a function")]
+
+
+def test_parallel_checker_validates_calls(compile_parallel):
+    # Los cuerpos verificados en paralelo ven las firmas de las demás funciones
+    source = ("func f(a int) int { return a; }\n"
+              "func g() int { f(1, 2); return 1; }\n")
+    diagnostics = compile_parallel(source).diagnostics
+    assert [(diag.lineno, diag.message) for diag in diagnostics] == [
+        (2, "Function 'f' expects 1 arguments, got 2")]
+    assert diagnostics == compile_source(source).diagnostics
@@ -0,0 +1,88 @@
+'''
+Archivos de interfaz (.goxi): contenido, formato y uso desde el checker.
+'''
+import json
+
+import pytest
+
+from check import TypeChecker
+from compiler import compile_source
+from interface import (INTERFACE_VERSION, InterfaceError, Signature, build_interface,
+                       dumps_interface, interface_hash, loads_interface, read_interface,
+                       source_hash, write_interface)
+from project import build_project
+
+LIB = '''const scale = 2;
+const unit = 'm';
+func area(w float, h float) float { return w * h; }
+func twice(n int) int { return n * scale; }
+'''
+
+
+def lib_interface():
+    result = compile_source(LIB)
+    return build_interface('lib', result.ast, source_hash(LIB))
+
+
+def test_build_interface():
+    interface = lib_interface()
+    assert interface.module == 'lib'
+    assert interface.source_hash == source_hash(LIB)
+    # Solo funciones: es lo único que se puede importar
+    assert interface.functions == {
+        'area': Signature('area', (('w', 'float'), ('h', 'float')), 'float', 'lib'),
+        'twice': Signature('twice', (('n', 'int'),), 'int', 'lib'),
+    }
+
+
+def test_round_trip(tmp_path):
+    interface = lib_interface()
+    path = tmp_path / 'lib.goxi'
+    write_interface(path, interface)
+    assert read_interface(path) == interface
+    assert set(json.loads(path.read_text())) == {'version', 'module', 'source_hash', 'functions'}
+
+
+@pytest.mark.parametrize('text', [
+    '', '[]', '{"version": 1, "module": "lib", "functions": []}',
+    json.dumps({'version': INTERFACE_VERSION, 'module': 'lib'}),
+    json.dumps({'version': INTERFACE_VERSION, 'module': 'lib', 'functions': [['f']]}),
+])
+def test_invalid_interface(text):
+    with pytest.raises(InterfaceError):
+        loads_interface(text)
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(InterfaceError):
+        read_interface(tmp_path / 'nada.goxi')
+
+
+def test_hash_ignores_source_and_order():
+    interface = lib_interface()
+    reordered = loads_interface(dumps_interface(interface._replace(
+        functions=dict(reversed(interface.functions.items())), source_hash='otro')))
+    assert interface_hash(reordered) == interface_hash(interface)
+
+
+def test_checker_uses_loaded_interface(tmp_path):
+    path = tmp_path / 'lib.goxi'
+    write_interface(path, lib_interface())
+    source = "import func twice(n int) int;\nimport func area(w int) int;\ntwice(2);\n"
+    result = compile_source(source)
+    checker = TypeChecker()
+    checker.load_interface(path)
+    assert not checker.check(result.ast)
+    assert [diag.message for diag in checker.error_manager.diagnostics()] == [
+        "Imported function 'area' does not match its declaration in module 'lib': "
+        "func area(w float, h float) float"]
+
+
+def test_constant_change_keeps_dependents_cached(tmp_path):
+    (tmp_path / 'lib.gox').write_text(LIB)
+    (tmp_path / 'main.gox').write_text("import func twice(n int) int;\ntwice(1);\n")
+    build_project(str(tmp_path))
+    (tmp_path / 'lib.gox').write_text(LIB.replace("const unit = 'm';", 'const unit = 2.5;'))
+    result = build_project(str(tmp_path))
+    assert {name: module.status for name, module in result.modules.items()} == {
+        'lib': 'checked', 'main': 'cached'}
@@ -0,0 +1,122 @@
+'''
+Lexer: el análisis paralelo por fragmentos y el motor de despacho por
+primer carácter deben producir exactamente los mismos tokens, errores y
+posiciones que el análisis secuencial con el motor de expresiones regulares.
+Los literales se decodifican con la tabla ESCAPES.
+'''
+import pytest
+
+import lexer
+from benchmarks.corpus import SHAPES, generate
+from lexer import ENGINES, ESCAPES, Lexer, decode_literal
+
+# Errores léxicos y construcciones multilínea repartidos por el archivo, para
+# que caigan en fragmentos distintos y cerca de los cortes
+NOISY = ''.join(
+    f"var v{i} int = {i}; @\n"
+    f"/* comentario\n   de bloque {i} */ print \"a\\tb{i}\";\n"
+    f"var c{i} char = '\\n'; print \"\\q\"; $\n"
+    f"// línea {i}\nprint {i}.5e2 + v{i};\n"
+    for i in range(200))
+
+
+def snapshot(source, **options):
+    lex = Lexer(**options)
+    tokens, errors = lex.tokenize(source)
+    return (list(tokens), errors, lex.error_spans,
+            [tokens.lineno(i) for i in range(len(tokens))],
+            [tokens.end(i) for i in range(len(tokens))])
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(lexer, 'PARALLEL_MIN_CHUNK', 1024)
+
+
+@pytest.mark.parametrize('source', [generate('mixed', size=50_000, seed=1), NOISY],
+                         ids=['mixed', 'noisy'])
+def test_parallel_matches_sequential(small_chunks, source):
+    assert snapshot(source, jobs=3) == snapshot(source)
+
+
+def test_parallel_stops_at_max_errors(small_chunks):
+    for max_errors in (1, 7, 250):
+        assert (snapshot(NOISY, jobs=3, max_errors=max_errors)
+                == snapshot(NOISY, max_errors=max_errors))
+
+
+def test_split_points_avoid_comments_and_literals():
+    source = "/* a\nb\nc\nd */\n" * 50 + 'print "x\ny";\n' * 50
+    for start in lexer.split_points(source, 8)[1:]:
+        assert source[start - 1] == '\n'
+        assert snapshot(source[:start])[1] == []
+
+
+EDGE_CASES = [
+    "",
+    "   \n\t  ",
+    "var x int=1;print x>=2&&x!=3||!true;",
+    "a<=b==c<d>e-f*g/h%i^j",
+    "1 1.5 .5 5. 3e10 2.5E-3 0x",
+    "'a' '\\n' '\\'' \"\" \"a\\\"b\" 'ab' '",
+    "/* sin cerrar",
+    "// al final",
+    "x /* a */ / y // b\n/z",
+    "@#$ `~ ? \\",
+    "variable iffy return_ while_ whiles func_ truex",
+]
+
+
+@pytest.mark.parametrize('source', EDGE_CASES + [NOISY])
+def test_dispatch_matches_regex(source):
+    assert snapshot(source, engine='dispatch') == snapshot(source, engine='regex')
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_dispatch_matches_regex_on_corpus(shape):
+    source = generate(shape, size=20_000, seed=2)
+    assert snapshot(source, engine='dispatch') == snapshot(source, engine='regex')
+
+
+def test_parallel_dispatch(small_chunks):
+    assert snapshot(NOISY, jobs=3, engine='dispatch') == snapshot(NOISY, engine='regex')
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        Lexer(engine='table')
+
+
+@pytest.mark.parametrize('literal, value', [
+    ("'a'", 'a'),
+    ('"hola mundo"', 'hola mundo'),
+    ('""', ''),
+    (r"'\n'", '\n'),
+    (r"'\''", "'"),
+    (r'"a\"b"', 'a"b'),
+    (r'"\\n"', '\\n'),
+    (r'"tab\tfin\0"', 'tab\tfin\0'),
+] + [(f"'\\{code}'", char) for code, char in ESCAPES.items()])
+def test_decode_literal(literal, value):
+    assert decode_literal(literal) == value
+
+
+@pytest.mark.parametrize('literal', [r"'\q'", r'"ok\x41"', r'"\ "'])
+def test_decode_literal_unknown_escape(literal):
+    with pytest.raises(ValueError) as info:
+        decode_literal(literal)
+    assert str(info.value) == literal[literal.index('\\'):literal.index('\\') + 2]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_literal_tokens(engine):
+    source = 'print "a\\tb"; var c char = \'\\n\'; print "\\q";'
+    lex = Lexer(engine=engine)
+    tokens, errors = lex.tokenize(source)
+    assert [(t.type, t.value) for t in tokens if t.type in ('STRING', 'CHAR')] == [
+        ('STRING', 'a\tb'), ('CHAR', '\n')]
+    assert errors == ['Secuencia de escape inválida \\q en línea 1']
+    assert [source[start:end] for start, end in lex.error_spans] == ['"\\q"']
+    # El final de un literal se busca en el texto fuente, no en el valor decodificado
+    string = next(i for i, t in enumerate(tokens) if t.type == 'STRING')
+    assert source[tokens.offsets[string]:tokens.end(string)] == '"a\\tb"'
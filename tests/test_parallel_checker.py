@@ -0,0 +1,76 @@
+'''
+Verificación en paralelo: cuándo se activa y que dé el mismo resultado que
+la secuencial (diagnósticos, ámbitos y anotaciones del AST).
+'''
+import pytest
+
+import check
+from benchmarks.corpus import generate
+from c_backend import generate_c
+from check import TypeChecker
+from compiler import compile_source
+from lexer import Lexer
+from parser import Parser
+
+ERRORS = '''var g int = 1;
+func f(a int) int { return a + h; }
+func h() float { f(1, 2); return g; }
+var h2 int = 2;
+func k() bool { var x int = 'c'; while x { break; } return 1; }
+func f(b int) int { return b; }
+'''
+
+
+def parse(source):
+    lexer = Lexer()
+    tokens, _ = lexer.tokenize(source)
+    return Parser(tokens, string_table=lexer.string_table).parse()
+
+
+def workers(source, jobs):
+    program = parse(source)
+    checker = TypeChecker(jobs=jobs)
+    checker.lines = program.lines
+    return checker._parallel_workers(program)
+
+
+def test_sequential_with_gil(monkeypatch):
+    monkeypatch.setattr(check, 'FREE_THREADED', False)
+    monkeypatch.setattr(check, 'PARALLEL_MIN_CHUNK', 1000)
+    assert workers(generate('functions', size=10_000), 4) == 1
+
+
+def test_threshold(monkeypatch):
+    monkeypatch.setattr(check, 'FREE_THREADED', True)
+    monkeypatch.setattr(check, 'PARALLEL_MIN_CHUNK', 1000)
+    assert workers(generate('functions', size=1500), 4) == 1
+    assert workers(generate('functions', size=2500), 4) == 2
+    assert workers(generate('functions', size=10_000), 4) == 4
+    assert workers(generate('functions', size=10_000), 1) == 1
+
+
+def test_compile_source_jobs_only_reach_the_lexer(monkeypatch):
+    monkeypatch.setattr(check, 'FREE_THREADED', True)
+    monkeypatch.setattr(check, 'PARALLEL_MIN_CHUNK', 1)
+    monkeypatch.setattr(TypeChecker, '_check_program_parallel', None)
+    assert compile_source(generate('functions', size=5000), jobs=4).valid
+
+
+@pytest.mark.parametrize('shape', ['functions', 'mixed'])
+def test_parallel_matches_sequential(compile_parallel, shape):
+    source = generate(shape, size=20_000, seed=5)
+    sequential = compile_source(source)
+    parallel = compile_parallel(source)
+    assert parallel.valid and sequential.valid
+    # El código C depende de los tipos y conversiones que anota el checker
+    assert generate_c(parallel.ast) == generate_c(sequential.ast)
+    assert ([(scope.name, list(scope.entries)) for scope in parallel.symtab.children]
+            == [(scope.name, list(scope.entries)) for scope in sequential.symtab.children])
+    assert all(scope.parent is parallel.symtab for scope in parallel.symtab.children)
+
+
+@pytest.mark.parametrize('max_errors', [None, 1, 3])
+def test_parallel_diagnostics(compile_parallel, max_errors):
+    parallel = compile_parallel(ERRORS, max_errors=max_errors).diagnostics
+    assert parallel == compile_source(ERRORS, max_errors=max_errors).diagnostics
+    assert parallel
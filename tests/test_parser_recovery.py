@@ -0,0 +1,50 @@
+'''
+Recuperación de errores del parser: los errores de sintaxis no deben
+arrastrar errores en cascada ni cambiar el ámbito de las sentencias que
+siguen.
+'''
+from compiler import compile_source
+from goxLang_AST_nodes import Block, ErrorNode, If, While
+
+
+def messages(result):
+    return [(diag.lineno, diag.message) for diag in result.diagnostics]
+
+
+def test_missing_semicolon_reports_once():
+    result = compile_source("var a int = 1\nvar b int = 2;\nprint a + b;\n")
+    assert not result.valid
+    assert messages(result) == [(1, "Expected ';' after variable declaration")]
+
+
+def test_recovers_at_next_statement():
+    result = compile_source("var a int = ;\nprint 1;\nprint c;\n")
+    lines = [lineno for lineno, _ in messages(result)]
+    assert lines[0] == 1
+    # El error semántico de la línea 3 se sigue detectando
+    assert (3, "Symbol 'c' not found") in messages(result)
+
+
+def test_incomplete_condition_keeps_block():
+    # '{' no se consume como token inesperado: el bloque del if sigue
+    # siendo el suyo y no aparece un '}' sobrante
+    source = "var a int = 1;\nif a < {\n  var b int = 2;\n  print b;\n}\nprint b;\n"
+    result = compile_source(source)
+    assert messages(result) == [
+        (2, "Unexpected token in expression: LBRACE"),
+        (6, "Symbol 'b' not found"),
+    ]
+    statement = result.ast.statements[1]
+    assert isinstance(statement, If)
+    assert isinstance(statement.condition.right, ErrorNode)
+    assert isinstance(statement.then_block, Block)
+    assert len(statement.then_block.statements) == 2
+
+
+def test_while_without_condition_keeps_block():
+    result = compile_source("var a int = 1;\nwhile {\n  print a;\n}\nprint a;\n")
+    assert messages(result) == [(2, "Unexpected token in expression: LBRACE")]
+    loop = result.ast.statements[1]
+    assert isinstance(loop, While)
+    assert isinstance(loop.body, Block)
+    assert len(result.ast.statements) == 3
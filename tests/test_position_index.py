@@ -0,0 +1,95 @@
+'''
+Consultas de PositionIndex: nodo, ámbito, definición, hover y referencias.
+'''
+import pytest
+
+from compiler import compile_source
+from position_index import PositionIndex
+
+SOURCE = '''var x int = 1;
+func f(y int) int {
+    var z int = y + x;
+    if z > 2 {
+        var x float = 2.5;
+        print x;
+    }
+    return z * 2;
+}
+f(x);
+'''
+
+
+def build(source, compile_program=compile_source):
+    result = compile_program(source, spans=True)
+    assert result.valid, result.diagnostics
+    return PositionIndex(result.ast, result.symtab)
+
+
+def at(source, text, skip=0):
+    return source.index(text) + skip
+
+
+@pytest.fixture(params=['sequential', 'parallel'])
+def compile_program(request):
+    if request.param == 'parallel':
+        return request.getfixturevalue('compile_parallel')
+    return compile_source
+
+
+@pytest.fixture
+def index(compile_program):
+    return build(SOURCE, compile_program)
+
+
+def positions(index, nodes):
+    return [index.position(node)[:2] for node in nodes]
+
+
+def test_offset_at(index):
+    assert index.offset_at(3, 5) == at(SOURCE, 'var z')
+    assert index.position(index.node_at(at(SOURCE, '2.5')))[:2] == (5, 23)
+
+
+def test_global_reference(index):
+    offset = at(SOURCE, 'y + x', skip=4)
+    assert index.hover(offset) == 'x: int'
+    assert index.position(index.definition(offset))[:2] == (1, 1)
+    assert positions(index, index.references(offset)) == [(1, 1), (3, 21), (10, 3)]
+
+
+def test_shadowed_local(index):
+    offset = at(SOURCE, 'print x', skip=6)
+    assert index.hover(offset) == 'x: float'
+    assert positions(index, index.references(offset)) == [(5, 9), (6, 15)]
+    assert positions(index, index.references(offset, include_declaration=False)) == [(6, 15)]
+
+
+def test_function_and_parameter(index):
+    call = at(SOURCE, 'f(x)')
+    assert index.hover(call) == 'func f(y int) int'
+    assert positions(index, index.references(call)) == [(2, 1), (10, 1)]
+    # Los parámetros se ubican en la declaración de su función
+    param = at(SOURCE, 'y + x')
+    assert index.hover(param) == 'y: int'
+    assert index.position(index.definition(param))[:2] == (2, 1)
+    assert positions(index, index.references(param)) == [(3, 17)]
+
+
+def test_expression_hover_and_scope(index):
+    literal = at(SOURCE, '2.5')
+    assert index.hover(literal) == 'float'
+    assert index.definition(literal) is None
+    assert index.references(literal) == []
+    assert 'x' in index.scope_at(literal).entries
+    assert index.scope_at(at(SOURCE, 'f(x)')) is index.global_scope
+
+
+def test_parameter_named_like_function(compile_program):
+    source = "func a(a int) int { return a; }\na(2);\n"
+    index = build(source, compile_program)
+    use = at(source, 'return a', skip=7)
+    assert index.hover(use) == 'a: int'
+    assert positions(index, index.references(use)) == [(1, 28)]
+    call = at(source, 'a(2)')
+    assert index.hover(call) == 'func a(a int) int'
+    assert positions(index, index.references(call)) == [(1, 1), (2, 1)]
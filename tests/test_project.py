@@ -0,0 +1,125 @@
+'''
+Modo proyecto: grafo de imports, ciclos e invalidación de la caché.
+'''
+import os
+
+from project import build_project, main
+
+
+def write(root, name, source):
+    path = root / f"{name}.gox"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+
+
+def statuses(result):
+    return {name: module.status for name, module in result.modules.items()}
+
+
+def messages(result, name):
+    return [(diag.lineno, diag.message) for diag in result.modules[name].diagnostics]
+
+
+def make_project(root):
+    write(root, 'lib/math', "func square(x int) int { return x * x; }\n")
+    write(root, 'lib/text', "func shout(c char) int { return 1; }\n")
+    write(root, 'main', "import func square(x int) int;\nimport func putchar(c int) int;\n"
+                        "square(3);\n")
+    write(root, 'app', "import func square(x int) int;\nimport func shout(c char) int;\n"
+                       "shout('a');\n")
+
+
+def test_levels_and_dependencies(tmp_path):
+    make_project(tmp_path)
+    result = build_project(str(tmp_path))
+    assert result.valid
+    assert result.order == ['lib/math', 'lib/text', 'app', 'main']
+    # putchar no lo exporta ningún módulo: es externa y no crea dependencias
+    assert list(result.modules['main'].dependencies) == ['lib/math']
+    assert list(result.modules['app'].dependencies) == ['lib/math', 'lib/text']
+    assert set(statuses(result).values()) == {'checked'}
+
+
+def test_unchanged_project_comes_from_cache(tmp_path):
+    make_project(tmp_path)
+    first = build_project(str(tmp_path))
+    second = build_project(str(tmp_path))
+    assert set(statuses(second).values()) == {'cached'}
+    assert second.modules == {name: module._replace(status='cached')
+                              for name, module in first.modules.items()}
+
+
+def test_body_change_keeps_dependents_cached(tmp_path):
+    make_project(tmp_path)
+    build_project(str(tmp_path))
+    write(tmp_path, 'lib/math', "func square(x int) int { var y int = x; return y * x; }\n")
+    assert statuses(build_project(str(tmp_path))) == {
+        'app': 'cached', 'lib/math': 'checked', 'lib/text': 'cached', 'main': 'cached'}
+
+
+def test_signature_change_rechecks_dependents(tmp_path):
+    make_project(tmp_path)
+    build_project(str(tmp_path))
+    write(tmp_path, 'lib/math', "func square(x float) float { return x * x; }\n")
+    result = build_project(str(tmp_path))
+    assert statuses(result) == {
+        'app': 'checked', 'lib/math': 'checked', 'lib/text': 'cached', 'main': 'checked'}
+    assert not result.valid
+    assert messages(result, 'main') == [
+        (1, "Imported function 'square' does not match its declaration in module "
+            "'lib/math': func square(x float) float")]
+    # Volver a la firma original invalida de nuevo a los dependientes
+    write(tmp_path, 'lib/math', "func square(x int) int { return x * x; }\n")
+    result = build_project(str(tmp_path))
+    assert result.valid
+    assert statuses(result)['main'] == 'checked'
+
+
+def test_missing_interface_file_is_rebuilt(tmp_path):
+    make_project(tmp_path)
+    build_project(str(tmp_path))
+    os.remove(tmp_path / '.goxcache' / 'lib' / 'math.goxi')
+    assert statuses(build_project(str(tmp_path)))['lib/math'] == 'checked'
+
+
+def test_no_cache(tmp_path):
+    make_project(tmp_path)
+    build_project(str(tmp_path), cache_dir=None)
+    assert not (tmp_path / '.goxcache').exists()
+    assert set(statuses(build_project(str(tmp_path), cache_dir=None)).values()) == {'checked'}
+
+
+def test_import_cycle(tmp_path):
+    write(tmp_path, 'a', "import func fb() int;\nfunc fa() int { return 1; }\n")
+    write(tmp_path, 'b', "import func fa() int;\nfunc fb() int { return 2; }\n")
+    write(tmp_path, 'c', "import func fa() int;\nfunc fc() int { return 3; }\n")
+    write(tmp_path, 'd', "func fd() int { return 4; }\n")
+    for status in ('checked', 'cached'):  # La segunda vez con la caché ya escrita
+        result = build_project(str(tmp_path))
+        assert not result.valid
+        assert result.order == ['d']
+        assert statuses(result) == {'a': 'skipped', 'b': 'skipped', 'c': 'skipped',
+                                    'd': status}
+        assert messages(result, 'a') == [(None, "Import cycle: a -> b -> a")]
+        assert messages(result, 'b') == [(None, "Import cycle: b -> a -> b")]
+        assert messages(result, 'c') == [
+            (None, "Module depends on an import cycle: a -> b -> a")]
+
+
+def test_ambiguous_import(tmp_path):
+    write(tmp_path, 'x', "func f() int { return 1; }\n")
+    write(tmp_path, 'y', "func f() int { return 2; }\n")
+    write(tmp_path, 'z', "var n int = 0;\nimport func f() int;\n")
+    result = build_project(str(tmp_path))
+    assert not result.valid
+    assert messages(result, 'z') == [
+        (2, "Imported function 'f' is exported by several modules: x, y")]
+    assert result.modules['z'].dependencies == {}
+
+
+def test_main_exit_code(tmp_path, capsys):
+    make_project(tmp_path)
+    assert main([str(tmp_path), '--no-cache']) == 0
+    write(tmp_path, 'bad', "print y;\n")
+    assert main([str(tmp_path), '--no-cache']) == 1
+    assert 'bad.gox' in capsys.readouterr().out
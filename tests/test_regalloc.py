@@ -0,0 +1,106 @@
+'''
+Asignación de registros: ningún par de registros virtuales vivos a la vez
+comparte registro, con cualquier tamaño de banco.
+'''
+import random
+
+import pytest
+
+from compiler import compile_source
+from regalloc import allocate_registers, liveness, live_intervals, lower_program
+
+
+def random_program(rng):
+    """Programa aleatorio con bucles e if anidados (solo enteros)"""
+    lines = ["func main() int {"]
+    counter = [0]
+
+    def expr(names, depth=0):
+        if not names or depth > 1 or rng.random() < 0.4:
+            return rng.choice(names) if names and rng.random() < 0.7 else str(rng.randint(0, 9))
+        return f"({expr(names, depth + 1)} {rng.choice('+-*')} {expr(names, depth + 1)})"
+
+    def block(names, depth, indent):
+        names = list(names)
+        variables = [name for name in names if name.startswith('v')]
+        for _ in range(rng.randint(1, 5)):
+            choice = rng.random()
+            if choice < 0.35:
+                counter[0] += 1
+                name = f"v{counter[0]}"
+                lines.append(f"{indent}var {name} int = {expr(names)};")
+                names.append(name)
+                variables.append(name)
+            elif choice < 0.55 and variables:
+                lines.append(f"{indent}{rng.choice(variables)} = {expr(names)};")
+            elif choice < 0.65 and names:
+                lines.append(f"{indent}print {expr(names)};")
+            elif choice < 0.8 and depth < 3:
+                counter[0] += 1
+                loop = f"i{counter[0]}"
+                lines.append(f"{indent}var {loop} int = 0;")
+                lines.append(f"{indent}while {loop} < {rng.randint(1, 3)} {{")
+                block(names + [loop], depth + 1, indent + "  ")
+                lines.append(f"{indent}  {loop} = {loop} + 1;")
+                lines.append(f"{indent}}}")
+            elif depth < 3 and names:
+                lines.append(f"{indent}if {expr(names)} < {expr(names)} {{")
+                block(names, depth + 1, indent + "  ")
+                lines.append(f"{indent}}}")
+        return names
+
+    names = block([], 0, "  ")
+    lines.append(f"  return {expr(names)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def reference_intervals(function, live):
+    """Intervalos por definición: toda posición donde el registro está vivo"""
+    live_in, live_out = live
+    positions = {vreg: [0] for vreg in function.params}
+    for i, instr in enumerate(function.instructions):
+        touched = set(instr.uses)
+        if instr.dest is not None:
+            touched.add(instr.dest)
+        mask = live_in[i] | live_out[i]
+        touched.update(vreg for vreg in range(mask.bit_length()) if mask >> vreg & 1)
+        for vreg in touched:
+            positions.setdefault(vreg, []).append(i)
+    return {vreg: (min(found), max(found)) for vreg, found in positions.items()}
+
+
+def lowered(seed):
+    result = compile_source(random_program(random.Random(seed)))
+    assert result.valid, result.diagnostics
+    return lower_program(result.ast)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_intervals_cover_liveness(seed):
+    for function in lowered(seed):
+        live = liveness(function)
+        intervals = {iv.vreg: (iv.start, iv.end) for iv in live_intervals(function, live)}
+        assert intervals == reference_intervals(function, live)
+
+
+@pytest.mark.parametrize('seed', range(40))
+@pytest.mark.parametrize('registers', [1, 2, 3, 8])
+def test_no_interference(seed, registers):
+    for function in lowered(seed):
+        live = liveness(function)
+        allocation = allocate_registers(function, registers, registers, live=live)
+        vregs = {interval.vreg for interval in allocation.intervals}
+        assert set(allocation.registers) | set(allocation.spills) == vregs
+        assert not set(allocation.registers) & set(allocation.spills)
+        live_in, live_out = live
+        for i, instr in enumerate(function.instructions):
+            mask = live_out[i]
+            alive = {vreg for vreg in range(mask.bit_length()) if mask >> vreg & 1}
+            if instr.dest is not None:
+                alive.add(instr.dest)
+            used = {}
+            for vreg in alive:
+                register = allocation.registers.get(vreg)
+                if register is not None:
+                    assert used.setdefault(register, vreg) == vreg, (i, register)
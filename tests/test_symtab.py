@@ -0,0 +1,124 @@
+'''
+FlatSymtab frente a Symtab: el checker debe dar los mismos resultados con
+cualquiera de las dos tablas de símbolos.
+'''
+import pickle
+
+import pytest
+
+from benchmarks.corpus import generate
+from compiler import compile_source
+from symtab import Symtab, FlatSymtab
+
+SCOPES = '''
+var x int = 1;
+func f(x float) float {
+    var y float = x * 2.0;
+    if y > 1.0 {
+        var x bool = true;
+        var z int = 3;
+        print x;
+    } else {
+        var z char = 'a';
+        print z;
+    }
+    while y < 10.0 {
+        var w float = y;
+        y = w + 1.0;
+        {
+            var y int = 4;
+            print y;
+        }
+    }
+    return y;
+}
+print x;
+print f(1.5);
+'''
+
+ERRORS = '''
+var x int = 1;
+func f(a int) int {
+    if a > 0 {
+        var a float = 2.0;
+        var b int = a;
+    }
+    print b;
+    while a < 3 {
+        var x char = 'c';
+        x = 1;
+    }
+    var a int = 2;
+    return x + missing;
+}
+var x int = 2;
+print a;
+break;
+'''
+
+
+def scope_tree(scope):
+    return (scope.name, list(scope.entries), [scope_tree(child) for child in scope.children])
+
+
+def check(source, symtab_class, compile_program=compile_source):
+    result = compile_program(source, symtab_class=symtab_class)
+    return result.diagnostics, scope_tree(result.symtab)
+
+
+@pytest.mark.parametrize('source', [
+    SCOPES,
+    ERRORS,
+    generate('mixed', size=20_000, seed=3),
+    generate('functions', size=5_000, seed=4),
+], ids=['scopes', 'errors', 'mixed', 'functions'])
+def test_flat_matches_nested(source):
+    assert check(source, FlatSymtab) == check(source, Symtab)
+
+
+def test_errors_program_reports_diagnostics():
+    diagnostics, _ = check(ERRORS, FlatSymtab)
+    assert len(diagnostics) >= 4
+
+
+def test_flat_matches_nested_in_parallel(compile_parallel):
+    assert check(ERRORS, FlatSymtab, compile_parallel) == check(ERRORS, Symtab)
+
+
+def test_lookup_only_from_innermost_scope():
+    outer = FlatSymtab("global")
+    outer.add("x", 1)
+    inner = FlatSymtab("block", parent=outer)
+    inner.add("x", 2)
+    assert inner.get("x") == 2
+    with pytest.raises(AssertionError):
+        outer.get("x")
+    inner.close()
+    assert outer.get("x") == 1
+    with pytest.raises(AssertionError):
+        inner.get("x")
+
+
+def test_close_in_order():
+    outer = FlatSymtab("global")
+    middle = FlatSymtab("func", parent=outer)
+    FlatSymtab("block", parent=middle)
+    with pytest.raises(AssertionError):
+        middle.close()
+
+
+def test_detach_keeps_only_own_entries():
+    env = FlatSymtab("global")
+    for i in range(1000):
+        env.add(f"g{i}", "x" * 100)
+    func = FlatSymtab("func", parent=env)
+    func.add("a", 1)
+    block = FlatSymtab("block", parent=func)
+    block.add("b", 2)
+    block.close()
+    func.close()
+    func.detach()
+    assert func.parent is None
+    assert func._bindings == {"a": [1]}
+    assert block._bindings == {"b": [2]}
+    assert len(pickle.dumps(func)) < 1000
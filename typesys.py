@@ -7,7 +7,6 @@ Implementa las reglas de tipos para el lenguaje, incluyendo:
 - Conversiones de tipos implícitas
 '''
 
-from dataclasses import dataclass
 from typing import Dict, Tuple, Optional
 from gox_error_manager import ErrorManager
 
@@ -24,6 +23,90 @@ BASIC_TYPES = {
 # Jerarquía de tipos para conversiones implícitas
 TYPE_HIERARCHY = ['bool', 'char', 'int', 'float']
 
+class GoxType(str):
+    '''
+    Tipo del lenguaje. Cada tipo es un objeto único (singleton), de modo que
+    las comparaciones pueden hacerse por identidad (`dtype is INT`).
+
+    Hereda de str para seguir siendo compatible con el código y las tablas
+    que usan nombres de tipo: GoxType('int') == 'int', tiene el mismo hash y
+    se serializa a JSON como "int". Tamaño, signo, rango en la jerarquía y
+    el conjunto de tipos desde los que se puede asignar se precalculan.
+    '''
+    def __new__(cls, name, size=None, signed=None):
+        obj = super().__new__(cls, name)
+        obj.name = name
+        obj.size = size
+        obj.signed = signed
+        obj.rank = TYPE_HIERARCHY.index(name) if name in TYPE_HIERARCHY else None
+        obj.id = None
+        obj.assignable_from = frozenset()
+        return obj
+
+    def __reduce__(self):
+        # Al deserializar (p. ej. en otro proceso) se recupera el singleton
+        return (get_type, (self.name,))
+
+class PointerType(GoxType):
+    '''Tipo compuesto: puntero a `base` (usado por MemoryAccess)'''
+    def __new__(cls, base):
+        obj = super().__new__(cls, f"*{base}", BASIC_TYPES['int']['size'], False)
+        obj.base = base
+        return obj
+
+    def __reduce__(self):
+        return (pointer_to, (self.base,))
+
+# Registro de singletons por nombre
+TYPES: Dict[str, GoxType] = {
+    name: GoxType(name, info['size'], info['signed'])
+    for name, info in BASIC_TYPES.items()
+}
+for _id, _type in enumerate(TYPES.values()):
+    _type.id = _id
+    if _type.rank is not None:
+        _type.assignable_from = frozenset(
+            other for other in TYPES.values()
+            if other.rank is not None and other.rank <= _type.rank)
+
+INT = TYPES['int']
+FLOAT = TYPES['float']
+CHAR = TYPES['char']
+BOOL = TYPES['bool']
+STRING = TYPES['string']
+VOID = TYPES['void']
+# Tipo de las expresiones que no se pudieron resolver (no es un tipo válido)
+UNKNOWN = GoxType('unknown')
+
+_POINTER_TYPES: Dict[str, PointerType] = {}
+
+def get_type(name: str) -> Optional[GoxType]:
+    """Devuelve el singleton de un tipo por nombre, o None si no existe"""
+    if name == 'unknown':
+        return UNKNOWN
+    if name.startswith('*'):
+        # Los punteros se registran por su tipo base ('*int' -> int)
+        base = get_type(name[1:])
+        return None if base is None else pointer_to(base)
+    return TYPES.get(name)
+
+def as_type(value):
+    """
+    Normaliza un nombre de tipo a su singleton. Los valores que no son tipos
+    conocidos (None, nombres inválidos) se devuelven sin cambios.
+    """
+    if value is None or value.__class__ is not str:
+        return value
+    return TYPES.get(value, value)
+
+def pointer_to(base: GoxType) -> PointerType:
+    """Devuelve el tipo puntero (único) a `base`"""
+    base = as_type(base)
+    pointer = _POINTER_TYPES.get(base)
+    if pointer is None:
+        pointer = _POINTER_TYPES[base] = PointerType(base)
+    return pointer
+
 # Mapeo de operadores a sus representaciones internas
 OPERATOR_MAP = {
     '+': 'PLUS',
@@ -39,7 +122,11 @@ OPERATOR_MAP = {
     '<=': 'LE',
     '>=': 'GE',
     '&&': 'AND',
-    '||': 'OR'
+    '||': 'OR',
+    # Nombres de token que produce el parser
+    'DIVIDE': 'SLASH',
+    'EQ': 'EQUAL',
+    'NE': 'NOTEQUAL'
 }
 
 # Tabla de operaciones binarias válidas
@@ -111,11 +198,8 @@ UNARY_OP_TABLE = {
     ('NOT', 'bool'): 'bool',
 }
 
-@dataclass
-class TypeInfo:
-    name: str
-    size: int
-    signed: bool = False
+# Compatibilidad: la información de tipo ahora vive en el propio singleton
+TypeInfo = GoxType
 
 def is_valid_type(type_name: str) -> bool:
     """Verifica si un tipo es válido en el lenguaje"""
@@ -125,6 +209,65 @@ def map_operator(op: str) -> str:
     """Mapea operadores a sus representaciones internas"""
     return OPERATOR_MAP.get(op, op)
 
+def _resolve_binop(left_type: str, normalized_op: str,
+                   right_type: str) -> Optional[Tuple[GoxType, Optional[GoxType], Optional[GoxType]]]:
+    """
+    Resuelve una operación binaria aplicando la promoción implícita.
+
+    Returns:
+        (tipo resultante, cast izquierdo, cast derecho) o None si no es válida.
+        Los casts son el tipo al que hay que convertir cada operando, o None.
+    """
+    result_type = BIN_OP_TABLE.get((left_type, normalized_op, right_type))
+    promoted_type = None
+    left, right = TYPES[left_type], TYPES[right_type]
+    if left is not right and left.rank is not None and right.rank is not None:
+        promoted_type = left if left.rank > right.rank else right
+        if result_type is None:
+            result_type = BIN_OP_TABLE.get((promoted_type, normalized_op, promoted_type))
+
+    if result_type is None:
+        return None
+    left_cast = promoted_type if promoted_type and left is not promoted_type else None
+    right_cast = promoted_type if promoted_type and right is not promoted_type else None
+    return (TYPES[result_type], left_cast, right_cast)
+
+# Identificadores densos de tipos y operadores para la matriz de operaciones
+TYPE_IDS = {name: type_.id for name, type_ in TYPES.items()}
+_OP_NAMES = sorted({op for _, op, _ in BIN_OP_TABLE} | set(OPERATOR_MAP.values()))
+OP_IDS = {name: i for i, name in enumerate(_OP_NAMES)}
+OP_IDS.update({op: OP_IDS[name] for op, name in OPERATOR_MAP.items()})
+
+# Matriz densa [tipo izq][operador][tipo der] -> (resultado, cast izq, cast der)
+# con la promoción ya resuelta. Se indexa como
+# BINOP_MATRIX[(left_id * len(_OP_NAMES) + op_id) * len(TYPE_IDS) + right_id]
+BINOP_MATRIX = [
+    _resolve_binop(left, op, right)
+    for left in TYPE_IDS
+    for op in _OP_NAMES
+    for right in TYPE_IDS
+]
+
+def lookup_binop(op: str, left_type: str,
+                 right_type: str) -> Optional[Tuple[GoxType, Optional[GoxType], Optional[GoxType]]]:
+    """
+    Consulta la matriz precalculada de operaciones binarias.
+
+    Args:
+        op: Operador (símbolo, nombre interno o nombre de token)
+        left_type: Tipo del operando izquierdo
+        right_type: Tipo del operando derecho
+
+    Returns:
+        (tipo resultante, cast izquierdo, cast derecho) o None si no es válida
+    """
+    op_id = OP_IDS.get(op)
+    left_id = TYPE_IDS.get(left_type)
+    right_id = TYPE_IDS.get(right_type)
+    if op_id is None or left_id is None or right_id is None:
+        return None
+    return BINOP_MATRIX[(left_id * len(_OP_NAMES) + op_id) * len(TYPE_IDS) + right_id]
+
 def check_binop(op: str, left_type: str, right_type: str, 
                error_manager: ErrorManager = None, lineno: int = None) -> Optional[str]:
     """Verifica si una operación binaria es válida entre dos tipos.
@@ -139,9 +282,6 @@ def check_binop(op: str, left_type: str, right_type: str,
     Returns:
         El tipo resultante de la operación o None si no es válida
     """
-    # Normalizar el operador
-    normalized_op = map_operator(op)
-    
     # Verificar tipos básicos
     if not is_valid_type(left_type) or not is_valid_type(right_type):
         if error_manager:
@@ -150,18 +290,9 @@ def check_binop(op: str, left_type: str, right_type: str,
                 lineno)
         return None
     
-    # Buscar operación exacta
-    result_type = BIN_OP_TABLE.get((left_type, normalized_op, right_type))
-    
-    # Si no se encuentra, intentar con conversión implícita
-    if result_type is None and left_type != right_type:
-        try:
-            left_rank = TYPE_HIERARCHY.index(left_type)
-            right_rank = TYPE_HIERARCHY.index(right_type)
-            promoted_type = left_type if left_rank > right_rank else right_type
-            result_type = BIN_OP_TABLE.get((promoted_type, normalized_op, promoted_type))
-        except ValueError:
-            pass
+    # Buscar la operación (con promoción implícita ya resuelta)
+    entry = lookup_binop(op, left_type, right_type)
+    result_type = entry[0] if entry else None
     
     if result_type is None and error_manager:
         error_manager.add_error(
@@ -189,7 +320,7 @@ def check_unaryop(op: str, operand_type: str, error_manager: ErrorManager = None
             error_manager.add_error(f"Invalid type in unary operation: {op}{operand_type}")
         return None
     
-    result_type = UNARY_OP_TABLE.get((normalized_op, operand_type))
+    result_type = as_type(UNARY_OP_TABLE.get((normalized_op, operand_type)))
     
     if result_type is None and error_manager:
         error_manager.add_error(f"Invalid unary operation: {op}{operand_type}")
@@ -218,14 +349,9 @@ def can_assign(target_type: str, source_type: str, error_manager: ErrorManager =
             error_manager.add_error(f"Invalid types in assignment: {target_type} = {source_type}")
         return False
     
-    # Chequear jerarquía de tipos
-    try:
-        target_rank = TYPE_HIERARCHY.index(target_type)
-        source_rank = TYPE_HIERARCHY.index(source_type)
-        return target_rank >= source_rank
-    except ValueError:
-        # Uno de los tipos no está en la jerarquía (bool, string, etc.)
-        return False
+    # Chequear jerarquía de tipos (precalculada en cada singleton). Los tipos
+    # fuera de la jerarquía (string, void) no aceptan conversiones.
+    return TYPES[source_type] in TYPES[target_type].assignable_from
 
 def get_type_info(type_name: str) -> Optional[TypeInfo]:
     """
@@ -235,9 +361,6 @@ def get_type_info(type_name: str) -> Optional[TypeInfo]:
         type_name: Nombre del tipo a consultar
         
     Returns:
-        TypeInfo con los detalles o None si el tipo no existe
+        El singleton del tipo (con name, size y signed) o None si no existe
     """
-    if type_name in BASIC_TYPES:
-        info = BASIC_TYPES[type_name]
-        return TypeInfo(name=type_name, size=info['size'], signed=info['signed'])
-    return None
\ No newline at end of file
+    return TYPES.get(type_name)
\ No newline at end of file
@@ -0,0 +1,702 @@
+'''
+Backend WebAssembly de goxLang.
+
+Genera un módulo .wasm binario directamente desde un Program verificado,
+sin pasar por el formato de texto:
+
+    program = compile_source(texto).ast
+    with open("programa.wasm", "wb") as f:
+        write_wasm(program, f)
+
+- Cada FuncDecl es una función exportada con su nombre y cada `import func`
+  un import del módulo "env". int, char y bool se representan como i32 y
+  float como f64; las cadenas son punteros i32 a texto terminado en cero
+  en la memoria exportada "memory".
+- Las sentencias de nivel superior forman la función exportada "_start",
+  que al final llama a `func main()` si existe y devuelve su resultado.
+  Los globales son globales mutables de Wasm.
+- `print` llama a funciones del entorno: env.print_int(i32),
+  env.print_float(f64), env.print_char(i32), env.print_bool(i32) y
+  env.print_string(i32). Solo se importan las que el programa usa.
+
+El módulo se escribe sección por sección en el flujo de salida. Si el flujo
+permite seek, el tamaño de cada sección se reserva como LEB128 de 5 bytes
+y se completa al cerrarla; si no, cada sección se arma en un buffer.
+'''
+import argparse
+import io
+import os
+import struct
+import sys
+from contextlib import contextmanager
+
+from goxLang_AST_nodes import *
+from typesys import INT, FLOAT, CHAR, BOOL, STRING, VOID
+
+MAGIC = b'\x00asm'
+VERSION = b'\x01\x00\x00\x00'
+
+# Identificadores de sección
+SECTION_TYPE = 1
+SECTION_IMPORT = 2
+SECTION_FUNCTION = 3
+SECTION_MEMORY = 5
+SECTION_GLOBAL = 6
+SECTION_EXPORT = 7
+SECTION_CODE = 10
+SECTION_DATA = 11
+
+# Tipos de valor y de bloque
+I32 = 0x7F
+F64 = 0x7C
+FUNC_TYPE = 0x60
+EMPTY_BLOCK = 0x40
+
+# Tipos de export/import
+EXTERNAL_FUNC = 0x00
+EXTERNAL_MEMORY = 0x02
+
+# Instrucciones
+OP_UNREACHABLE = 0x00
+OP_BLOCK = 0x02
+OP_LOOP = 0x03
+OP_IF = 0x04
+OP_ELSE = 0x05
+OP_END = 0x0B
+OP_BR = 0x0C
+OP_BR_IF = 0x0D
+OP_RETURN = 0x0F
+OP_CALL = 0x10
+OP_DROP = 0x1A
+OP_LOCAL_GET = 0x20
+OP_LOCAL_SET = 0x21
+OP_GLOBAL_GET = 0x23
+OP_GLOBAL_SET = 0x24
+OP_I32_CONST = 0x41
+OP_F64_CONST = 0x44
+OP_I32_EQZ = 0x45
+OP_I32_NE = 0x47
+OP_I32_AND = 0x71
+OP_I32_OR = 0x72
+OP_F64_CONVERT_I32_S = 0xB7
+OP_PREFIX_FC = 0xFC
+FC_I32_TRUNC_SAT_F64_S = 0x02
+
+# Operaciones binarias por tipo de operando: nombre de token -> opcode
+I32_OPS = {
+    'PLUS': 0x6A, 'MINUS': 0x6B, 'TIMES': 0x6C, 'DIVIDE': 0x6D, 'MOD': 0x6F,
+    'EQ': 0x46, 'NE': 0x47, 'LT': 0x48, 'GT': 0x4A, 'LE': 0x4C, 'GE': 0x4E,
+    'AND': OP_I32_AND, 'OR': OP_I32_OR,
+}
+# char no tiene signo: comparaciones sin signo
+CHAR_OPS = dict(I32_OPS, LT=0x49, GT=0x4B, LE=0x4D, GE=0x4F)
+F64_OPS = {
+    'PLUS': 0xA0, 'MINUS': 0xA1, 'TIMES': 0xA2, 'DIVIDE': 0xA3,
+    'EQ': 0x61, 'NE': 0x62, 'LT': 0x63, 'GT': 0x64, 'LE': 0x65, 'GE': 0x66,
+}
+
+# Funciones del entorno para `print`, por tipo del valor
+PRINT_IMPORTS = {INT: 'print_int', FLOAT: 'print_float', CHAR: 'print_char',
+                 BOOL: 'print_bool', STRING: 'print_string'}
+
+# Dirección del primer literal de cadena (0 queda como puntero nulo)
+DATA_BASE = 16
+PAGE_SIZE = 65536
+
+# Nodos de expresión que pueden aparecer como sentencia
+EXPRESSIONS = (IntLiteral, FloatLiteral, BoolLiteral, CharLiteral, StringLiteral,
+               Identifier, TypeCast, BinaryOp, FuncCall, MemoryAccess)
+
+
+class WasmBackendError(Exception):
+    """Se lanza si el programa usa algo que el backend no sabe traducir"""
+
+
+def uleb128(value):
+    """Codifica un entero sin signo en LEB128"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def sleb128(value):
+    """Codifica un entero con signo en LEB128"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if (value == 0 and not byte & 0x40) or (value == -1 and byte & 0x40):
+            out.append(byte)
+            return bytes(out)
+        out.append(byte | 0x80)
+
+
+def padded_uleb128(value, width=5):
+    """LEB128 de ancho fijo (válido en Wasm), para completar tamaños después"""
+    out = bytearray()
+    for _ in range(width - 1):
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value & 0x7F)
+    return bytes(out)
+
+
+def wasm_type(gox_type):
+    """Tipo de valor de Wasm para un tipo de goxLang"""
+    if gox_type is FLOAT:
+        return F64
+    if gox_type in (INT, CHAR, BOOL, STRING):
+        return I32
+    raise WasmBackendError(f"Type '{gox_type}' is not supported by the Wasm backend")
+
+
+def _wrap_i32(value):
+    """Valor de un literal int en 32 bits con signo (como int32_t en C)"""
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value >= 1 << 31 else value
+
+
+class WasmWriter:
+    '''
+    Escritor binario sobre un flujo: enteros LEB128, flotantes, nombres y
+    secciones con su tamaño.
+    '''
+    def __init__(self, stream):
+        self.stream = stream
+        try:
+            self.seekable = stream.seekable()
+        except (AttributeError, ValueError):
+            self.seekable = False
+
+    def byte(self, value):
+        self.stream.write(bytes((value,)))
+
+    def raw(self, data):
+        self.stream.write(data)
+
+    def u32(self, value):
+        self.stream.write(uleb128(value))
+
+    def s32(self, value):
+        self.stream.write(sleb128(value))
+
+    def f64(self, value):
+        self.stream.write(struct.pack('<d', value))
+
+    def name(self, text):
+        data = text.encode('utf-8')
+        self.u32(len(data))
+        self.stream.write(data)
+
+    @contextmanager
+    def section(self, section_id):
+        """
+        Escribe una sección: lo escrito dentro del bloque `with` es su
+        contenido y el tamaño se completa al salir.
+        """
+        self.byte(section_id)
+        if self.seekable:
+            size_at = self.stream.tell()
+            self.stream.write(padded_uleb128(0))
+            start = self.stream.tell()
+            yield self
+            end = self.stream.tell()
+            self.stream.seek(size_at)
+            self.stream.write(padded_uleb128(end - start))
+            self.stream.seek(end)
+        else:
+            target, self.stream = self.stream, io.BytesIO()
+            try:
+                yield self
+                content = self.stream.getvalue()
+            finally:
+                self.stream = target
+            self.u32(len(content))
+            self.stream.write(content)
+
+
+class FunctionBody:
+    '''
+    Código de una función en construcción: locales e instrucciones.
+    '''
+    def __init__(self, params):
+        self.param_count = len(params)
+        self.local_types = []
+        self.code = bytearray()
+
+    def add_local(self, valtype):
+        self.local_types.append(valtype)
+        return self.param_count + len(self.local_types) - 1
+
+    def op(self, opcode, *immediates):
+        self.code.append(opcode)
+        for immediate in immediates:
+            self.code += immediate
+
+    def encode(self):
+        """Cuerpo codificado: vector de locales agrupados, código y `end`"""
+        groups = []
+        for valtype in self.local_types:
+            if groups and groups[-1][1] == valtype:
+                groups[-1][0] += 1
+            else:
+                groups.append([1, valtype])
+        out = bytearray(uleb128(len(groups)))
+        for count, valtype in groups:
+            out += uleb128(count)
+            out.append(valtype)
+        out += self.code
+        out.append(OP_END)
+        return bytes(out)
+
+
+class WasmGenerator:
+    '''
+    Visitante que genera las funciones Wasm de un Program. Las expresiones
+    dejan su valor en la pila; `env` es el FunctionBody en construcción.
+    '''
+    def __init__(self):
+        self.types = []          # Firmas (params, results) sin repetir
+        self.imports = []        # (módulo, nombre, índice de tipo)
+        self.functions = []      # (nombre exportado, índice de tipo, FuncDecl o None)
+        self.function_index = {}  # nombre goxLang -> índice de función
+        self.print_index = {}    # tipo -> índice de la función de print
+        self.globals = []        # tipo de valor de cada global
+        self.strings = {}        # texto -> dirección en memoria
+        self.data = bytearray()
+        self.scopes = []         # [{nombre: ('local'|'global', índice, tipo)}]
+        self.labels = []         # Marcos de control abiertos: 'block', 'loop', 'if'
+        self.loops = []          # Posición en `labels` del bloque de salida de cada while
+        self.imported = {}       # nombre -> ImportFunctionDecl
+        self.function_return = None
+
+    # --- Tablas del módulo ---
+
+    def type_index(self, params, results):
+        signature = (tuple(params), tuple(results))
+        if signature not in self.types:
+            self.types.append(signature)
+        return self.types.index(signature)
+
+    def signature(self, func):
+        params = [wasm_type(type_) for _, type_ in func.params]
+        results = [] if func.return_type is VOID else [wasm_type(func.return_type)]
+        return self.type_index(params, results)
+
+    def string_address(self, text):
+        address = self.strings.get(text)
+        if address is None:
+            address = self.strings[text] = DATA_BASE + len(self.data)
+            self.data += text.encode('utf-8') + b'\x00'
+        return address
+
+    def prepare(self, program):
+        """Asigna índices a imports, funciones, globales y cadenas"""
+        functions = []
+        has_main = None
+        printed = []
+        for node in walk(program):
+            if isinstance(node, Print):
+                printed.append(node.expression.dtype)
+            elif isinstance(node, StringLiteral):
+                self.string_address(node.value)
+            elif isinstance(node, ErrorNode):
+                raise WasmBackendError(f"Cannot generate code for a program with errors ({node.message})")
+            elif isinstance(node, MemoryAccess):
+                raise WasmBackendError("Memory access is not supported by the Wasm backend")
+        for dtype, name in PRINT_IMPORTS.items():
+            if dtype in printed:
+                self.print_index[dtype] = len(self.imports)
+                self.imports.append(('env', name, self.type_index([wasm_type(dtype)], [])))
+        unknown = [dtype for dtype in printed if dtype not in PRINT_IMPORTS]
+        if unknown:
+            raise WasmBackendError(f"Cannot print a value of type {unknown[0]}")
+
+        self.scopes = [{}]
+        for stmt in program.statements:
+            if isinstance(stmt, ImportFunctionDecl):
+                self.function_index[stmt.name] = len(self.imports)
+                self.imports.append(('env', stmt.name, self.signature(stmt)))
+            elif isinstance(stmt, FuncDecl):
+                functions.append(stmt)
+                if stmt.name == 'main' and not stmt.params:
+                    has_main = stmt
+        for offset, func in enumerate(functions):
+            self.function_index.setdefault(func.name, len(self.imports) + offset)
+            self.functions.append((func.name, self.signature(func), func))
+        results = [] if has_main is None or has_main.return_type is VOID else [wasm_type(has_main.return_type)]
+        self.functions.append(('_start', self.type_index([], results), None))
+        return has_main
+
+    # --- Generación ---
+
+    def generate_start(self, program, has_main):
+        """Cuerpo de _start: sentencias de nivel superior y llamada a main()"""
+        body = FunctionBody([])
+        self.function_return = VOID
+        for stmt in program.statements:
+            if isinstance(stmt, (FuncDecl, ImportFunctionDecl)):
+                continue
+            if isinstance(stmt, (VarDecl, ConstDecl)):
+                dtype = self._decl_type(stmt)
+                index = len(self.globals)
+                self.globals.append(wasm_type(dtype))
+                self.scopes[0][stmt.name] = ('global', index, dtype)
+                self._initialize(stmt, dtype, body)
+                body.op(OP_GLOBAL_SET, uleb128(index))
+            else:
+                self.statement(stmt, body)
+        if has_main is not None:
+            body.op(OP_CALL, uleb128(self.function_index['main']))
+        self.function_return = None
+        return body
+
+    def generate_function(self, func):
+        body = FunctionBody(func.params)
+        self.scopes.append({param: ('local', index, type_)
+                            for index, (param, type_) in enumerate(func.params)})
+        self.function_return = func.return_type
+        for stmt in func.body.statements:
+            self.statement(stmt, body)
+        if func.return_type is not VOID:
+            # Igual que el backend C: devolver 0 si el cuerpo no retorna
+            self._zero(func.return_type, body)
+        self.function_return = None
+        self.scopes.pop()
+        return body
+
+    def _decl_type(self, decl):
+        dtype = decl.var_type if isinstance(decl, VarDecl) else decl.dtype
+        if dtype is None:
+            raise WasmBackendError(f"Declaration of '{decl.name}' has no type (was the program checked?)")
+        return dtype
+
+    def _zero(self, dtype, body):
+        if wasm_type(dtype) == F64:
+            body.op(OP_F64_CONST, struct.pack('<d', 0.0))
+        else:
+            body.op(OP_I32_CONST, sleb128(0))
+
+    def _initialize(self, decl, dtype, body):
+        if decl.value is None:
+            self._zero(dtype, body)
+        else:
+            self.expr(decl.value, body)
+            self.convert(decl.value.dtype, dtype, body)
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        raise WasmBackendError(f"Unknown variable '{name}' (was the program checked?)")
+
+    def store(self, name, body):
+        kind, index, _ = self.lookup(name)
+        body.op(OP_LOCAL_SET if kind == 'local' else OP_GLOBAL_SET, uleb128(index))
+
+    def convert(self, source, target, body):
+        """Convierte el valor en la pila de `source` a `target`"""
+        if source is target or target is None or source is None:
+            return
+        if target is FLOAT and source is not FLOAT:
+            body.op(OP_F64_CONVERT_I32_S)
+        elif source is FLOAT and target is not FLOAT:
+            body.op(OP_PREFIX_FC, uleb128(FC_I32_TRUNC_SAT_F64_S))
+            self.convert(INT, target, body)
+        elif target is CHAR:
+            body.op(OP_I32_CONST, sleb128(0xFF))
+            body.op(OP_I32_AND)
+        elif target is BOOL:
+            body.op(OP_I32_CONST, sleb128(0))
+            body.op(OP_I32_NE)
+
+    def expr(self, node, body):
+        node.accept(self, body)
+
+    def statement(self, node, body):
+        if isinstance(node, EXPRESSIONS):
+            self.expr(node, body)
+            if node.dtype is not VOID and node.dtype is not None:
+                body.op(OP_DROP)
+        else:
+            node.accept(self, body)
+
+    def branch_depth(self, position):
+        return len(self.labels) - 1 - position
+
+    # --- Sentencias ---
+
+    def visit_FuncDecl(self, node, env):
+        raise WasmBackendError(f"Nested function '{node.name}' is not supported by the Wasm backend")
+
+    def visit_ImportFunctionDecl(self, node, env):
+        raise WasmBackendError(f"Imported function '{node.name}' must be declared at top level")
+
+    def visit_VarDecl(self, node, env):
+        index = env.add_local(wasm_type(node.var_type))
+        self.scopes[-1][node.name] = ('local', index, node.var_type)
+        self._initialize(node, node.var_type, env)
+        env.op(OP_LOCAL_SET, uleb128(index))
+
+    def visit_ConstDecl(self, node, env):
+        dtype = self._decl_type(node)
+        index = env.add_local(wasm_type(dtype))
+        self.scopes[-1][node.name] = ('local', index, dtype)
+        self._initialize(node, dtype, env)
+        env.op(OP_LOCAL_SET, uleb128(index))
+
+    def visit_Block(self, node, env):
+        self.scopes.append({})
+        for stmt in node.statements:
+            self.statement(stmt, env)
+        self.scopes.pop()
+
+    def visit_Assignment(self, node, env):
+        self.expr(node.value, env)
+        self.convert(node.value.dtype, self.lookup(node.name)[2], env)
+        self.store(node.name, env)
+
+    def visit_Print(self, node, env):
+        self.expr(node.expression, env)
+        env.op(OP_CALL, uleb128(self.print_index[node.expression.dtype]))
+
+    def visit_If(self, node, env):
+        self.expr(node.condition, env)
+        env.op(OP_IF, bytes((EMPTY_BLOCK,)))
+        self.labels.append('if')
+        node.then_block.accept(self, env)
+        if node.else_block:
+            env.op(OP_ELSE)
+            node.else_block.accept(self, env)
+        self.labels.pop()
+        env.op(OP_END)
+
+    def visit_While(self, node, env):
+        # block { loop { br_if (!cond) salida; cuerpo; br loop } }
+        env.op(OP_BLOCK, bytes((EMPTY_BLOCK,)))
+        self.labels.append('block')
+        self.loops.append(len(self.labels) - 1)
+        env.op(OP_LOOP, bytes((EMPTY_BLOCK,)))
+        self.labels.append('loop')
+        self.expr(node.condition, env)
+        env.op(OP_I32_EQZ)
+        env.op(OP_BR_IF, uleb128(self.branch_depth(self.loops[-1])))
+        node.body.accept(self, env)
+        env.op(OP_BR, uleb128(self.branch_depth(self.loops[-1] + 1)))
+        self.labels.pop()
+        env.op(OP_END)
+        self.loops.pop()
+        self.labels.pop()
+        env.op(OP_END)
+
+    def visit_Break(self, node, env):
+        env.op(OP_BR, uleb128(self.branch_depth(self.loops[-1])))
+
+    def visit_Continue(self, node, env):
+        env.op(OP_BR, uleb128(self.branch_depth(self.loops[-1] + 1)))
+
+    def visit_Return(self, node, env):
+        if self.function_return is None:
+            raise WasmBackendError("Return outside of a function")
+        if node.value is not None:
+            self.expr(node.value, env)
+            self.convert(node.value.dtype, self.function_return, env)
+        env.op(OP_RETURN)
+
+    def visit_ErrorNode(self, node, env):
+        raise WasmBackendError(f"Cannot generate code for a program with errors ({node.message})")
+
+    # --- Expresiones ---
+
+    def visit_IntLiteral(self, node, env):
+        env.op(OP_I32_CONST, sleb128(_wrap_i32(node.value)))
+
+    def visit_FloatLiteral(self, node, env):
+        env.op(OP_F64_CONST, struct.pack('<d', node.value))
+
+    def visit_BoolLiteral(self, node, env):
+        env.op(OP_I32_CONST, sleb128(1 if node.value else 0))
+
+    def visit_CharLiteral(self, node, env):
+        env.op(OP_I32_CONST, sleb128(ord(node.value) & 0xFF))
+
+    def visit_StringLiteral(self, node, env):
+        env.op(OP_I32_CONST, sleb128(self.string_address(node.value)))
+
+    def visit_Identifier(self, node, env):
+        kind, index, _ = self.lookup(node.name)
+        env.op(OP_LOCAL_GET if kind == 'local' else OP_GLOBAL_GET, uleb128(index))
+
+    def visit_TypeCast(self, node, env):
+        self.expr(node.expression, env)
+        self.convert(node.expression.dtype, node.cast_type, env)
+
+    def visit_BinaryOp(self, node, env):
+        if node.operator == 'BANG':
+            # '!x' se representa como BinaryOp(false, BANG, x)
+            self.expr(node.right, env)
+            env.op(OP_I32_EQZ)
+            return
+        self.expr(node.left, env)
+        self.expr(node.right, env)
+        operand = node.left.dtype
+        table = F64_OPS if operand is FLOAT else CHAR_OPS if operand is CHAR else I32_OPS
+        opcode = table.get(node.operator)
+        if opcode is None:
+            raise WasmBackendError(f"Operator {node.operator} is not supported for {operand}")
+        env.op(opcode)
+
+    def visit_FuncCall(self, node, env):
+        index = self.function_index.get(node.name)
+        if index is None:
+            raise WasmBackendError(f"Unknown function '{node.name}'")
+        callee = self._callee(node.name)
+        for arg, (_, param_type) in zip(node.args, callee.params):
+            self.expr(arg, env)
+            self.convert(arg.dtype, param_type, env)
+        env.op(OP_CALL, uleb128(index))
+
+    def _callee(self, name):
+        for func_name, _, func in self.functions:
+            if func_name == name and func is not None:
+                return func
+        return self.imported[name]
+
+    def visit_MemoryAccess(self, node, env):
+        raise WasmBackendError("Memory access is not supported by the Wasm backend")
+
+    # --- Módulo ---
+
+    def write(self, program, stream):
+        """Genera el módulo de `program` y lo escribe en `stream` (binario)"""
+        self.imported = {stmt.name: stmt for stmt in program.statements
+                         if isinstance(stmt, ImportFunctionDecl)}
+        has_main = self.prepare(program)
+        # Los globales se descubren al generar _start; se genera antes que el resto
+        start = self.generate_start(program, has_main)
+        bodies = [self.generate_function(func) if func is not None else start
+                  for _, _, func in self.functions]
+
+        out = WasmWriter(stream)
+        out.raw(MAGIC + VERSION)
+
+        with out.section(SECTION_TYPE):
+            out.u32(len(self.types))
+            for params, results in self.types:
+                out.byte(FUNC_TYPE)
+                out.u32(len(params))
+                out.raw(bytes(params))
+                out.u32(len(results))
+                out.raw(bytes(results))
+
+        if self.imports:
+            with out.section(SECTION_IMPORT):
+                out.u32(len(self.imports))
+                for module, name, type_index in self.imports:
+                    out.name(module)
+                    out.name(name)
+                    out.byte(EXTERNAL_FUNC)
+                    out.u32(type_index)
+
+        with out.section(SECTION_FUNCTION):
+            out.u32(len(self.functions))
+            for _, type_index, _ in self.functions:
+                out.u32(type_index)
+
+        if self.data:
+            with out.section(SECTION_MEMORY):
+                pages = -(-(DATA_BASE + len(self.data)) // PAGE_SIZE)
+                out.u32(1)
+                out.byte(0x00)  # Solo mínimo
+                out.u32(pages)
+
+        if self.globals:
+            with out.section(SECTION_GLOBAL):
+                out.u32(len(self.globals))
+                for valtype in self.globals:
+                    out.byte(valtype)
+                    out.byte(0x01)  # Mutable
+                    if valtype == F64:
+                        out.byte(OP_F64_CONST)
+                        out.f64(0.0)
+                    else:
+                        out.byte(OP_I32_CONST)
+                        out.s32(0)
+                    out.byte(OP_END)
+
+        with out.section(SECTION_EXPORT):
+            exported = {}
+            for offset, (name, _, _) in enumerate(self.functions):
+                exported.setdefault(name, len(self.imports) + offset)
+            out.u32(len(exported) + (1 if self.data else 0))
+            for name, index in exported.items():
+                out.name(name)
+                out.byte(EXTERNAL_FUNC)
+                out.u32(index)
+            if self.data:
+                out.name('memory')
+                out.byte(EXTERNAL_MEMORY)
+                out.u32(0)
+
+        with out.section(SECTION_CODE):
+            out.u32(len(bodies))
+            for body in bodies:
+                code = body.encode()
+                out.u32(len(code))
+                out.raw(code)
+
+        if self.data:
+            with out.section(SECTION_DATA):
+                out.u32(1)
+                out.u32(0)  # Segmento activo en la memoria 0
+                out.byte(OP_I32_CONST)
+                out.s32(DATA_BASE)
+                out.byte(OP_END)
+                out.u32(len(self.data))
+                out.raw(bytes(self.data))
+
+
+def write_wasm(program, stream):
+    """Escribe el módulo Wasm de un Program verificado en un flujo binario"""
+    WasmGenerator().write(program, stream)
+
+
+def main(argv=None):
+    from compiler import compile_source
+    from gox_error_manager import format_diagnostic
+
+    arg_parser = argparse.ArgumentParser(
+        prog="wasm_backend.py", description="Genera un módulo WebAssembly desde goxLang")
+    arg_parser.add_argument('filename', help="Archivo fuente .gox")
+    arg_parser.add_argument('-o', '--output', metavar='ARCHIVO',
+                            help="Archivo .wasm de salida (por defecto junto al fuente)")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.filename, 'r', encoding='utf-8') as f:
+        result = compile_source(f.read())
+    if not result.valid:
+        for diag in result.diagnostics:
+            print(format_diagnostic(diag))
+        return 1
+    output = args.output or args.filename.rsplit('.', 1)[0] + '.wasm'
+    try:
+        with open(output, 'wb') as f:
+            write_wasm(result.ast, f)
+    except WasmBackendError as e:
+        # El módulo se escribe por secciones a medida que se genera: no
+        # dejar un archivo incompleto
+        os.remove(output)
+        print(f"Error: {e}")
+        return 1
+    print(f"Módulo Wasm escrito en {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())